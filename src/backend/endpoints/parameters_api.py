@@ -1,6 +1,17 @@
+import asyncio
+import logging
+import os
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel, RootModel
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
+from backend.utils.job_manager import JobManager, JobStatus
+from backend.utils.batch_processor import BatchProcessor, BatchTableStatus
+from backend.utils.logging_config import configure_logging
+from backend.utils.metrics import CONTENT_TYPE, PipelineMetrics
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 all_parameters_received = 0
@@ -100,32 +111,174 @@ class FrontParams(RootModel[dict]):
     # __root__: Dict[str, Any]
 
 
-# Variable global para almacenar los parámetros recibidos por /run_process
-last_received_params = None
+# Registro de trabajos recibidos por /run_process y cola para el pool de workers.
+# Un trabajo sin resultado ni progreso durante JOB_RUNNING_TIMEOUT segundos se reencola una vez y luego falla
+job_manager = JobManager(running_timeout=float(os.getenv("JOB_RUNNING_TIMEOUT", "1800")))
+
+# Métricas expuestas en /metrics; la cola y los trabajos en curso se leen en cada consulta
+pipeline_metrics = PipelineMetrics()
+pipeline_metrics.queue_depth.set_function(job_manager.queue_depth)
+pipeline_metrics.jobs_running.set_function(job_manager.running_count)
+
+# Tiempo máximo (segundos) que /get_params mantiene abierta la petición esperando un trabajo
+LONG_POLL_TIMEOUT = 25.0
+
+# Cada cuántos segundos se revisan los trabajos en curso cuyo worker dejó de responder
+REAP_INTERVAL = 30.0
+
+def _reap_expired_jobs() -> None:
+    requeued, failed = job_manager.reap_expired()
+    for job_id in requeued:
+        logger.warning("Job %s sin respuesta del worker, se reencola", job_id, extra={"job_id": job_id})
+    for job in failed:
+        logger.error("Job %s fallido: %s", job["job_id"], job["error"], extra={"job_id": job["job_id"]})
+        pipeline_metrics.observe_job(job)
+
+async def _reap_expired_jobs_forever() -> None:
+    while True:
+        await asyncio.sleep(REAP_INTERVAL)
+        _reap_expired_jobs()
+
+@app.on_event("startup")
+async def start_job_reaper():
+    app.state.job_reaper = asyncio.create_task(_reap_expired_jobs_forever())
 
 @app.post("/run_process")
-def run_process(params: FrontParams):
-    global last_received_params
-    print(f"Parámetros recibidos por la API")
+async def run_process(params: FrontParams):
     try:
         # Convertir a diccionario
         params_dict = params.model_dump()
-        print(f"Params recibidos en API. {params_dict}")
-        # Guardar globalmente
-        last_received_params = params_dict
-        return {"status": "ready"}
+        logger.debug("Params recibidos en API: %s", params_dict)
+        # Registrar el trabajo; uno de los workers que espera en /get_params lo toma
+        job_id = job_manager.submit(params_dict)
+        pipeline_metrics.jobs_submitted.inc(kind="process")
+        logger.info("Job %s encolado", job_id, extra={"job_id": job_id})
+        return {"status": "ready", "job_id": job_id}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
+class BatchTable(BaseModel):
+    schema_file_path: str
+    data_sample_file_path: str
+    # Parámetros propios de la tabla; sobrescriben los comunes del batch
+    parameters: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    folder_path: str
+    tables: List[BatchTable]
+    # Parámetros comunes a todas las tablas (process_type, code_schema, input_path...)
+    parameters: Dict[str, Any] = {}
+    max_concurrency: Optional[int] = None
+
+@app.post("/run_batch")
+async def run_batch(batch: BatchRequest):
+    '''
+    Onboards several tables under one folder_path in a single job.
+    A worker processes the tables concurrently and updates the general pom once at the end;
+    GET /jobs/{job_id} shows the progress of each table.
+    '''
+    if not batch.tables:
+        raise HTTPException(status_code=400, detail="The batch has no tables")
+    tables = [
+        {**table.parameters, "schema_file_path": table.schema_file_path, "data_sample_file_path": table.data_sample_file_path}
+        for table in batch.tables
+    ]
+    params_dict = {**batch.parameters, "folder_path": batch.folder_path, "tables": tables}
+    if batch.max_concurrency:
+        params_dict["max_concurrency"] = batch.max_concurrency
+    logger.info("Batch recibido en API: %d tablas en %s", len(tables), batch.folder_path)
+    progress = {
+        BatchProcessor.table_key(index, table): {"status": BatchTableStatus.QUEUED}
+        for index, table in enumerate(tables)
+    }
+    job_id = job_manager.submit(params_dict, progress=progress)
+    pipeline_metrics.jobs_submitted.inc(kind="batch")
+    return {"status": "ready", "job_id": job_id, "tables": list(progress)}
+
 @app.get("/get_params")
-def get_params():
-    global last_received_params
-    if last_received_params is not None:
-        # Guardar los parámetros actuales en una variable temporal
-        returned_params = last_received_params
-        # Resetear la variable a None
-        last_received_params = None
-        # Devolver los parámetros recuperados
-        return returned_params
+async def get_params(timeout: float = LONG_POLL_TIMEOUT):
+    '''
+    Long polling: keeps the request open until a job is enqueued or the timeout expires.
+    The worker is answered as soon as /run_process receives the parameters.
+    Returns the job parameters plus the "job_id" key used to report the result.
+    '''
+    _reap_expired_jobs()
+    job = await job_manager.next_job(timeout=min(max(timeout, 0.0), LONG_POLL_TIMEOUT))
+    if job is not None:
+        return {**job["parameters"], "job_id": job["job_id"]}
     else:
         return {"message": "Awaiting"}
+
+class JobReport(BaseModel):
+    success: bool
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    # Duración de las etapas, latencias del LLM y bytes leídos, medidos por el worker
+    metrics: Optional[Dict[str, Any]] = None
+
+def _get_job_or_404(job_id: str) -> Dict[str, Any]:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    job = _get_job_or_404(job_id)
+    return {key: value for key, value in job.items() if key not in ("parameters", "result")}
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = _get_job_or_404(job_id)
+    if job["status"] not in JobStatus.FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    return {"job_id": job_id, "status": job["status"], "result": job["result"], "error": job["error"]}
+
+@app.post("/jobs/{job_id}/result")
+async def post_job_result(job_id: str, report: JobReport):
+    '''
+    Worker reports the outcome of a job it took from /get_params.
+    '''
+    job = _get_job_or_404(job_id)
+    if job["status"] != JobStatus.RUNNING:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    if report.success:
+        job_manager.complete(job_id, report.result)
+    else:
+        job_manager.fail(job_id, report.error or "Unknown error")
+    pipeline_metrics.observe_job(job, report.metrics)
+    return {"job_id": job_id, "status": job["status"]}
+
+@app.post("/jobs/{job_id}/progress")
+async def post_job_progress(job_id: str, entry: Dict[str, Any]):
+    '''
+    Worker reports the progress of one part of a running job, e.g. {"key": "0:tabla.schema", "status": "succeeded"}.
+    '''
+    job = _get_job_or_404(job_id)
+    if job["status"] != JobStatus.RUNNING:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    key = entry.pop("key", None)
+    if not key:
+        raise HTTPException(status_code=400, detail="Missing progress key")
+    job_manager.update_progress(job_id, key, entry)
+    return {"job_id": job_id, "progress": job["progress"][key]}
+
+@app.post("/jobs/{job_id}/heartbeat")
+async def post_job_heartbeat(job_id: str):
+    '''
+    Worker reports that it is still processing a running job, renewing its lease. The response includes
+    the running timeout, so the worker can send the next heartbeat well before the lease expires.
+    '''
+    job = _get_job_or_404(job_id)
+    if job["status"] != JobStatus.RUNNING:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    job_manager.heartbeat(job_id)
+    return {"job_id": job_id, "lease_expires_at": job["lease_expires_at"], "running_timeout": job_manager.running_timeout}
+
+@app.get("/metrics")
+async def metrics():
+    '''
+    Metrics in the Prometheus text format: job latency histograms, queue depth, running jobs,
+    stage durations, LLM latency and bytes of sample files scanned.
+    '''
+    return Response(content=pipeline_metrics.render(), media_type=CONTENT_TYPE)
@@ -1,91 +1,101 @@
 from langchain_openai.chat_models import AzureChatOpenAI, ChatOpenAI
 from langchain_openai.llms import AzureOpenAI
 from langchain.agents import initialize_agent, Tool
+from typing import Optional
+import asyncio
 import json
+import logging
+from backend.openai_langchain.response_cache import ResponseCache, get_default_cache
+from backend.openai_langchain.llm_client_registry import LLMClientRegistry, get_default_registry
+from backend.openai_langchain.prompt_builder import PromptBuilder
+from backend.utils.hocon_template_renderer import HoconTemplateRenderer
+from backend.utils.tracing import get_default_tracer
+
+logger = logging.getLogger(__name__)
 
 class AIConfGenerator:
 
-    def __init__(self, api_key: str):
-        self.client = AzureChatOpenAI(
-            openai_api_key=api_key,
-            azure_endpoint = 'https://oai-mnst-ariadna-dev-01.openai.azure.com/',
-            api_version="2023-05-15",
-            model="visor-cognitivo-chat",
-            temperature=0
-    )
-
-    def fill_template(self, ingest_type: str, template: str, parameters: dict, rules: str, example_filling: str, date_format_dict, grouped_fields=None) -> str:
-        print(f"Ai conf generator, Ingest Type: {ingest_type}")
+    # Versión del formato de la clave de caché; PromptBuilder.VERSION y HoconTemplateRenderer.VERSION
+    # cubren los cambios del prompt y de la plantilla pre-renderizada
+    CACHE_KEY_VERSION = 1
+
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None, registry: Optional[LLMClientRegistry] = None):
+        """
+        :param api_key: Azure OpenAI API key.
+        :param cache: Response cache. Defaults to the process-wide on-disk cache.
+        :param registry: Client registry. Defaults to the process-wide registry, so every job
+                         shares the same pooled AzureChatOpenAI client.
+        """
+        self.cache = cache or get_default_cache()
+        self.registry = registry or get_default_registry()
+        self.client = self.registry.get_client(api_key)
+        self.last_prompt_tokens = {}
+
+    async def afill_template(self, ingest_type: str, template: str, parameters: dict, rules: str, example_filling: str, date_format_dict=None, grouped_fields=None, bypass_cache: bool = False) -> str:
         """
         Fills the provided HOCON template based on input data, structured rules, and an example of the desired output format.
+        Uses the client's `ainvoke` so the event loop keeps serving other jobs while waiting for Azure OpenAI,
+        and every model call goes through the concurrency limit and rate limits of the client registry.
 
         Parameters:
         - template (str): The HOCON template as a string to be filled.
         - parameters (dict): The data to be used to fill the template.
         - rules (str): JSON-like dictionary defining rules for filling the template.
         - example_filling (str): Example showing the expected filled output format in HOCON.
+        - bypass_cache (bool): Always call the model, ignoring (and refreshing) the cached response.
 
         Returns:
         - str: A HOCON-formatted string with the filled template.
         """
-        if ingest_type == "raw":
-            
-            # Crear el prompt con la estructura y el orden especificado
-            prompt = f"""
-            Context:
-            You are a software developer, responsible for generating HOCON configurations for data transformations and applying specific replacement rules in templates. Follow these instructions strictly to ensure replacements and configurations are applied according to the established rules.
-            
-            Template:
-            {template}
-            
-            Rules:
-            {rules}
-            
-            Parameters:
-            {parameters}
-            
-            Example of Desired Output Format:
-            {example_filling}
-            
-            Please fill the template with the input data, applying the rules exactly as defined, and format the result according to the example.
-            Output the result as a string in HOCON format that retains the original structure.
-            """
-
-        elif ingest_type=="master":
-       
-            # Crear el prompt con la estructura y el orden especificado
-            prompt = f"""
-            Context:
-            You are a software developer, responsible for generating HOCON configurations for data transformations and applying specific replacement rules in templates. Follow these instructions strictly to ensure replacements and configurations are applied according to the established rules.
-            
-            Template:
-            {template}
-            
-            Rules:
-            {rules}
-            
-            parameters = 
-            {parameters}
-
-            grouped_fields:
-            {grouped_fields}
-
-            date_format_dict:
-            {date_format_dict}
-            
-            Example of Output Format:
-            {example_filling}
-            
-            Please fill the template with the input data, applying the rules exactly as defined, and structure the result according to the example.
-            Output the result as a string in HOCON format that retains the original structure.
-            """
-        
-        # Realizar la llamada a Azure OpenAI
-        response = self.client.invoke(prompt)
-        
-        # Devolver la respuesta en formato de cadena de texto (preservando la estructura HOCON)
+        logger.debug("Ai conf generator, Ingest Type: %s", ingest_type)
+        cache_key = self._cache_key(ingest_type, template, parameters, rules, example_filling, date_format_dict, grouped_fields)
+        if not bypass_cache:
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
+        prompt = self._build_prompt(ingest_type, template, parameters, rules, example_filling, date_format_dict, grouped_fields)
+        async with self.registry.limit(prompt):
+            # Solo la llamada al modelo: la espera del limitador no cuenta como latencia del LLM
+            span_attributes = {"llm.ingest_type": ingest_type, "llm.prompt_tokens": self.last_prompt_tokens.get("total", 0)}
+            with get_default_tracer().start_span("llm.request", span_attributes):
+                response = str(await self.client.ainvoke(prompt))
+        await asyncio.to_thread(self.cache.put, cache_key, response)
         return response
 
+    @staticmethod
+    def _cache_key(ingest_type: str, template: str, parameters: dict, rules: str, example_filling: str, date_format_dict=None, grouped_fields=None) -> str:
+        """
+        Content hash of every input that affects the response (the model runs at temperature 0),
+        including the versions of the prompt builder and the template renderer, so responses cached
+        before a prompt or rendering change are not served again.
+        """
+        return ResponseCache.make_key(
+            key_version=AIConfGenerator.CACHE_KEY_VERSION,
+            prompt_version=PromptBuilder.VERSION,
+            renderer_version=HoconTemplateRenderer.VERSION,
+            ingest_type=ingest_type,
+            template=template,
+            rules=rules,
+            example=example_filling,
+            parameters=parameters,
+            grouped_fields=grouped_fields,
+            date_format_dict=date_format_dict,
+        )
+
+    def _build_prompt(self, ingest_type: str, template: str, parameters: dict, rules: str, example_filling: str, date_format_dict=None, grouped_fields=None) -> str:
+        """
+        Builds the prompt sent to the model for the given ingest type. Only the rule sections that
+        apply to this job are included; the token count of each section is kept in `last_prompt_tokens`.
+
+        Returns:
+        - str: The prompt text.
+        """
+        prompt_builder = PromptBuilder(ingest_type, template, parameters, rules, example_filling, date_format_dict, grouped_fields)
+        prompt, self.last_prompt_tokens = prompt_builder.build()
+        logger.info("Prompt tokens por sección: %s", self.last_prompt_tokens)
+        return prompt
+
     def create_agent(self):
         # Crear herramientas adicionales si necesitas ejecutar operaciones adicionales antes/después del llenado
         tools = [
@@ -0,0 +1,176 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+import httpx
+from langchain_openai.chat_models import AzureChatOpenAI
+
+
+class TokenBucket:
+    """
+    Asynchronous token bucket. Holds up to `capacity` units and refills `capacity` units per minute.
+    """
+
+    def __init__(self, capacity_per_minute: float):
+        """
+        :param capacity_per_minute: Units (requests or tokens) allowed per minute.
+        """
+        self.capacity = float(capacity_per_minute)
+        self._available = float(capacity_per_minute)
+        self._refill_rate = self.capacity / 60.0
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Waits until `amount` units are available and consumes them.
+        Requests bigger than the capacity are capped so they can eventually go through.
+        """
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._available >= amount:
+                    self._available -= amount
+                    return
+                await asyncio.sleep((amount - self._available) / self._refill_rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated_at) * self._refill_rate)
+        self._updated_at = now
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry of AzureChatOpenAI clients. Every job that uses the same credentials
+    gets the same client, backed by pooled HTTP/2 connections, so batch onboardings reuse warm
+    connections instead of paying TLS and handshake costs on each job.
+
+    It also limits the number of concurrent LLM calls and applies requests-per-minute and
+    tokens-per-minute token buckets.
+    """
+
+    DEFAULT_ENDPOINT = "https://oai-mnst-ariadna-dev-01.openai.azure.com/"
+    DEFAULT_API_VERSION = "2023-05-15"
+    DEFAULT_MODEL = "visor-cognitivo-chat"
+
+    def __init__(self, azure_endpoint: str = DEFAULT_ENDPOINT, api_version: str = DEFAULT_API_VERSION,
+                 model: str = DEFAULT_MODEL, max_concurrency: int = 4, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_connections: int = 20, http2: bool = True):
+        """
+        Initialize the registry.
+
+        :param azure_endpoint: Azure OpenAI endpoint.
+        :param api_version: Azure OpenAI API version.
+        :param model: Deployed model name.
+        :param max_concurrency: Maximum number of LLM calls in flight at the same time.
+        :param requests_per_minute: Request rate limit. None disables it.
+        :param tokens_per_minute: Prompt token rate limit (estimated). None disables it.
+        :param max_connections: Size of the shared HTTP connection pool.
+        :param http2: Use HTTP/2 for the shared connections.
+        """
+        self.azure_endpoint = azure_endpoint
+        self.api_version = api_version
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._http2 = http2
+        self._clients: Dict[Tuple[str, str, str, str], AzureChatOpenAI] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    @classmethod
+    def from_env(cls) -> "LLMClientRegistry":
+        """
+        Builds a registry from the environment:
+        AZURE_OPENAI_ENDPOINT, LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE.
+        """
+        requests_per_minute = os.getenv("LLM_REQUESTS_PER_MINUTE")
+        tokens_per_minute = os.getenv("LLM_TOKENS_PER_MINUTE")
+        return cls(
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", cls.DEFAULT_ENDPOINT),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 4)),
+            requests_per_minute=float(requests_per_minute) if requests_per_minute else None,
+            tokens_per_minute=float(tokens_per_minute) if tokens_per_minute else None,
+        )
+
+    def get_client(self, api_key: str) -> AzureChatOpenAI:
+        """
+        Returns the shared client for the API key, creating it on first use.
+        """
+        key = (api_key or "", self.azure_endpoint, self.api_version, self.model)
+        client = self._clients.get(key)
+        if client is None:
+            client = AzureChatOpenAI(
+                openai_api_key=api_key,
+                azure_endpoint=self.azure_endpoint,
+                api_version=self.api_version,
+                model=self.model,
+                temperature=0,
+                http_client=self._get_http_client(),
+                http_async_client=self._get_http_async_client(),
+            )
+            self._clients[key] = client
+        return client
+
+    @asynccontextmanager
+    async def limit(self, prompt: str = ""):
+        """
+        Waits for a concurrency slot and for the rate limits before an LLM call.
+
+        :param prompt: Prompt text, used to estimate the tokens it consumes.
+        """
+        async with self._semaphore:
+            if self._request_bucket is not None:
+                await self._request_bucket.acquire(1)
+            if self._token_bucket is not None:
+                await self._token_bucket.acquire(self.estimate_tokens(prompt))
+            yield
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token estimate (about four characters per token)."""
+        return max(1, len(text) // 4)
+
+    async def aclose(self) -> None:
+        """Closes the shared HTTP connections."""
+        if self._http_async_client is not None:
+            await self._http_async_client.aclose()
+            self._http_async_client = None
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+        self._clients.clear()
+
+    def _get_http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(http2=self._http2, limits=self._limits)
+        return self._http_client
+
+    def _get_http_async_client(self) -> httpx.AsyncClient:
+        if self._http_async_client is None:
+            self._http_async_client = httpx.AsyncClient(http2=self._http2, limits=self._limits)
+        return self._http_async_client
+
+
+_default_registry: Optional[LLMClientRegistry] = None
+
+
+def get_default_registry() -> LLMClientRegistry:
+    """Returns the process-wide registry, creating one from the environment if the worker did not set it."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = LLMClientRegistry.from_env()
+    return _default_registry
+
+
+def set_default_registry(registry: LLMClientRegistry) -> None:
+    """Sets the process-wide registry. Called by the worker at startup."""
+    global _default_registry
+    _default_registry = registry
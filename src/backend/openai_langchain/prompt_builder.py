@@ -0,0 +1,223 @@
+import json
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character based estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+
+class RuleSection:
+    """A numbered section of a rules file ("1", "2", "2.1", ...)."""
+
+    __slots__ = ("section_id", "parent_id", "text")
+
+    def __init__(self, section_id: str, parent_id: Optional[str], text: str):
+        self.section_id = section_id
+        self.parent_id = parent_id
+        self.text = text
+
+
+# "RULE 2:", "Rule 2.1:" and "2.1:" headings. Rule 1.1.x stays inside RULE 1.
+_SECTION_PATTERN = re.compile(r"^(?:RULE (\d+):|(?:Rule )?(\d+)\.(\d+):)", re.MULTILINE)
+_NOTES_PATTERN = re.compile(r"^Notes for the Agent:", re.MULTILINE)
+
+
+@lru_cache(maxsize=16)
+def parse_rules(rules: str) -> Tuple[str, Tuple[RuleSection, ...], str]:
+    """
+    Splits a rules file into its preamble, its numbered sections and the closing notes.
+    Results are memoized by content, so each rules file is parsed once per process.
+
+    :return: Tuple (preamble, sections, notes).
+    """
+    notes = ""
+    notes_match = _NOTES_PATTERN.search(rules)
+    if notes_match:
+        rules, notes = rules[:notes_match.start()], rules[notes_match.start():]
+
+    matches = list(_SECTION_PATTERN.finditer(rules))
+    preamble = rules[:matches[0].start()] if matches else rules
+    sections = []
+    current_rule = None
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(rules)
+        text = rules[match.start():end]
+        if match.group(1):
+            current_rule = match.group(1)
+            sections.append(RuleSection(current_rule, None, text))
+        else:
+            rule_id = match.group(2)
+            # Sub-rules of RULE 1 describe the replacement rule itself: keep them with it
+            if rule_id == "1" and current_rule == "1":
+                sections[-1].text += text
+                continue
+            sections.append(RuleSection(f"{rule_id}.{match.group(3)}", rule_id, text))
+    return preamble, tuple(sections), notes
+
+
+ENCODING_NAME = "cl100k_base"
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def load_encoding() -> bool:
+    """
+    Loads the tiktoken encoding used by count_tokens. tiktoken downloads the BPE file the first time it
+    is used, so the worker calls this once at startup instead of on the request path. The outcome is
+    kept for the whole process, failures included (e.g. an offline or firewalled worker).
+
+    :return: True if count_tokens counts with tiktoken, False if it estimates.
+    """
+    global _encoding, _encoding_loaded
+    with _encoding_lock:
+        if not _encoding_loaded:
+            _encoding_loaded = True
+            if tiktoken is not None:
+                try:
+                    _encoding = tiktoken.get_encoding(ENCODING_NAME)
+                except Exception as e:
+                    logger.warning("No se pudo cargar la codificación %s de tiktoken, se estiman los tokens: %s",
+                                   ENCODING_NAME, e)
+    return _encoding is not None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts prompt tokens with tiktoken once `load_encoding` loaded it, otherwise estimates ~4 characters
+    per token. It never loads the encoding itself, so it does no network I/O.
+    """
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return max(1, len(text) // 4) if text else 0
+
+
+class PromptBuilder:
+    """
+    Builds the fill_template prompt including only the rule sections that apply to the current
+    job, serializing the parameters compactly and reporting the token count of each section.
+    """
+
+    # Se incrementa con cada cambio del prompt generado: forma parte de la clave de la caché de respuestas
+    VERSION = 2
+
+    DAILY_PARTITIONS = ["partition_data_year_id", "partition_data_month_id", "partition_data_day_id"]
+
+    # Sections that depend on the partition columns, per ingest type.
+    PARTITION_SECTIONS = {
+        "raw": {"2.1": ["cutoff_date"], "2.2": DAILY_PARTITIONS},
+        "master": {},
+    }
+
+    # Section id -> predicate over the context. Sections without a trigger are always included.
+    TRIGGERS: Dict[str, Dict[str, Callable[[Dict[str, Any]], bool]]] = {
+        "raw": {},
+        "master": {
+            "2.3": lambda context: any(data_type != "string" for data_type in context["grouped_fields"]),
+            "2.4": lambda context: bool(context["grouped_fields"]),
+            "2.5": lambda context: "date" in context["grouped_fields"],
+            "2.6": lambda context: context["has_decimals"] and (context["found_comma"] or context["found_dot"]),
+        },
+    }
+
+    # Parameters the rules read, besides the template placeholders.
+    RULE_PARAMETERS = ("partitions", "found_comma", "found_dot", "decimal_symbol")
+
+    CONTEXT = (
+        "You are a software developer, responsible for generating HOCON configurations for data transformations "
+        "and applying specific replacement rules in templates. Follow these instructions strictly to ensure "
+        "replacements and configurations are applied according to the established rules."
+    )
+
+    PLACEHOLDER_PATTERN = re.compile(r"(?<!\$)\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+    def __init__(self, ingest_type: str, template: str, parameters: Dict[str, Any], rules: str, example_filling: str,
+                 date_format_dict: Optional[Dict[str, str]] = None, grouped_fields: Optional[Dict[str, Any]] = None):
+        self.ingest_type = ingest_type
+        self.template = template
+        self.parameters = parameters
+        self.rules = rules
+        self.example_filling = example_filling
+        self.date_format_dict = date_format_dict
+        self.grouped_fields = grouped_fields or {}
+
+    def build(self) -> Tuple[str, Dict[str, int]]:
+        """
+        Builds the prompt.
+
+        :return: Tuple with the prompt text and the token count of each section (plus "total").
+        """
+        sections = [
+            ("Context", self.CONTEXT),
+            ("Template", self.template),
+            ("Rules", self.select_rules()),
+            ("Parameters", self._compact(self._relevant_parameters())),
+        ]
+        if self.ingest_type == "master":
+            sections.append(("grouped_fields", self._compact(self.grouped_fields)))
+            sections.append(("date_format_dict", self._compact(self.date_format_dict)))
+        sections.append(("Example of Output Format", self.example_filling))
+        sections.append(("Instructions", (
+            "Please fill the template with the input data, applying the rules exactly as defined, and structure "
+            "the result according to the example.\n"
+            "Output the result as a string in HOCON format that retains the original structure."
+        )))
+
+        prompt = "\n\n".join(f"{title}:\n{body.strip()}" for title, body in sections)
+        token_counts = {title: count_tokens(body) for title, body in sections}
+        token_counts["total"] = count_tokens(prompt)
+        return prompt, token_counts
+
+    def select_rules(self) -> str:
+        """Returns the rules text with only the sections whose triggers match this job."""
+        preamble, sections, notes = parse_rules(self.rules)
+        context = self._trigger_context()
+        triggers = self.TRIGGERS.get(self.ingest_type, {})
+        partition_sections = self.PARTITION_SECTIONS.get(self.ingest_type, {})
+
+        matching_partition_sections = {
+            section_id for section_id, columns in partition_sections.items() if columns == context["partitions"]
+        }
+        # Unknown partition layout: keep every partition rule so the model has all the examples
+        if not matching_partition_sections:
+            matching_partition_sections = set(partition_sections)
+
+        selected = []
+        for section in sections:
+            if section.section_id in partition_sections:
+                include = section.section_id in matching_partition_sections
+            else:
+                trigger = triggers.get(section.section_id)
+                include = trigger(context) if trigger else True
+            if include:
+                selected.append(section.text)
+
+        return preamble + "".join(selected) + notes
+
+    def _trigger_context(self) -> Dict[str, Any]:
+        partitions = self.parameters.get("partitions") or []
+        if isinstance(partitions, str):
+            partitions = [column.strip() for column in partitions.split(",") if column.strip()]
+        return {
+            "partitions": list(partitions),
+            "grouped_fields": self.grouped_fields,
+            "has_decimals": any(data_type.lower().startswith("decimal") for data_type in self.grouped_fields),
+            "found_comma": bool(self.parameters.get("found_comma")),
+            "found_dot": bool(self.parameters.get("found_dot")),
+        }
+
+    def _relevant_parameters(self) -> Dict[str, Any]:
+        """Only the parameters still referenced by the template or read by the rules."""
+        names = set(self.PLACEHOLDER_PATTERN.findall(self.template)) | set(self.RULE_PARAMETERS)
+        return {key: value for key, value in self.parameters.items() if key in names}
+
+    @staticmethod
+    def _compact(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), sort_keys=True, default=str, ensure_ascii=False)
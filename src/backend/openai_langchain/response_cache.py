@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache for LLM responses.
+
+    Entries are keyed by a SHA-256 of every prompt input, stored one JSON file per key,
+    expire after `ttl_seconds` and are evicted least-recently-used first once the cache
+    exceeds `max_entries` or `max_bytes`.
+    """
+
+    DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".poc_ingesta_cache", "llm")
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 500,
+                 max_bytes: int = 50 * 1024 * 1024, ttl_seconds: Optional[float] = 30 * 24 * 3600):
+        """
+        Initialize the ResponseCache.
+
+        :param cache_dir: Folder where entries are stored. Defaults to $LLM_CACHE_DIR or ~/.poc_ingesta_cache/llm.
+        :param max_entries: Maximum number of entries kept on disk.
+        :param max_bytes: Maximum total size of the entries on disk.
+        :param ttl_seconds: Lifetime of an entry. None keeps entries until they are evicted.
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("LLM_CACHE_DIR") or self.DEFAULT_DIR)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(**inputs: Any) -> str:
+        """
+        Builds the cache key from the prompt inputs. Dictionaries are serialized with sorted keys,
+        so the same parameters in a different order produce the same key.
+
+        :return: Hex SHA-256 digest.
+        """
+        payload = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached response for the key, or None if it is missing or expired.
+        """
+        path = self._entry_path(key)
+        try:
+            with path.open("r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+
+        if self.ttl_seconds is not None and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            self._count(hit=False)
+            return None
+
+        # The modification time tracks the last access for the LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hit=True)
+        return entry.get("response")
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Stores a response and evicts old entries if the cache is over its limits.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as file:
+                json.dump({"created_at": time.time(), "response": response}, file)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("No se pudo guardar la respuesta en caché: %s", e)
+            self._remove(tmp_path)
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        for path in self.cache_dir.glob("*.json"):
+            self._remove(path)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit/miss counters of this process."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_bytes -= size
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+_default_cache: Optional[ResponseCache] = None
+
+
+def get_default_cache() -> ResponseCache:
+    """Returns the process-wide cache, so hit/miss counters are shared by every job."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Optional
+
+
+class ArtifactManifest:
+    """
+    Per-table record of what produced each generated artifact (<name>.output.schema, <name>.rep.json,
+    <name>.rep.conf): the digest of every input it depends on and the digest of the file written.
+
+    An artifact is fresh when its inputs have the same digests as in the manifest and the file on
+    disk still has the recorded digest; fresh artifacts are not regenerated on a re-run.
+
+    The manifest is job metadata, not part of the kirby module: it is stored outside the module tree,
+    in <root_path>/.manifests/<artifact folder relative to root_path>/<name>.manifest.json (add
+    .manifests/ to the repository .gitignore). Manifests written by older versions next to the
+    artifacts (.<name>.manifest.json) are still read, and removed on the next save.
+    """
+
+    VERSION = 1
+    MANIFEST_DIR = ".manifests"
+    # Ficheros de muestra hasta este tamaño se hashean completos; los mayores por tamaño, mtime, inicio y final
+    FULL_HASH_LIMIT = 16 * 1024 * 1024
+    EDGE_BYTES = 1024 * 1024
+
+    def __init__(self, folder_path: str, name: str, root_path: Optional[str] = None):
+        """
+        Initialize an empty manifest. Use `load` to read the stored one.
+
+        :param folder_path: Folder of the table artifacts (FolderGenerator complete_path).
+        :param name: Table name.
+        :param root_path: Repository root (the job folder_path) holding the .manifests folder.
+                          Defaults to folder_path.
+        """
+        self.folder_path = folder_path
+        self.name = name
+        root_path = os.path.abspath(root_path or folder_path)
+        relative_path = os.path.relpath(os.path.abspath(folder_path), root_path)
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            raise ValueError(f"'{folder_path}' is outside of '{root_path}'.")
+        self.path = os.path.normpath(os.path.join(root_path, self.MANIFEST_DIR, relative_path, f"{name}.manifest.json"))
+        self.legacy_path = os.path.join(folder_path, f".{name}.manifest.json")
+        self.artifacts: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, folder_path: str, name: str, root_path: Optional[str] = None) -> "ArtifactManifest":
+        """
+        Reads the stored manifest (or the legacy one next to the artifacts). A missing, unreadable or
+        older-version manifest loads empty, which makes every artifact stale.
+        """
+        manifest = cls(folder_path, name, root_path)
+        path = manifest.path if os.path.exists(manifest.path) else manifest.legacy_path
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return manifest
+        if isinstance(data, dict) and data.get("version") == cls.VERSION and isinstance(data.get("artifacts"), dict):
+            manifest.artifacts = data["artifacts"]
+        return manifest
+
+    def is_fresh(self, artifact: str, file_name: str, inputs: Dict[str, str]) -> bool:
+        """
+        Checks whether an artifact can be kept.
+
+        :param artifact: Artifact key (e.g. "rep_conf").
+        :param file_name: File name of the artifact in the folder.
+        :param inputs: Current digest of each input of the artifact.
+        :return: True if the inputs did not change and the file was not modified or removed.
+        """
+        entry = self.artifacts.get(artifact)
+        if not entry or entry.get("file") != file_name or entry.get("inputs") != inputs:
+            return False
+        return self.hash_file(os.path.join(self.folder_path, file_name)) == entry.get("output")
+
+    def record(self, artifact: str, file_name: str, inputs: Dict[str, str]) -> bool:
+        """
+        Records a freshly written artifact.
+
+        :return: False if the file does not exist (nothing was written), True otherwise.
+        """
+        output = self.hash_file(os.path.join(self.folder_path, file_name))
+        if output is None:
+            self.artifacts.pop(artifact, None)
+            return False
+        self.artifacts[artifact] = {"file": file_name, "inputs": inputs, "output": output}
+        return True
+
+    def save(self) -> None:
+        """Writes the manifest atomically (temporary file plus rename) and removes the legacy one."""
+        content = json.dumps({"version": self.VERSION, "artifacts": self.artifacts}, indent=2, sort_keys=True)
+        manifest_folder = os.path.dirname(self.path)
+        os.makedirs(manifest_folder, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=manifest_folder, prefix=f".{self.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(content)
+            os.replace(temporary_path, self.path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        if self.legacy_path != self.path and os.path.exists(self.legacy_path):
+            os.remove(self.legacy_path)
+
+    # Digests
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def hash_value(cls, value: Any) -> str:
+        """Digest of a JSON-serializable value; dictionaries are hashed with sorted keys."""
+        return cls.hash_text(json.dumps(value, sort_keys=True, default=str, ensure_ascii=False))
+
+    @staticmethod
+    def hash_file(file_path: str) -> Optional[str]:
+        """SHA-256 of the whole file, or None if it cannot be read."""
+        digest = hashlib.sha256()
+        try:
+            with open(file_path, "rb") as file:
+                for block in iter(lambda: file.read(1024 * 1024), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    @classmethod
+    def fingerprint_files(cls, file_paths: Iterable[str]) -> str:
+        """
+        Fingerprint of the sample files. Files up to FULL_HASH_LIMIT are hashed completely; bigger
+        ones by size, mtime and their first and last EDGE_BYTES, so a large sample is not read again.
+        """
+        digest = hashlib.sha256()
+        for file_path in sorted(file_paths):
+            digest.update(os.path.abspath(file_path).encode("utf-8"))
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                digest.update(b"missing")
+                continue
+            if stat.st_size <= cls.FULL_HASH_LIMIT:
+                digest.update((cls.hash_file(file_path) or "").encode("ascii"))
+                continue
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode("ascii"))
+            with open(file_path, "rb") as file:
+                digest.update(file.read(cls.EDGE_BYTES))
+                file.seek(-cls.EDGE_BYTES, os.SEEK_END)
+                digest.update(file.read(cls.EDGE_BYTES))
+        return digest.hexdigest()
@@ -0,0 +1,330 @@
+import io
+import json
+import logging
+import os
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import fastavro
+
+from backend.utils.csv_decimal_validator import CSVDecimalValidator, DecimalFieldStats, DecimalScanState
+from backend.utils.sample_profiler import SampleProfile
+
+logger = logging.getLogger(__name__)
+
+# Avro primitive type -> type name used in the .schema files (TypeToNameMapper keys)
+_AVRO_TYPES = {
+    "string": "string",
+    "int": "int32",
+    "long": "int64",
+    "float": "float",
+    "double": "double",
+    "boolean": "boolean",
+    "bytes": "binary",
+}
+
+
+class AvroProfile(SampleProfile):
+    """
+    SampleProfile of an Avro sample. Avro has no delimiter or header: `delimiter` stays None and
+    `columns` are the fields of the writer schema.
+
+    Attributes:
+        writer_schema (Dict[str, Any]): Schema stored in the Avro header.
+        grouped_fields (Dict[str, Tuple[str]]): Fields grouped by type, derived from the writer schema.
+        records_read (int): Records decoded.
+        blocks_read (int): Blocks submitted for decoding.
+    """
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self.writer_schema: Dict[str, Any] = {}
+        self.grouped_fields: Dict[str, Tuple[str]] = {}
+        self.records_read = 0
+        self.blocks_read = 0
+
+
+def grouped_fields_from_avro_schema(writer_schema: Dict[str, Any]) -> Dict[str, Tuple[str]]:
+    """
+    Groups the fields of an Avro record schema by type, with the same keys as TypeToNameMapper
+    ("string", "decimal(17,6)", "date", ...), so no .schema file is needed to profile the sample.
+    """
+    grouped: Dict[str, List[str]] = {}
+    for field in writer_schema.get("fields", []):
+        grouped.setdefault(_avro_type_name(field["type"]), []).append(field["name"])
+    return {key: tuple(names) for key, names in grouped.items()}
+
+
+def _avro_type_name(avro_type: Any) -> str:
+    if isinstance(avro_type, list):
+        # Nullable fields: ["null", <type>]
+        non_null = [item for item in avro_type if item != "null"]
+        return _avro_type_name(non_null[0]) if len(non_null) == 1 else "union"
+    if isinstance(avro_type, dict):
+        logical_type = avro_type.get("logicalType")
+        if logical_type == "decimal":
+            return f"decimal({avro_type.get('precision')},{avro_type.get('scale', 0)})"
+        if logical_type == "date":
+            return "date"
+        if logical_type and logical_type.startswith("timestamp"):
+            return "timestamp"
+        return _avro_type_name(avro_type.get("type"))
+    return _AVRO_TYPES.get(avro_type, str(avro_type))
+
+
+def _read_long(file) -> int:
+    """Reads a zig-zag varint, the Avro encoding of int and long."""
+    shift = 0
+    result = 0
+    while True:
+        byte = file.read(1)
+        if not byte:
+            raise EOFError
+        result |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return (result >> 1) ^ -(result & 1)
+        shift += 7
+
+
+def read_avro_header(file) -> Tuple[Dict[str, bytes], bytes, int]:
+    """
+    Reads the header of an Avro object container file.
+
+    :param file: Binary file positioned at the start.
+    :return: Tuple (metadata, sync marker, header size in bytes).
+    :raises ValueError: If the file is not an Avro object container.
+    """
+    if file.read(4) != b"Obj\x01":
+        raise ValueError("cannot read header - is it an avro file?")
+    metadata = {}
+    try:
+        while True:
+            count = _read_long(file)
+            if count == 0:
+                break
+            if count < 0:
+                count = -count
+                _read_long(file)  # Size of the map block in bytes
+            for _ in range(count):
+                key = file.read(_read_long(file)).decode("utf-8")
+                metadata[key] = file.read(_read_long(file))
+    except EOFError:
+        raise ValueError("truncated avro header")
+    sync = file.read(16)
+    if len(sync) != 16:
+        raise ValueError("truncated avro header")
+    return metadata, sync, file.tell()
+
+
+def index_avro_blocks(file, sync: bytes) -> Iterator[Tuple[int, int, int]]:
+    """
+    Walks the data blocks of an Avro file without decoding or decompressing them:
+    each block is a record count, a byte size, the data and the sync marker.
+
+    :param file: Binary file positioned right after the header.
+    :param sync: Sync marker of the file.
+    :return: Iterator of (offset, size including the sync marker, records) per block.
+    """
+    while True:
+        offset = file.tell()
+        try:
+            records = _read_long(file)
+        except EOFError:
+            return
+        size = _read_long(file)
+        file.seek(size, os.SEEK_CUR)
+        if file.read(16) != sync:
+            raise ValueError(f"sync marker mismatch in block at offset {offset}")
+        yield offset, file.tell() - offset, records
+
+
+def _decode_blocks(file_path: str, header_size: int, start: int, end: int,
+                   decimal_columns: Tuple[Tuple[str, int], ...], date_columns: Tuple[str, ...],
+                   max_date_samples: int) -> Tuple[DecimalScanState, Dict[str, List[str]], int]:
+    """
+    Decodes the contiguous blocks in [start, end) of an Avro file and profiles them.
+    The header is prepended to the block bytes so fastavro's reader (decompression included) does the work.
+    Module level so it can run in a process pool.
+
+    :return: Tuple (decimal state, date samples per field, records decoded).
+    """
+    with open(file_path, "rb") as file:
+        header = file.read(header_size)
+        file.seek(start)
+        data = file.read(end - start)
+
+    state = DecimalScanState()
+    decimal_values: Dict[str, List[str]] = {field: [] for field, _ in decimal_columns}
+    date_samples: Dict[str, List[str]] = {field: [] for field in date_columns}
+    pending_dates = list(date_columns)
+    records = 0
+
+    # Values are gathered per column and profiled column at a time
+    # No reader schema: projecting fields goes through fastavro's schema resolution, slower than full decoding
+    for record in fastavro.reader(io.BytesIO(header + data)):
+        records += 1
+        for field, values in decimal_values.items():
+            values.append(record.get(field))
+        if pending_dates:
+            for field in pending_dates:
+                value = _date_text(record.get(field))
+                if value:
+                    date_samples[field].append(value)
+            pending_dates = [field for field in pending_dates if len(date_samples[field]) < max_date_samples]
+
+    for field, decimal_places in decimal_columns:
+        stats = state.fields[field] = DecimalFieldStats()
+        stats.update_many(_decimal_texts(decimal_values[field]), decimal_places)
+    state.rows_scanned = records
+    return state, date_samples, records
+
+
+def _decimal_texts(values: List[Any]) -> Iterator[str]:
+    # Only text values can carry a separator; Avro decimal logical types (Decimal) and numeric types do not
+    return (value for value in values if isinstance(value, str))
+
+
+def _date_text(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return value.strip() if isinstance(value, str) else ""
+
+
+class AvroSampleProfiler:
+    """
+    Profiles an Avro sample with the same output as SampleProfiler: decimal analysis and date samples.
+
+    The writer schema is read from the Avro header, so the field types are known without a .schema file.
+    Block boundaries are indexed from the container framing without decoding anything; batches of
+    contiguous blocks are then decompressed and decoded in the worker processes of the given executor, and no more blocks are submitted once the decimal analysis
+    is settled and every date field has its samples.
+    """
+
+    def __init__(self, file_path: str, grouped_fields: Optional[Dict[str, Tuple[str]]] = None,
+                 max_date_samples: int = 100, max_decimal_records: int = CSVDecimalValidator.DEFAULT_SAMPLE_ROWS,
+                 batch_records: int = 10_000, max_in_flight: Optional[int] = None, early_stop: bool = True):
+        """
+        Initialize the AvroSampleProfiler.
+
+        :param file_path: Path to the Avro sample file.
+        :param grouped_fields: Field names grouped by data type. Derived from the writer schema if not given.
+        :param max_date_samples: Number of values kept per date field for format detection.
+        :param max_decimal_records: Maximum number of records scanned for the decimal analysis.
+        :param batch_records: Records per batch of blocks sent to a worker.
+        :param max_in_flight: Batches submitted and not yet merged. Defaults to twice the CPU count.
+        :param early_stop: Stop reading blocks once the profile is settled. False decodes the whole file.
+        """
+        self.file_path = file_path
+        self.grouped_fields = grouped_fields
+        self.max_date_samples = max_date_samples
+        self.max_decimal_records = max_decimal_records
+        self.batch_records = batch_records
+        self.max_in_flight = max_in_flight or (os.cpu_count() or 1) * 2
+        self.early_stop = early_stop
+
+    def profile(self, executor: Optional[Executor] = None) -> Optional[AvroProfile]:
+        """
+        Profiles the file.
+
+        :param executor: Executor to decode the batches in. Batches are decoded in the calling thread if not given.
+        :return: The AvroProfile, or None if the file is not a valid Avro file.
+        """
+        profile = AvroProfile(self.file_path)
+        try:
+            with open(self.file_path, "rb") as file:
+                metadata, sync, header_size = read_avro_header(file)
+                profile.writer_schema = json.loads(metadata["avro.schema"])
+                profile.grouped_fields = grouped_fields_from_avro_schema(profile.writer_schema)
+                self._scan(profile, header_size, index_avro_blocks(file, sync), executor)
+        except FileNotFoundError:
+            logger.error("File '%s' not found.", self.file_path)
+            return None
+        except (ValueError, KeyError) as error:
+            logger.error("File '%s' is not a valid AVRO file: %s", self.file_path, error)
+            return None
+        return profile
+
+    def _scan(self, profile: AvroProfile, header_size: int, blocks, executor: Optional[Executor]) -> None:
+        grouped_fields = self.grouped_fields or profile.grouped_fields
+        profile.columns = [field["name"] for field in profile.writer_schema.get("fields", [])]
+
+        decimal_columns = tuple(
+            (field, decimal_places)
+            for fields, decimal_places in CSVDecimalValidator.get_decimal_fields(grouped_fields).values()
+            for field in fields if field in profile.columns
+        )
+        date_columns = tuple(field for field in grouped_fields.get("date", ()) if field in profile.columns)
+        missing_fields = [
+            field for fields, _ in CSVDecimalValidator.get_decimal_fields(grouped_fields).values()
+            for field in fields if field not in profile.columns
+        ]
+        if missing_fields:
+            logger.warning("The following fields are missing in the AVRO file: %s", missing_fields)
+
+        for field in date_columns:
+            profile.date_samples[field] = []
+        if not decimal_columns and not date_columns:
+            return
+
+        decimal_fields = [field for field, _ in decimal_columns]
+        max_in_flight = self.max_in_flight if executor is not None else 1
+        pending = set()
+
+        def merge(result) -> None:
+            state, date_samples, records = result
+            profile.decimal_state.merge(state)
+            profile.records_read += records
+            for field, samples in date_samples.items():
+                field_samples = profile.date_samples[field]
+                field_samples.extend(samples[:self.max_date_samples - len(field_samples)])
+                if field_samples:
+                    profile.first_values.setdefault(field, field_samples[0])
+
+        def done() -> bool:
+            state = profile.decimal_state
+            decimals_done = not decimal_columns or state.rows_scanned >= self.max_decimal_records or state.is_settled(
+                decimal_fields, CSVDecimalValidator.DEFAULT_MIN_VALUES, CSVDecimalValidator.DEFAULT_CONFIDENCE)
+            dates_done = all(len(profile.date_samples[field]) >= self.max_date_samples for field in date_columns)
+            return decimals_done and dates_done
+
+        def submit(start: int, end: int) -> None:
+            arguments = (self.file_path, header_size, start, end, decimal_columns, date_columns, self.max_date_samples)
+            if executor is None:
+                merge(_decode_blocks(*arguments))
+            else:
+                pending.add(executor.submit(_decode_blocks, *arguments))
+
+        batch_start = None
+        batch_end = None
+        batch_size = 0
+        stopped_early = False
+        for offset, size, records in blocks:
+            profile.blocks_read += 1
+            profile.bytes_read += size
+            if batch_start is None:
+                batch_start = offset
+            batch_end = offset + size
+            batch_size += records
+            if batch_size < self.batch_records:
+                continue
+
+            submit(batch_start, batch_end)
+            batch_start, batch_size = None, 0
+            while len(pending) >= max_in_flight:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    pending.discard(future)
+                    merge(future.result())
+            if self.early_stop and done():
+                stopped_early = True
+                break
+
+        if batch_start is not None and not stopped_early:
+            submit(batch_start, batch_end)
+        for future in pending:
+            merge(future.result())
+
+        profile.decimal_state.stopped_early = stopped_early
+        profile.rows_read = profile.records_read
+        profile.decimal_analysis = profile.decimal_state.result()
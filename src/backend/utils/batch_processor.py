@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.utils.general_pom_updater import GeneralPomUpdater
+from backend.utils.module_pom_generator2 import ModulePomGenerator
+from backend.utils.staged_artifact_writer import StagedArtifactWriter
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class BatchTableStatus:
+    """Possible states of one table of a batch."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class BatchProcessor:
+    """
+    Onboards several tables (schema_file_path, data_sample_file_path pairs) under one folder_path in a single job.
+
+    Each table runs its own ParameterProcessor concurrently (folders, output schema, rep.json and .conf),
+    sharing the worker's process pool and LLM clients, but without touching the general pom. Once every
+    table is done the general pom.xml gets one merged update with the modules of the successful tables,
+    and the module poms are generated from a single parse of it (see PomMetadataCache).
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    def __init__(self, parameters: dict, api_key: str, progress_callback: Optional[ProgressCallback] = None):
+        """
+        Initialize the BatchProcessor.
+
+        :param parameters: Batch parameters: "folder_path", "tables" (list of dicts with "schema_file_path"
+                           and "data_sample_file_path", optionally with their own parameters) and the
+                           parameters shared by every table. "max_concurrency" limits the tables processed at once.
+        :param api_key: API key for OpenAI processor.
+        :param progress_callback: Coroutine called with (table key, progress entry) every time a table changes state.
+        """
+        self.parameters = dict(parameters)
+        self.api_key = api_key
+        self.progress_callback = progress_callback
+        self.tables: List[Dict[str, Any]] = self.parameters.pop("tables", None) or []
+        self.max_concurrency = int(self.parameters.pop("max_concurrency", self.DEFAULT_MAX_CONCURRENCY))
+        self.folder_path = self.parameters.get("folder_path")
+        if not self.folder_path:
+            raise ValueError("folder_path cannot be empty.")
+        if not self.tables:
+            raise ValueError("The batch has no tables.")
+
+    @staticmethod
+    def table_key(index: int, table: Dict[str, Any]) -> str:
+        """Key of a table in the progress and result dictionaries: position and schema file name."""
+        return f"{index}:{os.path.basename(table['schema_file_path'])}"
+
+    def _table_parameters(self, table: Dict[str, Any]) -> dict:
+        """Shared parameters overridden by the table's own ones."""
+        return {**self.parameters, **table, "folder_path": self.folder_path}
+
+    async def _report(self, key: str, entry: Dict[str, Any]) -> None:
+        if self.progress_callback is None:
+            return
+        try:
+            await self.progress_callback(key, entry)
+        except Exception as e:
+            logger.warning("No se pudo reportar el progreso de %s: %s", key, e)
+
+    async def _process_table(self, semaphore: asyncio.Semaphore, key: str, table: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            await self._report(key, {"status": BatchTableStatus.RUNNING})
+            try:
+                # Import diferido: la API solo usa table_key y no debe cargar los clientes del LLM
+                from backend.utils.parameters_processor2 import ParameterProcessor
+                processor = ParameterProcessor(self._table_parameters(table), self.api_key, update_poms=False)
+                result = await processor.process_parameters()
+            except Exception as e:
+                logger.exception("Batch - Table %s failed", key)
+                entry = {"status": BatchTableStatus.FAILED, "error": str(e)}
+                await self._report(key, entry)
+                return entry
+            entry = {"status": BatchTableStatus.SUCCEEDED, "result": result}
+            await self._report(key, {"status": BatchTableStatus.SUCCEEDED})
+            return entry
+
+    def _update_poms(self, uuaas: List[str]) -> Dict[str, Any]:
+        """
+        Module poms (sharing the cached parse of the general pom) are staged and published together;
+        then one merged update of the general pom, so it only lists published modules.
+        """
+        stage = StagedArtifactWriter(self.folder_path)
+        try:
+            for uuaa in uuaas:
+                stage.staged_folder(os.path.join(self.folder_path, uuaa))
+                ModulePomGenerator(self.folder_path, uuaa, stage.staged_folder(self.folder_path)).generate_xml()
+            stage.publish()
+        except BaseException:
+            stage.discard()
+            raise
+        general_pom_updated = GeneralPomUpdater(self.folder_path, uuaas).update_module_content()
+        return {"general_pom_updated": general_pom_updated, "modules": uuaas}
+
+    async def process(self) -> Dict[str, Any]:
+        """
+        Processes every table and then updates the poms once.
+
+        :return: Dictionary with the per-table entries (status plus result or error) and the pom update.
+        :raises RuntimeError: If every table failed.
+        """
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+        keys = [self.table_key(index, table) for index, table in enumerate(self.tables)]
+        entries = await asyncio.gather(*(
+            self._process_table(semaphore, key, table) for key, table in zip(keys, self.tables)
+        ))
+        tables = dict(zip(keys, entries))
+
+        # uuaa de las tablas correctas, en orden y sin duplicados
+        uuaas = list(dict.fromkeys(
+            entry["result"]["folder_info"]["uuaa"] for entry in entries
+            if entry["status"] == BatchTableStatus.SUCCEEDED and entry["result"] and entry["result"].get("folder_info")
+        ))
+        if not uuaas:
+            raise RuntimeError(f"Every table of the batch failed: { {key: entry.get('error') for key, entry in tables.items()} }")
+        poms = await asyncio.to_thread(self._update_poms, uuaas)
+
+        failed = [key for key, entry in tables.items() if entry["status"] == BatchTableStatus.FAILED]
+        logger.info("Batch terminado: %d tablas correctas, %d con error", len(tables) - len(failed), len(failed))
+        return {"tables": tables, "poms": poms, "failed": failed}
@@ -1,11 +1,18 @@
+import logging
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
 
 class CsvDateFieldExtractor:
     """
     Class responsible for extracting values from CSV files based on grouped fields.
+
+    The CSV is read lazily: only the 'date' columns are loaded, in chunks, and reading stops as soon as
+    every date column has a non-null value, so memory is bounded by one chunk instead of the whole file.
     """
-    def __init__(self, csv_path: str, grouped_fields: Dict[str, List[str]], delimiter: str):
+    def __init__(self, csv_path: str, grouped_fields: Dict[str, List[str]], delimiter: str, profile=None,
+                 chunk_size: int = 10_000):
         """
         Initializes the CsvFieldExtractor.
 
@@ -13,23 +20,47 @@ class CsvDateFieldExtractor:
             csv_path (str): Path to the CSV file.
             grouped_fields (Dict[str, List[str]]): Dictionary containing field types as keys and
                                                  a list of field names as values.
+            profile (Optional[SampleProfile]): Profile already computed for this file by SampleProfiler.
+                                               When given, the CSV is not read.
+            chunk_size (int): Rows per chunk read from the CSV.
         """
         self._csv_path = csv_path
         self._grouped_fields = grouped_fields
         self.delimiter = delimiter
-        self._dataframe = None
-        self._load_csv()
+        self._profile = profile
+        self._chunk_size = chunk_size
+        self._columns = None
+        self._first_values = None
+
+    def _read_columns(self) -> List[str]:
+        """
+        Reads the header of the CSV file.
+
+        Raises:
+            FileNotFoundError: If the file is not found at the given path.
+            ValueError: If an error occurs while reading the CSV file.
+        """
+        if self._columns is None:
+            if self._profile is not None:
+                self._columns = list(self._profile.columns)
+            else:
+                self._columns = list(self._read_csv(nrows=0).columns)
+        return self._columns
 
-    def _load_csv(self) -> None:
+    def _iter_chunks(self, usecols: List[str]) -> Iterator[pd.DataFrame]:
         """
-        Loads the CSV file into a pandas DataFrame securely.
+        Streams the given columns of the CSV file in chunks of `chunk_size` rows, as strings.
 
         Raises:
             FileNotFoundError: If the file is not found at the given path.
             ValueError: If an error occurs while reading the CSV file.
         """
+        with self._read_csv(usecols=usecols, dtype=str, chunksize=self._chunk_size) as reader:
+            yield from reader
+
+    def _read_csv(self, **kwargs):
         try:
-            self._dataframe = pd.read_csv(self._csv_path, sep=self.delimiter)
+            return pd.read_csv(self._csv_path, sep=self.delimiter, **kwargs)
         except FileNotFoundError as file_error:
             raise FileNotFoundError(f"File not found: '{self._csv_path}'.") from file_error
         except pd.errors.EmptyDataError:
@@ -37,28 +68,68 @@ class CsvDateFieldExtractor:
         except Exception as error:
             raise ValueError(f"Error loading the CSV file: {error}.")
 
-    def get_first_date_field_value(self) -> str:
+    def get_first_date_field_values(self) -> Dict[str, str]:
         """
-        Retrieves the first value of a field with the 'date' type from the CSV file.
+        Retrieves the first non-null value of every 'date' type field present in the CSV file.
 
         Returns:
-            str: The first value of a 'date' type field.
+            Dict[str, str]: Field name mapped to its first value, in the order of grouped_fields.
+                            Fields missing from the CSV or without values are left out.
 
         Raises:
-            ValueError: If no 'date' fields are found or none exist in the CSV file.
+            ValueError: If no 'date' fields are found in grouped_fields.
         """
         date_fields = self._grouped_fields.get('date', [])
         if not date_fields:
             raise ValueError("No fields of type 'date' found in grouped_fields.")
-        
-        print(f"Campos de tipo Date gropued_fields: {date_fields}")
-        print(f"Campos de la Sample Data CSV: {self._dataframe.columns}")
 
+        if self._first_values is not None:
+            return self._first_values
+
+        logger.debug("Campos de tipo Date grouped_fields: %s", date_fields)
+        columns = self._read_columns()
+        logger.debug("Campos de la Sample Data CSV: %s", columns)
+
+        present_fields = []
         for field in date_fields:
-            if field in self._dataframe.columns:
-                # Return the first non-null value for the field
-                first_value = self._dataframe[field].dropna().iloc[0]
-                return str(first_value)
-            print(f"Warning: Field '{field}' does not exist in the CSV file.")
+            if field in columns:
+                present_fields.append(field)
+            else:
+                logger.warning("Field '%s' does not exist in the CSV file.", field)
+
+        if self._profile is not None:
+            first_values = {
+                field: self._profile.first_values[field]
+                for field in present_fields if field in self._profile.first_values
+            }
+        else:
+            found = {}
+            pending = set(present_fields)
+            if pending:
+                for chunk in self._iter_chunks(present_fields):
+                    for field in list(pending):
+                        values = chunk[field].dropna()
+                        if not values.empty:
+                            found[field] = str(values.iloc[0])
+                            pending.discard(field)
+                    if not pending:
+                        break
+            first_values = {field: found[field] for field in present_fields if field in found}
+
+        self._first_values = first_values
+        return first_values
+
+    def get_first_date_field_value(self) -> str:
+        """
+        Retrieves the first value of a field with the 'date' type from the CSV file.
+
+        Returns:
+            str: The first value of a 'date' type field.
 
-        raise ValueError("None of the 'date' fields exist in the CSV file.")
+        Raises:
+            ValueError: If no 'date' fields are found or none exist in the CSV file.
+        """
+        first_values = self.get_first_date_field_values()
+        if not first_values:
+            raise ValueError("None of the 'date' fields exist in the CSV file.")
+        return next(iter(first_values.values()))
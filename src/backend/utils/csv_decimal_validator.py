@@ -1,28 +1,284 @@
 import csv
+import itertools
+import logging
+import math
+import mmap
+import random
 import re
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+
+def _wilson_lower_bound(successes: int, total: int, z: float = 2.576) -> float:
+    """Lower bound of the Wilson score interval for a proportion (99% by default)."""
+    if total == 0:
+        return 0.0
+    proportion = successes / total
+    denominator = 1 + z * z / total
+    centre = proportion + z * z / (2 * total)
+    margin = z * math.sqrt(proportion * (1 - proportion) / total + z * z / (4 * total * total))
+    return (centre - margin) / denominator
+
+
+class DecimalFieldStats:
+    """
+    Counters for the values of one decimal field.
+
+    Attributes:
+        values (int): Non-empty values seen.
+        with_comma (int): Values containing a comma.
+        with_dot (int): Values containing a dot.
+        symbols (Dict[str, int]): Values whose decimal symbol was ',' or '.'.
+        scale_violations (int): Values with a decimal symbol whose fractional digits differ from the scale.
+    """
+
+    __slots__ = ("values", "with_comma", "with_dot", "symbols", "scale_violations")
+
+    def __init__(self) -> None:
+        self.values = 0
+        self.with_comma = 0
+        self.with_dot = 0
+        self.symbols = {",": 0, ".": 0}
+        self.scale_violations = 0
+
+    def update(self, value: str, decimal_places: int) -> None:
+        value = value.strip()
+        if not value:
+            return
+        self.values += 1
+
+        has_comma = "," in value
+        has_dot = "." in value
+        if has_comma:
+            self.with_comma += 1
+        if has_dot:
+            self.with_dot += 1
+
+        # The rightmost separator is the decimal symbol
+        if has_comma and has_dot:
+            symbol = "," if value.rfind(",") > value.rfind(".") else "."
+        elif has_comma:
+            symbol = ","
+        elif has_dot:
+            symbol = "."
+        else:
+            return
+
+        self.symbols[symbol] += 1
+        if len(value.rsplit(symbol, 1)[1]) != decimal_places:
+            self.scale_violations += 1
+
+    def update_many(self, values: Iterable[str], decimal_places: int) -> None:
+        """Same as calling update for each value, with the counters kept in locals for column-at-a-time callers."""
+        count = with_comma = with_dot = comma_symbol = dot_symbol = violations = 0
+        for value in values:
+            value = value.strip()
+            if not value:
+                continue
+            count += 1
+            comma = value.rfind(",")
+            dot = value.rfind(".")
+            if comma >= 0:
+                with_comma += 1
+            if dot >= 0:
+                with_dot += 1
+            # The rightmost separator is the decimal symbol
+            position = comma if comma > dot else dot
+            if position < 0:
+                continue
+            if comma > dot:
+                comma_symbol += 1
+            else:
+                dot_symbol += 1
+            if len(value) - position - 1 != decimal_places:
+                violations += 1
+
+        self.values += count
+        self.with_comma += with_comma
+        self.with_dot += with_dot
+        self.symbols[","] += comma_symbol
+        self.symbols["."] += dot_symbol
+        self.scale_violations += violations
+
+    @property
+    def with_symbol(self) -> int:
+        return self.symbols[","] + self.symbols["."]
+
+    @property
+    def decimal_symbol(self) -> Optional[str]:
+        if not self.with_symbol:
+            return None
+        return "," if self.symbols[","] >= self.symbols["."] else "."
+
+    @property
+    def confidence(self) -> float:
+        """Share of the values with a separator that agree with the majority decimal symbol."""
+        if not self.with_symbol:
+            return 0.0
+        return max(self.symbols.values()) / self.with_symbol
+
+    def is_settled(self, min_values: int, confidence: float) -> bool:
+        """
+        True once the decimal symbol and the scale verdict are statistically stable:
+        the Wilson lower bound of both the majority symbol share and of the majority scale verdict
+        (conforming or violating) reach `confidence`.
+        """
+        if self.values < min_values:
+            return False
+        if not self.with_symbol:
+            return True
+        symbol_share = _wilson_lower_bound(max(self.symbols.values()), self.with_symbol)
+        scale_majority = max(self.scale_violations, self.with_symbol - self.scale_violations)
+        scale_share = _wilson_lower_bound(scale_majority, self.with_symbol)
+        return symbol_share >= confidence and scale_share >= confidence
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "values": self.values,
+            "comma": self.with_comma,
+            "dot": self.with_dot,
+            "decimal_symbol": self.decimal_symbol,
+            "confidence": round(self.confidence, 4),
+            "scale_violations": self.scale_violations,
+        }
+
+
+class DecimalScanState:
+    """
+    Running state of the decimal scan. Values are fed one at a time, so the same logic can be
+    shared by CSVDecimalValidator and the single-pass SampleProfiler.
+    """
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, DecimalFieldStats] = {}
+        self.rows_scanned = 0
+        self.stopped_early = False
+
+    def update(self, field: str, value: str, decimal_places: int) -> None:
+        """
+        Updates the state with a value of a decimal field.
+
+        Args:
+            field (str): Name of the field.
+            value (str): The raw value of the field.
+            decimal_places (int): Scale declared for the field.
+        """
+        stats = self.fields.get(field)
+        if stats is None:
+            stats = self.fields[field] = DecimalFieldStats()
+        stats.update(value, decimal_places)
+
+    def merge(self, other: "DecimalScanState") -> None:
+        """
+        Adds the counters of another state, e.g. the scan of another file of the same table.
+
+        Args:
+            other (DecimalScanState): State to add to this one.
+        """
+        for field, other_stats in other.fields.items():
+            stats = self.fields.get(field)
+            if stats is None:
+                stats = self.fields[field] = DecimalFieldStats()
+            stats.values += other_stats.values
+            stats.with_comma += other_stats.with_comma
+            stats.with_dot += other_stats.with_dot
+            stats.scale_violations += other_stats.scale_violations
+            for symbol, count in other_stats.symbols.items():
+                stats.symbols[symbol] += count
+        self.rows_scanned += other.rows_scanned
+        self.stopped_early = self.stopped_early or other.stopped_early
+
+    def is_settled(self, fields: List[str], min_values: int, confidence: float) -> bool:
+        """True when every given field is settled (see DecimalFieldStats.is_settled)."""
+        return all(field in self.fields and self.fields[field].is_settled(min_values, confidence) for field in fields)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Returns the analysis in the format of CSVDecimalValidator.analyze_csv.
+        """
+        fields = self.fields.values()
+        symbols = {
+            symbol: sum(stats.symbols[symbol] for stats in fields) for symbol in (",", ".")
+        }
+        with_symbol = symbols[","] + symbols["."]
+        violations = sum(stats.scale_violations for stats in fields)
+        decimal_symbol = None
+        if with_symbol:
+            decimal_symbol = "," if symbols[","] >= symbols["."] else "."
+
+        return {
+            "comma": any(stats.with_comma for stats in fields),
+            "dot": any(stats.with_dot for stats in fields),
+            "decimal_symbol": decimal_symbol,
+            "confidence": round(max(symbols.values()) / with_symbol, 4) if with_symbol else 0.0,
+            "correct_data": bool(with_symbol) and violations == 0,
+            "scale_violations": violations,
+            "rows_scanned": self.rows_scanned,
+            "stopped_early": self.stopped_early,
+            "fields": {field: stats.to_dict() for field, stats in self.fields.items()},
+        }
+
 
 class CSVDecimalValidator:
     """
     A class to validate CSV files for correct decimal formats and delimiters.
 
+    Only a bounded sample of rows is inspected, chosen by one of the sampling strategies:
+        - "head": the first `sample_rows` rows.
+        - "reservoir": `sample_rows` rows chosen uniformly from the whole file (reads every row,
+          keeps constant memory).
+        - "stratified": `sample_rows` rows read from `strata` byte ranges spread over a memory map
+          of the file (runtime does not depend on the file size).
+        - "full": every row.
+    Except for "reservoir", scanning stops as soon as every field is settled.
+
     Attributes:
         csv_path (str): Path to the CSV file to be validated.
         grouped_fields (Dict[str, Tuple[str]]): Mapping of data types to fields in the CSV.
         delimiter (str): The delimiter used in the CSV file.
     """
 
-    def __init__(self, csv_path: str, grouped_fields: Dict[str, Tuple[str]]) -> None:
+    HEAD = "head"
+    RESERVOIR = "reservoir"
+    STRATIFIED = "stratified"
+    FULL = "full"
+    STRATEGIES = (HEAD, RESERVOIR, STRATIFIED, FULL)
+
+    DEFAULT_SAMPLE_ROWS = 100_000
+    DEFAULT_MIN_VALUES = 200
+    DEFAULT_CONFIDENCE = 0.95
+
+    def __init__(self, csv_path: str, grouped_fields: Dict[str, Tuple[str]], profile=None, strategy: str = HEAD,
+                 sample_rows: int = DEFAULT_SAMPLE_ROWS, min_values: int = DEFAULT_MIN_VALUES,
+                 confidence: float = DEFAULT_CONFIDENCE, strata: int = 64, seed: int = 0) -> None:
         """
         Initialize the CSVDecimalValidator.
 
         Args:
             csv_path (str): Path to the CSV file.
             grouped_fields (Dict[str, Tuple[str]]): Dictionary of data types mapped to fields.
+            profile (Optional[SampleProfile]): Profile already computed for this file by SampleProfiler.
+                                               When given, the file is not read again.
+            strategy (str): Sampling strategy, one of STRATEGIES.
+            sample_rows (int): Maximum number of rows inspected.
+            min_values (int): Values per field required before the scan can stop early.
+            confidence (float): Confidence required to consider a field settled.
+            strata (int): Number of byte ranges read by the "stratified" strategy.
+            seed (int): Seed of the random choices of "reservoir" and "stratified".
         """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy '{strategy}'. Use one of {self.STRATEGIES}.")
         self.csv_path = csv_path
         self.grouped_fields = grouped_fields
-        self.delimiter = self._detect_delimiter()
+        self.profile = profile
+        self.strategy = strategy
+        self.sample_rows = sample_rows
+        self.min_values = min_values
+        self.confidence = confidence
+        self.strata = strata
+        self.seed = seed
+        self.delimiter = profile.delimiter if profile is not None else self._detect_delimiter()
 
     def _detect_delimiter(self) -> str:
         """
@@ -48,69 +304,149 @@ class CSVDecimalValidator:
             Dict[str, Any]: A dictionary with analysis results including:
                 - comma (bool): Whether commas are present in the values.
                 - dot (bool): Whether dots are present in the values.
-                - decimal_symbol (str): The detected decimal symbol (',' or '.').
-                - correct_data (bool): Whether the data complies with the decimal format.
+                - decimal_symbol (str): The majority decimal symbol (',' or '.').
+                - confidence (float): Share of the values that agree with decimal_symbol.
+                - correct_data (bool): Whether every sampled value complies with its scale.
+                - scale_violations (int): Number of sampled values that do not comply with their scale.
+                - rows_scanned (int): Number of rows inspected.
+                - stopped_early (bool): Whether the scan stopped because every field was settled.
+                - fields (Dict[str, Dict]): The same counters per decimal field.
         """
-        comma = False
-        dot = False
-        decimal_symbol = None
-        correct_data = False  # Default to False
+        if self.profile is not None:
+            return self.profile.decimal_analysis
 
-        # Extract decimal field specifications
-        decimal_fields = {
-            data_type: (fields, int(re.search(r"\((\d+),(\d+)\)", data_type).group(2)))
-            for data_type, fields in self.grouped_fields.items()
-            if data_type.startswith("decimal") and re.search(r"\((\d+),(\d+)\)", data_type)
-        }
+        state = DecimalScanState()
+        decimal_fields = self.get_decimal_fields(self.grouped_fields)
+
+        with open(self.csv_path, mode='r', newline='', encoding='utf-8') as file:
+            headers = next(csv.reader([file.readline()], delimiter=self.delimiter), [])
+
+        columns = self._resolve_columns(decimal_fields, headers)
+        if not columns:
+            return state.result()
+
+        if self.strategy == self.STRATIFIED:
+            rows = self._stratified_rows()
+        else:
+            rows = self._sequential_rows()
+            if self.strategy == self.RESERVOIR:
+                rows = iter(self._reservoir(rows))
+
+        self.scan_rows(state, rows, columns, self.strategy != self.FULL and self.strategy != self.RESERVOIR)
+        return state.result()
+
+    def scan_rows(self, state: DecimalScanState, rows, columns: List[Tuple[str, int, int]], early_stop: bool) -> None:
+        """
+        Feeds the decimal columns of the rows into the state, up to `sample_rows` rows.
 
-        # Read the CSV file
+        Args:
+            state (DecimalScanState): State to update.
+            rows (Iterable[List[str]]): Parsed data rows.
+            columns (List[Tuple[str, int, int]]): (field name, column index, decimal places) of each decimal field.
+            early_stop (bool): Stop as soon as every field is settled.
+        """
+        field_names = [field for field, _, _ in columns]
+        limit = None if self.strategy == self.FULL else self.sample_rows
+        for row in itertools.islice(rows, limit):
+            state.rows_scanned += 1
+            row_length = len(row)
+            for field, index, decimal_places in columns:
+                if index < row_length:
+                    state.update(field, row[index], decimal_places)
+            if early_stop and state.rows_scanned % 100 == 0 \
+                    and state.is_settled(field_names, self.min_values, self.confidence):
+                state.stopped_early = True
+                return
+
+    @staticmethod
+    def _resolve_columns(decimal_fields: Dict[str, Tuple[Tuple[str], int]], headers: List[str]) -> List[Tuple[str, int, int]]:
+        positions = {name: index for index, name in enumerate(headers)}
+
+        # Ensure fieldnames are present in the CSV header
+        missing_fields = [
+            field for fields, _ in decimal_fields.values() for field in fields if field not in positions
+        ]
+        if missing_fields:
+            logger.warning("The following fields are missing in the CSV file: %s", missing_fields)
+
+        return [
+            (field, positions[field], decimal_places)
+            for fields, decimal_places in decimal_fields.values()
+            for field in fields if field in positions
+        ]
+
+    def _sequential_rows(self) -> Iterator[List[str]]:
         with open(self.csv_path, mode='r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file, delimiter=self.delimiter)
-            headers = reader.fieldnames
-
-            # Ensure fieldnames are present in the CSV header
-            missing_fields = []
-            for decimal_type, (fields, _) in decimal_fields.items():
-                for field in fields:
-                    if field not in headers:
-                        missing_fields.append(field)
-
-            if missing_fields:
-                print(f"Warning: The following fields are missing in the CSV file: {missing_fields}")
-
-            for row in reader:
-                for decimal_type, (fields, decimal_places) in decimal_fields.items():
-                    for field in fields:
-                        if field not in headers:
-                            continue  # Skip missing fields
-
-                        value = row[field].strip()
-
-                        # Check for presence of comma and dot
-                        if "," in value:
-                            comma = True
-                        if "." in value:
-                            dot = True
-
-                        # Determine decimal symbol
-                        if "," in value and "." in value:
-                            decimal_symbol = "," if value.rfind(",") > value.rfind(".") else "."
-                        elif "," in value:
-                            decimal_symbol = ","
-                        elif "." in value:
-                            decimal_symbol = "."
-
-                        # Validate number of decimal places
-                        if decimal_symbol:
-                            parts = value.rsplit(decimal_symbol, 1)
-                            if len(parts) == 2 and len(parts[1]) == decimal_places:
-                                correct_data = True  # Set to True only if validation passes
-                            else:
-                                correct_data = False
+            reader = csv.reader(file, delimiter=self.delimiter)
+            next(reader, None)  # Header
+            yield from reader
+
+    def _reservoir(self, rows: Iterator[List[str]]) -> List[List[str]]:
+        """Algorithm R: uniform sample of `sample_rows` rows in constant memory."""
+        generator = random.Random(self.seed)
+        reservoir: List[List[str]] = []
+        for index, row in enumerate(rows):
+            if index < self.sample_rows:
+                reservoir.append(row)
+            else:
+                position = generator.randint(0, index)
+                if position < self.sample_rows:
+                    reservoir[position] = row
+        return reservoir
+
+    def _stratified_rows(self) -> Iterator[List[str]]:
+        """
+        Reads about sample_rows / strata lines from each of `strata` equal byte ranges of the file,
+        visiting the ranges in random order so an early stop still covers the whole file.
+        Lines are located by newline, so quoted values spanning several lines are not supported.
+        """
+        with open(self.csv_path, mode='rb') as file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                return
+            with data:
+                header_end = data.find(b"\n") + 1
+                if header_end <= 0:
+                    return
+                size = len(data)
+                strata = max(1, self.strata)
+                span = max(1, (size - header_end) // strata)
+                rows_per_stratum = max(1, math.ceil(self.sample_rows / strata))
 
+                order = list(range(strata))
+                random.Random(self.seed).shuffle(order)
+                for stratum in order:
+                    start = header_end + stratum * span
+                    end = size if stratum == strata - 1 else min(size, start + span)
+                    if start >= size:
+                        continue
+                    # Skip the partial line at the start of the range
+                    position = start if start == header_end else data.find(b"\n", start - 1) + 1
+                    for _ in range(rows_per_stratum):
+                        if position <= 0 or position >= end:
+                            break
+                        line_end = data.find(b"\n", position)
+                        if line_end == -1:
+                            line_end = size
+                        line = data[position:line_end].decode("utf-8").rstrip("\r")
+                        position = line_end + 1
+                        if line:
+                            yield next(csv.reader([line], delimiter=self.delimiter))
+
+    @staticmethod
+    def get_decimal_fields(grouped_fields: Dict[str, Tuple[str]]) -> Dict[str, Tuple[Tuple[str], int]]:
+        """
+        Extract decimal field specifications.
+
+        Args:
+            grouped_fields (Dict[str, Tuple[str]]): Dictionary of data types mapped to fields.
+
+        Returns:
+            Dict[str, Tuple[Tuple[str], int]]: Decimal data type mapped to its fields and scale.
+        """
         return {
-            "comma": comma,
-            "dot": dot,
-            "decimal_symbol": decimal_symbol,
-            "correct_data": correct_data
+            data_type: (fields, int(re.search(r"\((\d+),(\d+)\)", data_type).group(2)))
+            for data_type, fields in grouped_fields.items()
+            if data_type.startswith("decimal") and re.search(r"\((\d+),(\d+)\)", data_type)
         }
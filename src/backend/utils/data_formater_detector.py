@@ -1,11 +1,158 @@
+import calendar
+import re
+from collections import Counter
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# strptime directive -> named regex group
+_MONTH_NAMES = "|".join(calendar.month_name[1:])
+_MONTH_ABBREVIATIONS = "|".join(calendar.month_abbr[1:])
+_DIRECTIVES = {
+    "d": r"(?P<day>\d{1,2})",
+    "m": r"(?P<month>\d{1,2})",
+    "Y": r"(?P<year>\d{4})",
+    "y": r"(?P<short_year>\d{2})",
+    "B": rf"(?P<month_name>{_MONTH_NAMES})",
+    "b": rf"(?P<month_abbr>{_MONTH_ABBREVIATIONS})",
+    "H": r"(?P<hour>\d{1,2})",
+    "M": r"(?P<minute>\d{1,2})",
+    "S": r"(?P<second>\d{1,2})",
+}
+_MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+_MONTH_NUMBERS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+_SHAPE_TABLE = str.maketrans("0123456789", "9999999999")
+
+
+class CompiledDateFormat:
+    """
+    A strptime pattern compiled into an anchored regex plus range checks, so matching a value
+    needs no exceptions. Patterns with directives outside _DIRECTIVES fall back to strptime.
+    """
+
+    __slots__ = ("pattern", "human_readable", "regex")
+
+    def __init__(self, pattern: str, human_readable: str):
+        self.pattern = pattern
+        self.human_readable = human_readable
+        self.regex = self._compile(pattern)
+
+    @staticmethod
+    def _compile(pattern: str) -> Optional["re.Pattern"]:
+        parts = []
+        index = 0
+        while index < len(pattern):
+            char = pattern[index]
+            if char == "%" and index + 1 < len(pattern):
+                directive = _DIRECTIVES.get(pattern[index + 1])
+                if directive is None:
+                    return None
+                parts.append(directive)
+                index += 2
+            else:
+                parts.append(r"\s+" if char == " " else re.escape(char))
+                index += 1
+        return re.compile("".join(parts), re.IGNORECASE)
+
+    def matches_shape(self, value: str) -> bool:
+        """Structural check: the value has the separators, lengths and names of the pattern."""
+        if self.regex is None:
+            return True
+        return self.regex.fullmatch(value) is not None
+
+    def matches(self, value: str) -> bool:
+        """Full check: structure plus valid day, month and time ranges."""
+        if self.regex is None:
+            try:
+                datetime.strptime(value, self.pattern)
+                return True
+            except ValueError:
+                return False
+
+        match = self.regex.fullmatch(value)
+        if match is None:
+            return False
+        groups = match.groupdict()
+
+        month = groups.get("month")
+        if month is not None:
+            month = int(month)
+        elif groups.get("month_name") or groups.get("month_abbr"):
+            month = _MONTH_NUMBERS[(groups.get("month_name") or groups["month_abbr"]).lower()]
+        if month is not None and not 1 <= month <= 12:
+            return False
+
+        day = groups.get("day")
+        if day is not None:
+            day = int(day)
+            year = groups.get("year")
+            if year is not None:
+                year = int(year)
+            elif groups.get("short_year") is not None:
+                year = 2000 + int(groups["short_year"])
+            if year == 0:
+                return False
+            if month is not None and year is not None:
+                last_day = calendar.monthrange(year, month)[1]
+            elif month is not None:
+                last_day = 29 if month == 2 else calendar.monthrange(2001, month)[1]
+            else:
+                last_day = 31
+            if not 1 <= day <= last_day:
+                return False
+
+        for name, upper in (("hour", 23), ("minute", 59), ("second", 59)):
+            value_part = groups.get(name)
+            if value_part is not None and int(value_part) > upper:
+                return False
+        return True
+
+
+class DateFormatInference:
+    """
+    Result of inferring the date format of a column.
+
+    Attributes:
+        format (Optional[str]): Human-readable format that best fits the values, None if none fits.
+        pattern (Optional[str]): strptime pattern of that format.
+        confidence (float): Share of the values that match the format, divided among the formats tied with it.
+        matched (int): Values matching the format.
+        total (int): Non-empty values scored.
+        alternatives (List[str]): Other formats that fit exactly as many values (ambiguous samples).
+    """
+
+    __slots__ = ("format", "pattern", "confidence", "matched", "total", "alternatives")
+
+    def __init__(self, format: Optional[str], pattern: Optional[str], confidence: float, matched: int, total: int,
+                 alternatives: List[str]):
+        self.format = format
+        self.pattern = pattern
+        self.confidence = confidence
+        self.matched = matched
+        self.total = total
+        self.alternatives = alternatives
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"DateFormatInference({self.to_dict()})"
+
 
 class DateFormatDetector:
     """
     A class to detect the format of a given date string based on a predefined list of formats.
+
+    Besides the single value `detect_format`, `infer_format` scores many values of a column at once
+    against formats pre-compiled into regexes, dropping a format as soon as too many values
+    contradict it, and memoizes which formats fit each string shape (digits replaced by '9').
     """
 
+    MAX_SHAPE_CACHE = 4096
+    # Share of the values a format may fail in the sample data (typos, placeholders) before it is discarded
+    DEFAULT_TOLERANCE = 0.05
+    # Null markers found in sample data; they are ignored like empty values (compared in lower case)
+    NULL_TOKENS = frozenset({"null", "none", "nan", "nat", "n/a", "na", "n.a.", "-", "--", "?"})
+
     def __init__(self, date_formats: Optional[List[dict]] = None):
         """
         Initialize the DateFormatDetector with a list of date formats.
@@ -22,6 +169,8 @@ class DateFormatDetector:
             {"pattern": "%Y.%m.%d", "human_readable": "yyyy.MM.dd"},
             {"pattern": "%d.%m.%Y", "human_readable": "dd.MM.yyyy"},
         ]
+        self._compiled: Optional[List[CompiledDateFormat]] = None
+        self._shape_cache: Dict[str, Tuple[int, ...]] = {}
 
     def detect_format(self, date_string: str) -> Optional[str]:
         """
@@ -35,6 +184,90 @@ class DateFormatDetector:
                 return date_format["human_readable"]
         return None
 
+    def infer_format(self, values: Iterable[str], tolerance: float = 0.0) -> DateFormatInference:
+        """
+        Infers the format of a column from many of its values.
+
+        Values are deduplicated first, so each distinct value is checked once and weighted by its count.
+        Formats tied on the number of matches (e.g. dd/MM/yyyy and MM/dd/yyyy when no day is above 12)
+        split the confidence and are reported as alternatives; the first one in the format list wins.
+
+        :param values: Values of the column. Empty values and NULL_TOKENS are ignored.
+        :param tolerance: Share of the values a format may fail before it is discarded.
+        :return: The DateFormatInference.
+        """
+        counts = Counter(value.strip() for value in values if value is not None)
+        for value in [value for value in counts if not value or value.lower() in self.NULL_TOKENS]:
+            del counts[value]
+        total = sum(counts.values())
+        compiled = self._get_compiled()
+        if not total:
+            return DateFormatInference(None, None, 0.0, 0, 0, [])
+
+        max_mismatches = tolerance * total
+        matched = [0] * len(compiled)
+        mismatched = [0] * len(compiled)
+        alive = set(range(len(compiled)))
+
+        # Most frequent values first: contradicted formats are discarded sooner
+        for value, count in counts.most_common():
+            if not alive:
+                break
+            fitting = self._formats_for_shape(value)
+            for index in list(alive):
+                if index in fitting and compiled[index].matches(value):
+                    matched[index] += count
+                else:
+                    mismatched[index] += count
+                    if mismatched[index] > max_mismatches:
+                        alive.discard(index)
+
+        if not alive:
+            return DateFormatInference(None, None, 0.0, 0, total, [])
+
+        best_count = max(matched[index] for index in alive)
+        tied = [index for index in sorted(alive) if matched[index] == best_count]
+        best = compiled[tied[0]]
+        return DateFormatInference(
+            best.human_readable,
+            best.pattern,
+            round(best_count / total / len(tied), 4),
+            best_count,
+            total,
+            [compiled[index].human_readable for index in tied[1:]],
+        )
+
+    def infer_formats(self, columns: Dict[str, Iterable[str]], tolerance: float = 0.0) -> Dict[str, DateFormatInference]:
+        """
+        Infers the format of several columns.
+
+        :param columns: Column name mapped to its values.
+        :param tolerance: See infer_format.
+        :return: Column name mapped to its DateFormatInference.
+        """
+        return {field: self.infer_format(values, tolerance) for field, values in columns.items()}
+
+    def _formats_for_shape(self, value: str) -> Tuple[int, ...]:
+        """Indexes of the formats whose structure fits the value, memoized by the value's shape."""
+        shape = value.translate(_SHAPE_TABLE)
+        fitting = self._shape_cache.get(shape)
+        if fitting is None:
+            if len(self._shape_cache) >= self.MAX_SHAPE_CACHE:
+                self._shape_cache.clear()
+            fitting = tuple(
+                index for index, date_format in enumerate(self._get_compiled()) if date_format.matches_shape(value)
+            )
+            self._shape_cache[shape] = fitting
+        return fitting
+
+    def _get_compiled(self) -> List[CompiledDateFormat]:
+        if self._compiled is None:
+            self._compiled = [
+                CompiledDateFormat(date_format["pattern"], date_format["human_readable"])
+                for date_format in self._date_formats
+            ]
+        return self._compiled
+
     def _is_valid_format(self, date_string: str, date_format: str) -> bool:
         """
         Check if the given date string matches the provided format.
@@ -58,6 +291,8 @@ class DateFormatDetector:
         """
         if not any(fmt["pattern"] == new_format for fmt in self._date_formats):
             self._date_formats.append({"pattern": new_format, "human_readable": human_readable})
+            self._compiled = None
+            self._shape_cache.clear()
 
     def get_formats(self) -> List[dict]:
         """
@@ -1,16 +1,70 @@
+import codecs
 import csv
+import io
+import mmap
+from collections import Counter
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import re
 
+
+class FileDialect:
+    """
+    Format of a delimited text file, as detected by FileAnalyzer.sniff.
+
+    Attributes:
+        delimiter (str): Field delimiter.
+        quotechar (str): Quote character.
+        encoding (str): Encoding guess ("utf-8", "utf-8-sig", "utf-16", or "latin-1" when the bytes are not valid UTF-8).
+        line_terminator (str): "\\r\\n", "\\n" or "\\r".
+        has_header (bool): Whether the first row looks like a header.
+        columns (int): Number of columns (the most common field count).
+        consistency (float): Share of the sampled rows with that field count.
+    """
+
+    __slots__ = ("delimiter", "quotechar", "encoding", "line_terminator", "has_header", "columns", "consistency")
+
+    def __init__(self, delimiter: str, quotechar: str, encoding: str, line_terminator: str, has_header: bool,
+                 columns: int, consistency: float):
+        self.delimiter = delimiter
+        self.quotechar = quotechar
+        self.encoding = encoding
+        self.line_terminator = line_terminator
+        self.has_header = has_header
+        self.columns = columns
+        self.consistency = consistency
+
+    def __repr__(self) -> str:
+        return f"FileDialect({ {name: getattr(self, name) for name in self.__slots__} })"
+
+
 class FileAnalyzer:
     """
     Class responsible for analyzing a CSV or TXT file to determine if it has a header and identify the delimiter.
+    When a SampleProfile is given, the answer is taken from it and the file is not read again.
+
+    Only the first `sniff_bytes` of the file are looked at, through a memory map and only once: every
+    candidate delimiter is scored by how consistent the field count is across the first `sniff_lines`
+    rows (quote-aware), so a comma inside a value does not beat the real separator. The cost does not
+    depend on the file size.
     """
 
-    def __init__(self, file_path: str):
+    DEFAULT_SNIFF_BYTES = 64 * 1024
+
+    def __init__(self, file_path: str, profile=None, sniff_bytes: int = DEFAULT_SNIFF_BYTES, sniff_lines: int = 50):
+        """
+        Args:
+            file_path (str): Path to the CSV or TXT file.
+            profile (Optional[SampleProfile]): Profile already computed for this file by SampleProfiler.
+            sniff_bytes (int): Bytes read from the start of the file to detect the format.
+            sniff_lines (int): Rows scored for each candidate delimiter.
+        """
         self._file_path = Path(file_path)
         self._delimiters = [',', ';', '\t', '|', ' ']
+        self._quotechars = ['"', "'"]
+        self._profile = profile
+        self._sniff_bytes = sniff_bytes
+        self._sniff_lines = sniff_lines
 
     def analyze_file(self) -> Optional[Tuple[bool, Optional[str]]]:
         """
@@ -20,13 +74,61 @@ class FileAnalyzer:
             Optional[Tuple[bool, Optional[str]]]: Tuple containing a boolean indicating if the file has a header and
                                                   the delimiter used. Returns None if the file is invalid.
         """
+        if self._profile is not None:
+            if not self._profile.delimiter:
+                return None
+            return self._profile.has_header, self._profile.delimiter
+        dialect = self.sniff()
+        if dialect is None:
+            return None
+        return dialect.has_header, dialect.delimiter
+
+    def sniff(self) -> Optional[FileDialect]:
+        """
+        Detects delimiter, quote character, encoding, line terminator and header in a single read
+        of the first `sniff_bytes` of the file.
+
+        Returns:
+            Optional[FileDialect]: The detected format, or None if the file is invalid, empty
+                                   or no delimiter gives more than one column.
+        """
         if not self._is_valid_file():
             return None
-        delimiter = self._detect_delimiter()
-        if not delimiter:
+        with self._file_path.open('rb') as file:
+            try:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    head = data[:self._sniff_bytes]
+                    truncated = len(data) > len(head)
+            except ValueError:  # Empty file
+                return None
+
+        encoding, text = self._decode(head)
+        if truncated:
+            # Drop the last, probably incomplete, line
+            last_break = max(text.rfind('\n'), text.rfind('\r'))
+            if last_break > 0:
+                text = text[:last_break + 1]
+        line_terminator = self._detect_line_terminator(text)
+
+        best = None
+        for quotechar in [quote for quote in self._quotechars if quote in text] or self._quotechars[:1]:
+            for priority, delimiter in enumerate(self._delimiters):
+                if delimiter not in text:
+                    continue
+                rows = self._read_rows(text, delimiter, quotechar)
+                columns, consistency = self._score(rows)
+                if columns < 2:
+                    continue
+                # Most consistent first, then more columns, then the order of the candidate lists
+                key = (consistency, columns, -priority, quotechar == '"')
+                if best is None or key > best[0]:
+                    best = (key, delimiter, quotechar, rows, columns, consistency)
+
+        if best is None:
             return None
-        has_header = self._has_header(delimiter)
-        return has_header, delimiter
+        _, delimiter, quotechar, rows, columns, consistency = best
+        has_header = self.is_header_row(rows[0], rows[1] if len(rows) > 1 else None)
+        return FileDialect(delimiter, quotechar, encoding, line_terminator, has_header, columns, round(consistency, 4))
 
     def _is_valid_file(self) -> bool:
         """
@@ -37,66 +139,102 @@ class FileAnalyzer:
         """
         return self._file_path.exists() and self._file_path.is_file() and self._file_path.suffix in ['.csv', '.txt']
 
-    def _detect_delimiter(self) -> Optional[str]:
+    @staticmethod
+    def _decode(head: bytes) -> Tuple[str, str]:
+        """Guesses the encoding from the BOM or by validating UTF-8, and decodes the sampled bytes."""
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig', head[len(codecs.BOM_UTF8):].decode('utf-8', errors='ignore')
+        if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE):
+            return 'utf-16', head.decode('utf-16', errors='ignore')
+        try:
+            # Incremental decoding tolerates a character cut at the end of the sample
+            return 'utf-8', codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        except UnicodeDecodeError:
+            return 'latin-1', head.decode('latin-1')
+
+    @staticmethod
+    def _detect_line_terminator(text: str) -> str:
+        position = text.find('\n')
+        carriage = text.find('\r')
+        if carriage != -1 and (position == -1 or carriage < position):
+            return '\r\n' if text[carriage + 1:carriage + 2] == '\n' else '\r'
+        return '\n'
+
+    def _read_rows(self, text: str, delimiter: str, quotechar: str) -> List[List[str]]:
+        reader = csv.reader(io.StringIO(text, newline=''), delimiter=delimiter, quotechar=quotechar)
+        rows = []
+        try:
+            for row in reader:
+                if row:
+                    rows.append(row)
+                if len(rows) >= self._sniff_lines:
+                    break
+        except csv.Error:
+            pass
+        return rows
+
+    @staticmethod
+    def _score(rows: List[List[str]]) -> Tuple[int, float]:
+        """Most common field count and the share of rows that have it."""
+        if not rows:
+            return 0, 0.0
+        columns, count = Counter(len(row) for row in rows).most_common(1)[0]
+        return columns, count / len(rows)
+
+    def detect_delimiter_in_line(self, line: str) -> Optional[str]:
         """
-        Detects the delimiter used in the file by analyzing the first line.
+        Detects the delimiter used in an already read line: the first candidate present in it.
+        Prefer `sniff`, which scores the candidates over several rows.
+
+        Args:
+            line (str): The first line of the file.
 
         Returns:
             Optional[str]: The detected delimiter or None if no suitable delimiter is found.
         """
-        with self._file_path.open('r', encoding='utf-8') as file:
-            sample = file.readline()
-            for delimiter in self._delimiters:
-                if sample.count(delimiter) > 0:
-                    return delimiter
+        for delimiter in self._delimiters:
+            if line.count(delimiter) > 0:
+                return delimiter
         return None
 
-    def _has_header(self, delimiter: str) -> bool:
+    @staticmethod
+    def is_header_row(first_row: List[str], second_row: Optional[List[str]]) -> bool:
         """
-        Determines if the file has a header by analyzing the data types and patterns
-        in the first two rows of the file, allowing flexible data types in the second row.
+        Determines if the first row is a header by comparing it with the second row.
 
         Args:
-            delimiter (str): The delimiter used in the file.
+            first_row (List[str]): The first row of the file.
+            second_row (Optional[List[str]]): The second row of the file, or None if there is none.
 
         Returns:
-            bool: True if the file likely has a header, False otherwise.
+            bool: True if the first row likely is a header, False otherwise.
         """
         # Define the pattern to detect header keywords
         header_keywords = re.compile(r'(id|date|year|año)', re.IGNORECASE)
         # Define a pattern to detect date-like values
         date_pattern = re.compile(r'^(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{4}/\d{2}/\d{2})$')
 
-        with self._file_path.open('r', encoding='utf-8') as file:
-            reader = csv.reader(file, delimiter=delimiter)
-            try:
-                first_row = next(reader)
-                second_row = next(reader, None)
-
-                # If second row exists, analyze the rows
-                if second_row:
-                    # Check if the first row contains header-like patterns
-                    first_row_is_header = any(
-                        not item.replace('.', '', 1).isdigit()  # Allow decimal numbers
-                        and not item.isnumeric()  # Handle numeric-like values
-                        and not item.strip() == ''  # Ignore empty values
-                        and (header_keywords.search(item) is not None  # Match header keywords
-                            or not item.strip().islower())  # Check if it's not purely lowercase (e.g., names)
-                        for item in first_row
-                    )
-
-                    # Check if the second row contains a mix of valid data types
-                    second_row_is_data = all(
-                        item.strip() == ''  # Allow empty values
-                        or item.replace('.', '', 1).isdigit()  # Allow integers and decimals
-                        or re.match(r'^-?\d+(\.\d+)?$', item.strip())  # Match decimal values
-                        or date_pattern.match(item.strip())  # Match date-like values
-                        or item.isalpha()  # Allow pure string values
-                        or item.isalnum()  # Allow alphanumeric strings
-                        for item in second_row
-                    )
-                    return first_row_is_header and second_row_is_data
-                return False  # No second row to compare, assume no header
-            except StopIteration:
-                # If file is empty or doesn't have enough rows, assume no header
-                return False
\ No newline at end of file
+        # If second row exists, analyze the rows
+        if second_row:
+            # Check if the first row contains header-like patterns
+            first_row_is_header = any(
+                not item.replace('.', '', 1).isdigit()  # Allow decimal numbers
+                and not item.isnumeric()  # Handle numeric-like values
+                and not item.strip() == ''  # Ignore empty values
+                and (header_keywords.search(item) is not None  # Match header keywords
+                    or not item.strip().islower())  # Check if it's not purely lowercase (e.g., names)
+                for item in first_row
+            )
+
+            # Check if the second row contains a mix of valid data types
+            second_row_is_data = all(
+                item.strip() == ''  # Allow empty values
+                or item.replace('.', '', 1).isdigit()  # Allow integers and decimals
+                or re.match(r'^-?\d+(\.\d+)?$', item.strip())  # Match decimal values
+                or date_pattern.match(item.strip())  # Match date-like values
+                or item.isalpha()  # Allow pure string values
+                or item.isalnum()  # Allow alphanumeric strings
+                for item in second_row
+            )
+            return first_row_is_header and second_row_is_data
+        return False  # No second row to compare, assume no header
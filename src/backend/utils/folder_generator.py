@@ -1,15 +1,20 @@
+import logging
 import os
 import json
 
+logger = logging.getLogger(__name__)
+
 class FolderGenerator:
     def __init__(self, schema, base_output_path):
         self.schema = schema
         self.base_output_path = base_output_path
 
-    def create_folders(self, structure):
+    def create_folders(self, structure, create=True):
 
         """
         Create the folder structure based on the JSON data.
+        With create=False only the paths are computed; the folders are then created when the
+        job outputs are published (StagedArtifactWriter).
         """
 
         self.data = structure
@@ -20,7 +25,7 @@ class FolderGenerator:
         self.output_path = self.data.get('physicalPath')
 
         if not self.uuaa or not self.name:
-            print("JSON is missing 'uuaa' or 'name'.")
+            logger.error("JSON is missing 'uuaa' or 'name'.")
             return
 
         structure = [
@@ -37,11 +42,10 @@ class FolderGenerator:
 
         complete_path = os.path.join(*structure)
 
-        if not os.path.exists(complete_path):
-            os.makedirs(complete_path)
-            print(f"Folder structure created: {complete_path}")
-        else:
-            print(f"Folder structure already exists: {complete_path}")
+        if create:
+            # exist_ok: varios trabajos del mismo uuaa pueden crear la estructura a la vez
+            os.makedirs(complete_path, exist_ok=True)
+            logger.info("Folder structure ready: %s", complete_path)
         return ({"complete_path": complete_path,
                  "uuaa": self.uuaa,
                  "name": self.name,
@@ -57,8 +61,8 @@ class FolderGenerator:
                 self.create_folders(folder_path, value)
         '''
     
-    def generate(self):
-        complete_path = self.create_folders(self.schema)
+    def generate(self, create=True):
+        complete_path = self.create_folders(self.schema, create)
         return complete_path
 
 # Usage
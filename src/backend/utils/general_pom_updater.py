@@ -1,21 +1,158 @@
+import os
 import re
+import tempfile
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+
+class PomModuleSet:
+    """
+    Ordered, de-duplicated set of the <module> entries of a pom.xml.
+
+    Only the <modules> block is edited, in place; the rest of the file is kept byte for byte. Inside
+    the block, comments (commented-out modules included) and the modules that stay keep their position,
+    removed modules lose their line and new modules are appended before </modules>. Template
+    placeholders such as <module>{uuaa}</module> are not modules and are dropped on the first change.
+    """
+
+    MODULES_PATTERN: re.Pattern = re.compile(r"(?P<indent>[ \t]*)<modules>(?P<body>.*?)</modules>", flags=re.DOTALL)
+    MODULE_PATTERN: re.Pattern = re.compile(r"<module>\s*(.*?)\s*</module>", flags=re.DOTALL)
+    COMMENT_PATTERN: re.Pattern = re.compile(r"<!--.*?-->", flags=re.DOTALL)
+    # Un comentario se consume entero (aunque contenga <module>); un módulo junto con el salto de línea previo
+    ENTRY_PATTERN: re.Pattern = re.compile(
+        r"(?P<comment><!--.*?-->)|(?:\r?\n[ \t]*)?<module>\s*(?P<name>.*?)\s*</module>", flags=re.DOTALL)
+    PLACEHOLDER_PATTERN: re.Pattern = re.compile(r"^\{\w+\}$")
+
+    def __init__(self, content: str) -> None:
+        """
+        Parse the <modules> block of the pom content.
+
+        :param content: The pom.xml content.
+        """
+        self.content: str = content
+        self._match: Optional[re.Match] = self.MODULES_PATTERN.search(content)
+        body = self._match.group("body") if self._match else ""
+        names = self.MODULE_PATTERN.findall(self.COMMENT_PATTERN.sub("", body))
+        self.modules: List[str] = list(dict.fromkeys(name for name in names if name))
+        self.changed: bool = False
+
+    def _is_placeholder(self, name: str) -> bool:
+        return bool(self.PLACEHOLDER_PATTERN.match(name))
+
+    def add(self, names: Iterable[str]) -> bool:
+        """
+        Append the modules that are not in the set yet, keeping the existing order.
+
+        :param names: Module names to add.
+        :return: True if the set changed.
+        """
+        added = False
+        for name in names:
+            if name and name not in self.modules:
+                self.modules.append(name)
+                added = True
+        self.changed |= added
+        return added
+
+    def remove(self, names: Iterable[str]) -> bool:
+        """
+        Remove modules from the set.
+
+        :param names: Module names to remove.
+        :return: True if the set changed.
+        """
+        names = set(names)
+        remaining = [name for name in self.modules if name not in names]
+        removed = len(remaining) != len(self.modules)
+        self.modules = remaining
+        self.changed |= removed
+        return removed
+
+    def render(self) -> str:
+        """
+        Return the pom content with the <modules> block rewritten, or unchanged if the set did not change.
+
+        :return: The pom.xml content.
+        """
+        if not self.changed:
+            return self.content
+        modules = [name for name in self.modules if not self._is_placeholder(name)]
+        if self._match is None:
+            if not modules:
+                return self.content
+            block = self._render_block("    ", modules)
+            closing = self.content.rfind("</project>")
+            if closing == -1:
+                raise ValueError("pom.xml has no </project> tag.")
+            return f"{self.content[:closing]}{block}\n{self.content[closing:]}"
+        body = self._edit_body(self._match.group("body"), self._match.group("indent"), modules)
+        start, end = self._match.span("body")
+        return f"{self.content[:start]}{body}{self.content[end:]}"
+
+    def _edit_body(self, body: str, indent: str, modules: Sequence[str]) -> str:
+        kept = set(modules)
+        present = set()
+
+        def edit(match: re.Match) -> str:
+            name = match.group("name")
+            if match.group("comment") is not None:
+                return match.group(0)
+            if name in kept and name not in present:
+                present.add(name)
+                return match.group(0)
+            return ""
+
+        body = self.ENTRY_PATTERN.sub(edit, body)
+        entries = "".join(f"\n{indent}    <module>{name}</module>" for name in modules if name not in present)
+        content = body.rstrip()
+        # Del espacio final solo se conserva el último salto de línea con la sangría de </modules>
+        tail = body[len(content):]
+        line_break = tail.rfind("\n")
+        if line_break > 0 and tail[line_break - 1] == "\r":
+            line_break -= 1
+        closing = tail[line_break:] if line_break >= 0 else f"\n{indent}"
+        return f"{content}{entries}{closing}"
+
+    @staticmethod
+    def _render_block(indent: str, modules: Sequence[str]) -> str:
+        entries = "".join(f"\n{indent}    <module>{name}</module>" for name in modules)
+        return f"{indent}<modules>{entries}\n{indent}</modules>"
+
+    def apply(self, add: Iterable[str] = (), remove: Iterable[str] = ()) -> bool:
+        """
+        Apply removals and then additions.
+
+        :param add: Modules to add.
+        :param remove: Modules to remove.
+        :return: True if the set changed and the file content needs to be written.
+        """
+        self.remove(remove)
+        self.add(add)
+        return self.changed
 
 
 class GeneralPomUpdater:
     """
-    This class is responsible for updating the content inside <module></module> tags
-    in an XML file named 'pom.xml' (general pom). It replaces the existing content with the value
-    provided in the 'uuaa' parameter.
+    This class is responsible for updating the <module></module> entries of an XML file named
+    'pom.xml' (general pom). The <modules> block is handled as an ordered set: the given uuaa values
+    are added to it (or removed from it) without touching the other modules, so several uuaas can
+    live in the same repository.
+
+    The file is only written when the set changes, and it is written atomically (temporary file in the
+    same folder plus rename). Updates of the same pom from concurrent jobs of this process are
+    serialized, so each one sees the modules added by the previous ones.
     """
 
-    def __init__(self, folder_path: str, uuaa: str) -> None:
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard: threading.Lock = threading.Lock()
+
+    def __init__(self, folder_path: str, uuaa: Union[str, Sequence[str]]) -> None:
         """
         Initialize the ModuleUpdater with the base folder path and the uuaa value.
 
         :param folder_path: The base folder path where 'pom.xml' is located.
-        :param uuaa: The value to insert inside the <module></module> tags.
+        :param uuaa: The module to add or remove, or the list of modules of a batch.
         :raises ValueError: If the folder_path or uuaa is empty.
         """
         if not folder_path:
@@ -24,15 +161,34 @@ class GeneralPomUpdater:
             raise ValueError("ua cannot be empty.")
 
         self.folder_path: Path = Path(folder_path)
-        self.uuaa: str = uuaa
+        self.uuaas: List[str] = [uuaa] if isinstance(uuaa, str) else list(dict.fromkeys(uuaa))
+        self.uuaa: str = self.uuaas[0]
         self.file_name: str = "pom.xml"
-        self.pattern: re.Pattern = re.compile(r"(<module>)(.*?)(</module>)", flags=re.DOTALL)
+        self.written: bool = False
 
     def update_module_content(self) -> bool:
         """
-        Update the <module></module> content in the 'pom.xml' file with the uuaa value.
+        Add the uuaa values to the <modules> block of the 'pom.xml' file.
 
-        :return: True if the content was updated successfully, False otherwise.
+        :return: True if the pom contains the modules (written or already up to date), False otherwise.
+        """
+        return self.apply(add=self.uuaas)
+
+    def remove_module_content(self) -> bool:
+        """
+        Remove the uuaa values from the <modules> block of the 'pom.xml' file.
+
+        :return: True if the pom no longer contains the modules, False otherwise.
+        """
+        return self.apply(remove=self.uuaas)
+
+    def apply(self, add: Iterable[str] = (), remove: Iterable[str] = ()) -> bool:
+        """
+        Apply module additions and removals in a single read and, if anything changed, a single write.
+
+        :param add: Modules to add.
+        :param remove: Modules to remove.
+        :return: True if the update succeeded, False otherwise.
         """
         file_path = self.folder_path / self.file_name
 
@@ -41,16 +197,28 @@ class GeneralPomUpdater:
             # Here we return False to indicate failure gracefully.
             return False
 
-        original_content: Optional[str] = self._read_file(file_path)
-        if original_content is None:
-            return False
+        with self._lock_for(file_path):
+            original_content: Optional[str] = self._read_file(file_path)
+            if original_content is None:
+                return False
 
-        updated_content: str = self._replace_module_content(original_content, self.uuaa)
+            module_set = PomModuleSet(original_content)
+            if not module_set.apply(add=add, remove=remove):
+                return True
+            try:
+                updated_content = module_set.render()
+            except ValueError:
+                return False
+            if updated_content == original_content:
+                return True
+            self.written = self._write_file(file_path, updated_content)
+            return self.written
 
-        if updated_content != original_content:
-            return self._write_file(file_path, updated_content)
-
-        return True
+    @classmethod
+    def _lock_for(cls, file_path: Path) -> threading.Lock:
+        key = str(file_path.resolve())
+        with cls._locks_guard:
+            return cls._locks.setdefault(key, threading.Lock())
 
     def _read_file(self, file_path: Path) -> Optional[str]:
         """
@@ -60,7 +228,7 @@ class GeneralPomUpdater:
         :return: The file content as a string, or None if an error occurs.
         """
         try:
-            with file_path.open('r', encoding='utf-8') as file:
+            with file_path.open('r', encoding='utf-8', newline='') as file:
                 return file.read()
         except (OSError, UnicodeDecodeError):
             # In a real-world scenario, we might log this error.
@@ -68,30 +236,26 @@ class GeneralPomUpdater:
 
     def _write_file(self, file_path: Path, content: str) -> bool:
         """
-        Write content to the specified file.
+        Write content to the specified file atomically: a temporary file in the same folder
+        is written, flushed to disk and renamed over the original.
 
         :param file_path: Path to the file to be written.
         :param content: The content to write.
         :return: True if the file was written successfully, False otherwise.
         """
+        temporary_path = None
         try:
-            with file_path.open('w', encoding='utf-8') as file:
+            descriptor, temporary_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+            with os.fdopen(descriptor, 'w', encoding='utf-8', newline='') as file:
                 file.write(content)
+                file.flush()
+                os.fsync(file.fileno())
+            if file_path.exists():
+                os.chmod(temporary_path, file_path.stat().st_mode & 0o777)
+            os.replace(temporary_path, file_path)
             return True
         except OSError:
             # In a real-world scenario, we might log this error.
+            if temporary_path and os.path.exists(temporary_path):
+                os.remove(temporary_path)
             return False
-
-    def _replace_module_content(self, original_content: str, uuaa_value: str) -> str:
-        """
-        Replace the content inside <module></module> tags with the UA value.
-
-        :param original_content: The original XML content.
-        :param ua_value: The new UA value to be inserted.
-        :return: The updated content.
-        """
-        # Using a backreference approach where:
-        # \1 corresponds to <module>
-        # \3 corresponds to </module>
-        # We replace the inner text with ua_value
-        return self.pattern.sub(rf"\1{uuaa_value}\3", original_content)
@@ -0,0 +1,335 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class CompiledHoconTemplate:
+    """
+    HOCON template split once into literal text and placeholder slots, ready to render.
+
+    Each slot is a tuple (name, indent, fallback): `indent` is the leading whitespace of the line
+    (None for the partition filter, which is inserted as-is) and `fallback` are the parts rendered
+    when the value cannot be computed (None for plain placeholders, which are then left untouched).
+    """
+
+    __slots__ = ("source", "parts", "placeholders")
+
+    def __init__(self, source: str, parts: List[Union[str, tuple]]):
+        self.source = source
+        self.parts = parts
+        self.placeholders = tuple(dict.fromkeys(
+            name for part in parts if not isinstance(part, str)
+            for name in ([part[0]] if part[2] is None else [slot[0] for slot in part[2] if not isinstance(slot, str)])
+        ))
+
+
+class HoconTemplateRenderer:
+    """
+    Deterministic renderer for the Kirby HOCON templates (config_raw_template.conf and
+    master_config_template.conf). It applies the substitution rules described in the rules
+    files and generates the partition and formatter transformations without calling the LLM.
+
+    Placeholders that cannot be computed from the parameters are left untouched and reported,
+    so the caller can fall back to the LLM only for those.
+    """
+
+    # Se incrementa con cada cambio de la salida renderizada: invalida las respuestas del LLM en caché
+    # y los .conf registrados en los manifiestos de artefactos
+    VERSION = 2
+
+    # RULE 1: only {name} is replaced; {?name} and ${name} are kept as they are.
+    PLACEHOLDER_PATTERN = re.compile(r"(?<!\$)\{([A-Za-z_][A-Za-z0-9_]*)\}")
+    # "{partitions}"={partition_values} is a single expression, rendered as "cutoff_date="${?YEAR}...
+    PARTITION_FILTER_PATTERN = re.compile(r'"\{partitions\}"=\{partition_values\}')
+    # The raw template wraps the transformations placeholder in its own braces.
+    WRAPPED_TRANSFORMATIONS_PATTERN = re.compile(r"\{\s*\{transformations\}\s*\}")
+
+    # Values the frontend sends by default (see UserParameters) or that every example uses.
+    DEFAULTS = {
+        "castmode": "notPermissive",
+        "input_mode": "FAILFAST",
+        "code_schema": "co",
+        "output_mode": "append",
+        "output_compact": True,
+        "path_remove": True,
+    }
+
+    # Kirby value expression for each known partition column.
+    PARTITION_VALUES = {
+        "cutoff_date": '${?YEAR}"-"${?MONTH}"-"${?DAY}',
+        "partition_data_year_id": "${?YEAR}",
+        "partition_data_month_id": "${?MONTH}",
+        "partition_data_day_id": "${?DAY}",
+    }
+
+    AUDIT_FIELD = "audit_date"
+    INDENT = "    "
+
+    def __init__(self, ingest_type: str, parameters: Dict[str, Any], grouped_fields: Optional[Dict[str, Tuple[str]]] = None,
+                 date_format_dict: Optional[Dict[str, str]] = None):
+        """
+        Initialize the renderer.
+
+        :param ingest_type: "raw" or "master".
+        :param parameters: Processing parameters (schema values, delimiter, header, decimal analysis...).
+        :param grouped_fields: Field names grouped by data type. Required for master transformations.
+        :param date_format_dict: Input and output date formats for the date fields.
+        """
+        self.ingest_type = ingest_type
+        self.parameters = parameters
+        self.grouped_fields = grouped_fields or {}
+        self.date_format_dict = date_format_dict or {}
+
+    def render(self, template: Union[str, CompiledHoconTemplate]) -> Tuple[str, List[str]]:
+        """
+        Fills the template.
+
+        :param template: HOCON template content, or the template already compiled with `compile`.
+        :return: Tuple with the rendered content and the names of the placeholders that could
+                 not be computed (left as-is in the content).
+        """
+        if isinstance(template, str):
+            template = self.compile(template)
+        values = self._compute_values()
+        unresolved: List[str] = []
+        output: List[str] = []
+
+        def emit(parts) -> None:
+            for part in parts:
+                if isinstance(part, str):
+                    output.append(part)
+                    continue
+                name, indent, fallback = part
+                value = values.get(name)
+                if value is None:
+                    if fallback is not None:
+                        emit(fallback)
+                        continue
+                    if name not in unresolved:
+                        unresolved.append(name)
+                    output.append("{" + name + "}")
+                else:
+                    output.append(value if indent is None else self._indent(value, indent))
+
+        emit(template.parts)
+        return "".join(output), unresolved
+
+    @classmethod
+    def compile(cls, template: str) -> CompiledHoconTemplate:
+        """
+        Splits the template into literal text and placeholder slots. Rendering a compiled template
+        only joins strings, so a template loaded once (see ResourceRegistry) is parsed once.
+        Results are cached by content.
+
+        :param template: HOCON template content.
+        :return: The CompiledHoconTemplate.
+        """
+        return _compile_template(template)
+
+    @classmethod
+    def _split(cls, content: str, start: int, end: int) -> List[Union[str, tuple]]:
+        parts: List[Union[str, tuple]] = []
+        position = start
+        for match in cls.PLACEHOLDER_PATTERN.finditer(content, start, end):
+            parts.append(content[position:match.start()])
+            parts.append((match.group(1), cls._line_indent(content, match.start()), None))
+            position = match.end()
+        parts.append(content[position:end])
+        return [part for part in parts if part != ""]
+
+    def _compute_values(self) -> Dict[str, Optional[str]]:
+        """Computes the textual value of every known placeholder. None means it cannot be computed."""
+        partitions = self._partition_columns()
+        known_partitions = bool(partitions) and all(column in self.PARTITION_VALUES for column in partitions)
+
+        values = {
+            "delimiter": self._format_delimiter(self._get("delimiter")),
+            "header": self._format_scalar(self._get("header")),
+            "castmode": self._format_scalar(self._get("castmode")),
+            "input_mode": self._format_scalar(self._get("input_mode")),
+            "input_path": self._format_scalar(self._get("input_path")),
+            "code_schema": self._format_scalar(self._get("code_schema")),
+            "uuaa": self._format_scalar(self._get("uuaa")),
+            "database": self._format_scalar(self._get("database")),
+            "tabla": self._format_scalar(self._get("tabla")),
+            "input_format": self._format_input_format(self._get("input_format")),
+            "output_mode": self._format_scalar(self._get("output_mode")),
+            "physicalPath": self._format_scalar(self._get("physicalPath")),
+            "reprocess_status": self._format_scalar(self._get("reprocess_status")),
+            "output_compact": self._format_scalar(self._get("output_compact")),
+            "path_remove": self._format_scalar(self._get("path_remove")),
+            "partitions": '", "'.join(partitions) if partitions else None,
+            "partition_values": None,
+            "partition_filter": None,
+            "transformations": None,
+        }
+
+        if known_partitions and len(partitions) == 1:
+            column = partitions[0]
+            values["partition_filter"] = f'"{column}="{self.PARTITION_VALUES[column]}'
+
+        if known_partitions:
+            if self.ingest_type == "raw":
+                values["transformations"] = self._join_blocks(self._raw_transformations(partitions))
+            elif self.ingest_type == "master" and self.grouped_fields:
+                values["transformations"] = self._join_blocks(self._master_transformations(partitions))
+
+        return values
+
+    def _get(self, name: str) -> Any:
+        value = self.parameters.get(name)
+        return self.DEFAULTS.get(name) if value is None or value == "" else value
+
+    def _partition_columns(self) -> List[str]:
+        partitions = self.parameters.get("partitions")
+        if isinstance(partitions, str):
+            partitions = partitions.split(",")
+        return [column.strip() for column in partitions or [] if column and column.strip()]
+
+    # Formatting helpers
+
+    @staticmethod
+    def _format_scalar(value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return str(value)
+
+    @staticmethod
+    def _format_delimiter(value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return '"{}"'.format(value.replace("\\", "\\\\").replace('"', '\\"').replace("\t", "\\t"))
+
+    @staticmethod
+    def _format_input_format(value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        # Kirby reads delimited .txt files with the csv reader
+        return "csv" if value.lower() == "txt" else value.lower()
+
+    @staticmethod
+    def _format_type(data_type: str) -> str:
+        return data_type if re.fullmatch(r"[A-Za-z0-9_]+", data_type) else f'"{data_type}"'
+
+    @staticmethod
+    def _line_indent(content: str, position: int) -> str:
+        line_start = content.rfind("\n", 0, position) + 1
+        line = content[line_start:position]
+        return line[:len(line) - len(line.lstrip())]
+
+    @staticmethod
+    def _indent(value: str, indent: str) -> str:
+        return value.replace("\n", "\n" + indent)
+
+    def _block(self, *lines: str) -> str:
+        return "{\n" + "\n".join(self.INDENT + line for line in lines) + "\n}"
+
+    @staticmethod
+    def _join_blocks(blocks: List[str]) -> str:
+        return ",\n".join(blocks)
+
+    # Transformations
+
+    def _raw_transformations(self, partitions: List[str]) -> List[str]:
+        """RULE 2 (raw): one literal transformation per partition column."""
+        return [
+            self._block(
+                f"default={self.PARTITION_VALUES[column]}",
+                "defaultType=string",
+                f'field="{column}"',
+                "type=literal",
+            )
+            for column in partitions
+        ]
+
+    def _master_transformations(self, partitions: List[str]) -> List[str]:
+        """RULE 2 (master): partition filter, audit date, trim, date format, decimal replacements and casts."""
+        date_fields = list(self.grouped_fields.get("date", ()))
+        decimal_fields = [
+            field for data_type, fields in self.grouped_fields.items()
+            if data_type.lower().startswith("decimal") for field in fields
+        ]
+
+        # 2.1 Partition filter
+        sql_filter = " AND ".join(f"{column}='\"{self.PARTITION_VALUES[column]}\"'" for column in partitions)
+        blocks = [self._block('type = "sqlFilter"', f'filter = "{sql_filter}"')]
+
+        # 2.2 Current date
+        blocks.append(self._block('type="setCurrentDate"', f'field="{self.AUDIT_FIELD}"'))
+
+        # 2.4 Trim every field except audit_date and date fields
+        trim_fields = [
+            field for data_type, fields in self.grouped_fields.items()
+            if data_type != "date" for field in fields if field != self.AUDIT_FIELD
+        ]
+        if trim_fields:
+            blocks.append(self._block(
+                f'field="{"|".join(trim_fields)}"', "regex=true", 'type="trim"', 'trimType="both"',
+            ))
+
+        # 2.5 Date reformat
+        if date_fields and self.date_format_dict.get("input_date_format"):
+            blocks.append(self._block(
+                f'field="{"|".join(date_fields)}"',
+                "regex=true",
+                'type="dateformatter"',
+                f'format = "{self.date_format_dict["input_date_format"]}"',
+                f'reformat = "{self.date_format_dict.get("output_date_format", "")}"',
+                "operation = reformat",
+            ))
+
+        # 2.6 Decimal separator replacements
+        if decimal_fields:
+            for pattern, replacement in self._decimal_replacements():
+                blocks.append(self._block(
+                    f'field="{"|".join(decimal_fields)}"',
+                    "regex=true",
+                    "replacements=[",
+                    "    {",
+                    f'        pattern = "[{pattern}]"',
+                    f'        replacement = "{replacement}"',
+                    "    }",
+                    "]",
+                    "type=formatter",
+                    "typeToCast=string",
+                ))
+
+        # 2.3 Cast every type except string
+        for data_type, fields in self.grouped_fields.items():
+            if data_type == "string" or not fields:
+                continue
+            blocks.append(self._block(
+                f'field="{"|".join(fields)}"', "regex=true", "type=formatter", f"typeToCast={self._format_type(data_type)}",
+            ))
+
+        return blocks
+
+    def _decimal_replacements(self) -> List[Tuple[str, str]]:
+        """Replacement table of rule 2.6, based on found_comma, found_dot and decimal_symbol."""
+        found_comma = bool(self.parameters.get("found_comma"))
+        found_dot = bool(self.parameters.get("found_dot"))
+        decimal_symbol = self.parameters.get("decimal_symbol")
+
+        if found_comma and found_dot and decimal_symbol == ",":
+            return [(".", ""), (",", ".")]
+        if found_comma and not found_dot and decimal_symbol == ",":
+            return [(",", ".")]
+        if found_comma and found_dot and decimal_symbol == ".":
+            return [(",", "")]
+        return []
+
+
+@lru_cache(maxsize=16)
+def _compile_template(template: str) -> CompiledHoconTemplate:
+    content = HoconTemplateRenderer.WRAPPED_TRANSFORMATIONS_PATTERN.sub("{transformations}", template)
+    parts: List[Union[str, tuple]] = []
+    position = 0
+    # "{partitions}"={partition_values} becomes a single slot; without a filter value its own placeholders are rendered
+    for match in HoconTemplateRenderer.PARTITION_FILTER_PATTERN.finditer(content):
+        parts.extend(HoconTemplateRenderer._split(content, position, match.start()))
+        parts.append(("partition_filter", None, HoconTemplateRenderer._split(content, match.start(), match.end())))
+        position = match.end()
+    parts.extend(HoconTemplateRenderer._split(content, position, len(content)))
+    return CompiledHoconTemplate(template, parts)
@@ -0,0 +1,177 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils.job_queue import JobQueue
+
+
+class JobStatus:
+    """Possible states of a submitted job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    FINISHED = (SUCCEEDED, FAILED)
+
+
+class JobManager:
+    """
+    Keeps track of every job submitted to the API and hands them out to the worker pool.
+    Each submission gets its own job id, so concurrent submissions never overwrite each other.
+
+    A job taken by a worker holds a lease of `running_timeout` seconds, renewed by the periodic
+    heartbeat of the worker and by every progress report. If the worker dies or its connection drops, `reap_expired` requeues the job (up to
+    `max_attempts` runs in total) and then fails it, so every job reaches a final status.
+    """
+
+    def __init__(self, max_finished_jobs: int = 1000, running_timeout: Optional[float] = 1800.0, max_attempts: int = 2):
+        """
+        Initialize the JobManager.
+
+        :param max_finished_jobs: Number of finished jobs kept for status/result queries.
+                                  The oldest finished jobs are discarded first.
+        :param running_timeout: Seconds a running job may go without a heartbeat, progress report or result.
+                                None disables it.
+        :param max_attempts: Times a job is handed to a worker before an expired lease fails it.
+        """
+        self._queue = JobQueue()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._max_finished_jobs = max_finished_jobs
+        self._running_timeout = running_timeout
+        self._max_attempts = max(max_attempts, 1)
+
+    def submit(self, parameters: Dict[str, Any], progress: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Registers a new job and enqueues it for the workers.
+
+        :param parameters: Dictionary containing processing parameters.
+        :param progress: Initial progress entries of the job (e.g. one per table of a batch).
+        :return: The id assigned to the job.
+        """
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = {
+            "job_id": job_id,
+            "status": JobStatus.QUEUED,
+            "parameters": parameters,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "progress": progress or {},
+            "attempts": 0,
+            "lease_expires_at": None,
+        }
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    async def next_job(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Waits for the next queued job and marks it as running.
+
+        :param timeout: Seconds to wait before giving up. None waits forever.
+        :return: The job record, or None if the timeout expired without a job.
+        """
+        job_id = await self._queue.get(timeout=timeout)
+        if job_id is None:
+            return None
+        job = self._jobs[job_id]
+        job["status"] = JobStatus.RUNNING
+        job["started_at"] = time.time()
+        job["attempts"] += 1
+        self._renew_lease(job)
+        return job
+
+    def complete(self, job_id: str, result: Any) -> Dict[str, Any]:
+        """Marks a running job as succeeded and stores its result."""
+        return self._finish(job_id, JobStatus.SUCCEEDED, result=result)
+
+    def fail(self, job_id: str, error: str) -> Dict[str, Any]:
+        """Marks a running job as failed and stores the error message."""
+        return self._finish(job_id, JobStatus.FAILED, error=error)
+
+    def update_progress(self, job_id: str, key: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Merges a progress entry (e.g. the status of one table of a batch) into a running job."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        job["progress"].setdefault(key, {}).update(entry, updated_at=time.time())
+        # El progreso indica que el worker sigue vivo
+        self._renew_lease(job)
+        return job
+
+    def heartbeat(self, job_id: str) -> Dict[str, Any]:
+        """Renews the lease of a running job: its worker is still processing it."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        self._renew_lease(job)
+        return job
+
+    @property
+    def running_timeout(self) -> Optional[float]:
+        return self._running_timeout
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the job record, or None if the id is unknown."""
+        return self._jobs.get(job_id)
+
+    def queue_depth(self) -> int:
+        """Returns the number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def running_count(self) -> int:
+        """Returns the number of jobs taken by a worker and not finished yet."""
+        return sum(1 for job in self._jobs.values() if job["status"] == JobStatus.RUNNING)
+
+    def reap_expired(self, now: Optional[float] = None) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Requeues or fails the running jobs whose lease expired.
+
+        :param now: Current time (time.time()), for tests.
+        :return: Tuple (ids of the requeued jobs, records of the jobs failed by the timeout).
+        """
+        if self._running_timeout is None:
+            return [], []
+        now = time.time() if now is None else now
+        expired = [
+            job for job in self._jobs.values()
+            if job["status"] == JobStatus.RUNNING and job["lease_expires_at"] is not None and job["lease_expires_at"] <= now
+        ]
+        requeued, failed = [], []
+        for job in expired:
+            if job["attempts"] < self._max_attempts:
+                job["status"] = JobStatus.QUEUED
+                job["started_at"] = None
+                job["lease_expires_at"] = None
+                self._queue.put_nowait(job["job_id"])
+                requeued.append(job["job_id"])
+            else:
+                failed.append(self._finish(
+                    job["job_id"], JobStatus.FAILED,
+                    error=f"No result after {self._running_timeout:.0f} s in {job['attempts']} attempt(s); the worker was lost.",
+                ))
+        return requeued, failed
+
+    def _renew_lease(self, job: Dict[str, Any]) -> None:
+        if self._running_timeout is not None:
+            job["lease_expires_at"] = time.time() + self._running_timeout
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> Dict[str, Any]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        job["status"] = status
+        job["finished_at"] = time.time()
+        job["result"] = result
+        job["error"] = error
+        job["lease_expires_at"] = None
+        self._evict_finished()
+        return job
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in JobStatus.FINISHED]
+        for job_id in finished[:max(len(finished) - self._max_finished_jobs, 0)]:
+            del self._jobs[job_id]
@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, Optional
+
+
+class JobQueue:
+    """
+    In-process queue used by the API to hand submitted jobs to waiting workers.
+    Workers block on `get` instead of polling, so a job is delivered as soon as it is submitted.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        Initialize the JobQueue.
+
+        :param maxsize: Maximum number of pending jobs. 0 means unbounded.
+        """
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def put(self, job: Any) -> None:
+        """
+        Enqueue a job, waking up one waiting worker.
+
+        :param job: The job (or job id) to deliver.
+        """
+        await self._queue.put(job)
+
+    def put_nowait(self, job: Any) -> None:
+        """
+        Enqueue a job without waiting. Only valid for unbounded queues.
+
+        :param job: The job (or job id) to deliver.
+        """
+        self._queue.put_nowait(job)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for the next job.
+
+        :param timeout: Seconds to wait before giving up. None waits forever; 0 or less only
+                        takes a job that is already queued.
+        :return: The job, or None if the timeout expired without a job.
+        """
+        if timeout is not None and timeout <= 0:
+            # wait_for(timeout=0) cancela el get antes de que se ejecute (Python 3.11)
+            try:
+                return self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def qsize(self) -> int:
+        """Returns the number of jobs waiting to be picked up."""
+        return self._queue.qsize()
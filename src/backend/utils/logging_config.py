@@ -0,0 +1,50 @@
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+from backend.utils.tracing import current_span
+
+# Atributos estándar de LogRecord: el resto son los campos pasados con `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line: time, level, logger, message, the trace_id and
+    span_id of the active span, and the fields given with `extra`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        span = current_span()
+        if span is not None:
+            entry["trace_id"] = span.trace_id
+            entry["span_id"] = span.span_id
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None) -> None:
+    """
+    Configures the root logger of the process. Replaces any previous configuration (some modules
+    call logging.basicConfig on import).
+
+    :param level: Level name. Defaults to the LOG_LEVEL environment variable, or INFO.
+    :param log_format: "json" for StructuredFormatter or "text". Defaults to LOG_FORMAT, or text.
+    """
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    log_format = (log_format or os.getenv("LOG_FORMAT", "text")).lower()
+    handler = logging.StreamHandler()
+    handler.setFormatter(StructuredFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    logging.basicConfig(level=level, handlers=[handler], force=True)
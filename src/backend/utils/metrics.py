@@ -0,0 +1,251 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.utils.tracing import Span
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects the labels {list(self.label_names)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("A counter can only increase.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down. With `set_function` it is read when the metrics are rendered."""
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Reads the (unlabelled) value from `function` on every render, e.g. the current queue depth."""
+        if self.label_names:
+            raise ValueError("set_function is only supported for gauges without labels.")
+        self._function = function
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(float(self._function()))}"]
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets, with their sum and count."""
+
+    TYPE = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets if bucket != math.inf)) + (math.inf,)
+        # Por conjunto de etiquetas: (cuentas por bucket, suma, cuenta)
+        self._values: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bucket, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bucket)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+def job_observations(spans: Iterable[Span]) -> Dict[str, Any]:
+    """
+    Summary of the spans of one job, sent by the worker with the job result: duration of each
+    pipeline stage, duration of each LLM request and bytes of the sample files scanned.
+    """
+    stage_seconds, llm_seconds, bytes_scanned = [], [], 0
+    for span in spans:
+        if span.duration_seconds is None:
+            continue
+        stage = span.attributes.get("pipeline.stage")
+        if stage:
+            stage_seconds.append([stage, span.duration_seconds])
+        if span.name == "llm.request":
+            llm_seconds.append(span.duration_seconds)
+        bytes_scanned += int(span.attributes.get("sample.bytes_scanned") or 0)
+    return {"stage_seconds": stage_seconds, "llm_seconds": llm_seconds, "bytes_scanned": bytes_scanned}
+
+
+class PipelineMetrics:
+    """
+    Metrics of the API: jobs submitted and finished, job latency (from submission to result) and
+    queue wait, queue depth and running jobs, and the stage durations, LLM latency and bytes scanned
+    reported by the workers with each result.
+    """
+
+    JOB_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+    STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+    LLM_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        self.jobs_submitted = self.registry.counter(
+            "kirby_jobs_submitted_total", "Jobs submitted to the API.", ["kind"])
+        self.jobs_finished = self.registry.counter(
+            "kirby_jobs_finished_total", "Jobs finished, by status.", ["status"])
+        self.job_duration = self.registry.histogram(
+            "kirby_job_duration_seconds", "Time from submission to result.", ["status"], self.JOB_BUCKETS)
+        self.job_queue_wait = self.registry.histogram(
+            "kirby_job_queue_wait_seconds", "Time a job waited in the queue for a worker.", (), self.JOB_BUCKETS)
+        self.queue_depth = self.registry.gauge("kirby_job_queue_depth", "Jobs waiting for a worker.")
+        self.jobs_running = self.registry.gauge("kirby_jobs_running", "Jobs taken by a worker and not finished.")
+        self.stage_duration = self.registry.histogram(
+            "kirby_stage_duration_seconds", "Duration of each pipeline stage.", ["stage"], self.STAGE_BUCKETS)
+        self.llm_duration = self.registry.histogram(
+            "kirby_llm_request_duration_seconds", "Latency of the LLM requests (cache hits excluded).", (), self.LLM_BUCKETS)
+        self.bytes_scanned = self.registry.counter(
+            "kirby_sample_bytes_scanned_total", "Bytes of sample files read by the profilers.")
+
+    def observe_job(self, job: Dict[str, Any], observations: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Records a finished job of JobManager and the observations the worker reported with it.
+
+        :param job: The job record (status and submitted_at/started_at/finished_at timestamps).
+        :param observations: Output of `job_observations`, or None.
+        """
+        self.jobs_finished.inc(status=job["status"])
+        if job.get("finished_at") and job.get("submitted_at"):
+            self.job_duration.observe(job["finished_at"] - job["submitted_at"], status=job["status"])
+        if job.get("started_at") and job.get("submitted_at"):
+            self.job_queue_wait.observe(job["started_at"] - job["submitted_at"])
+        if not observations:
+            return
+        for stage, seconds in observations.get("stage_seconds", []):
+            self.stage_duration.observe(seconds, stage=stage)
+        for seconds in observations.get("llm_seconds", []):
+            self.llm_duration.observe(seconds)
+        if observations.get("bytes_scanned"):
+            self.bytes_scanned.inc(observations["bytes_scanned"])
+
+    def render(self) -> str:
+        return self.registry.render()
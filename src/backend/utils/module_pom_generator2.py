@@ -1,6 +1,73 @@
+import logging
 import os
+import threading
 import xml.etree.ElementTree as ET
 import json
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from backend.utils.resource_registry import get_default_registry
+
+logger = logging.getLogger(__name__)
+
+
+class PomMetadataCache:
+    """
+    In-process cache of the data extracted from general pom.xml files.
+
+    Entries are keyed by the file path and validated with its mtime and size, so a cached pom costs
+    one `stat` and a pom changed on disk (e.g. by GeneralPomUpdater) is parsed again. The least
+    recently used entries are evicted once the cache exceeds `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the PomMetadataCache.
+
+        :param max_entries: Maximum number of pom files kept.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str, extract: Callable[[str], dict]) -> dict:
+        """
+        Returns the data of the pom, calling `extract` only if the file is not cached or changed.
+
+        :param file_path: Path to the pom.xml file.
+        :param extract: Function that parses the file and returns its data.
+        :return: A copy of the extracted data.
+        :raises OSError: If the file cannot be stat'ed.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return dict(entry[1])
+            self.misses += 1
+
+        data = extract(path)
+        with self._lock:
+            self._entries[path] = (signature, dict(data))
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return dict(data)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Caché compartida por todos los ModulePomGenerator del proceso
+_pom_metadata_cache = PomMetadataCache()
 
 class ModulePomGenerator:
     """
@@ -9,17 +76,33 @@ class ModulePomGenerator:
     Implements SOLID principles, clean code practices, and adheres to PEP8 standards.
     """
 
-    def __init__(self, folder_path: str, uuaa: str):
+    def __init__(self, folder_path: str, uuaa: str, output_folder: Optional[str] = None):
         """
         Initialize the ModulePomGenerator with a folder path and a user agent.
 
         :param folder_path: Path to the folder containing the template and XML files.
         :param uuaa: A user agent string to replace placeholders in the template.
+        :param output_folder: Folder where <uuaa>/pom.xml is written (e.g. the job staging folder).
+                              Defaults to folder_path.
         """
         self.folder_path = folder_path
+        self.output_folder = output_folder or folder_path
         self.uuaa = uuaa
         self.namespace = {'ns0': 'http://maven.apache.org/POM/4.0.0'}
 
+    def read_general_pom_data(self) -> dict:
+        """
+        Extracts the data the module pom needs from the general pom.xml.
+        The general pom is only parsed when it is not cached or changed on disk.
+
+        :return: Dictionary with parent_gp_groupId, gp_artifactId and gp_version.
+        """
+        file_path = os.path.join(self.folder_path, 'pom.xml')
+        try:
+            return _pom_metadata_cache.get(file_path, lambda path: self.extract_data_from_xml(self.read_xml()))
+        except OSError as e:
+            raise RuntimeError(f"Error reading XML file general pom.xml: {e}")
+
     def read_xml(self) -> ET.Element:
         """
         Reads an XML file and returns its root element.
@@ -48,8 +131,6 @@ class ModulePomGenerator:
             return {
                 child.tag.split('}')[-1]: element_to_dict(child) for child in children
             }
-        print(f"XML to Dict")
-        print({xml_root.tag.split('}')[-1]: element_to_dict(xml_root)})
         return {xml_root.tag.split('}')[-1]: element_to_dict(xml_root)}
 
     def extract_data_from_dict(self, xml_dict: dict) -> dict:
@@ -105,16 +186,13 @@ class ModulePomGenerator:
 
     def load_template(self) -> str:
         """
-        Loads the content of a template file.
+        Loads the content of a template file, from the ResourceRegistry (read once per process).
 
         :param template_name: Name of the template file.
         :return: Content of the template file as a string.
         """
         try:
-            backend_folder_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            template_path = os.path.join(backend_folder_path, 'resources', 'templates', 'module_pom.xml')
-            with open(template_path, "r", encoding="utf-8") as file:
-                return file.read()
+            return get_default_registry().text("module_pom")
         except Exception as e:
             raise RuntimeError(f"Error loading template module_pom.xml: {e}")
 
@@ -132,14 +210,26 @@ class ModulePomGenerator:
             content = content.replace("{gp_version}", data["gp_version"])
             content = content.replace("{uuaa}", self.uuaa)
 
-            output_path = os.path.join(self.folder_path, self.uuaa, 'pom.xml')
+            # Se compara con el pom publicado aunque se escriba en otra carpeta (staging)
+            if self._read_existing(os.path.join(self.folder_path, self.uuaa, 'pom.xml')) == content:
+                logger.info("Module pom.xml of %s without changes, not rewritten.", self.uuaa)
+                return
+            output_path = os.path.join(self.output_folder, self.uuaa, 'pom.xml')
             with open(output_path, "w", encoding="utf-8") as file:
                 file.write(content)
 
-            print(f"Output XML file module pom.xml created successfully.")
+            logger.info("Output XML file module pom.xml of %s created successfully.", self.uuaa)
         except Exception as e:
             raise RuntimeError(f"Error generating output XML file module pom.xml: {e}")
 
+    @staticmethod
+    def _read_existing(output_path: str) -> Optional[str]:
+        try:
+            with open(output_path, "r", encoding="utf-8") as file:
+                return file.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
     def process_files(self) -> None:
         """
         Main method to process the XML files and generate the output XML file.
@@ -149,9 +239,7 @@ class ModulePomGenerator:
         :param output_file: Name of the output XML file.
         """
         try:
-            xml_root = self.read_xml()
-            print(f"\nxml_root: {xml_root}\n")
-            data = self.extract_data_from_xml(xml_root)
+            data = self.read_general_pom_data()
             template_content = self.load_template()
             self.generate_output_xml(template_content, data)
         except Exception as e:
@@ -0,0 +1,202 @@
+import asyncio
+import glob
+import os
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from backend.utils.avro_profiler import AvroSampleProfiler
+from backend.utils.data_formater_detector import DateFormatDetector
+from backend.utils.parquet_profiler import ParquetSampleProfiler
+from backend.utils.sample_profiler import SampleProfile, SampleProfiler
+
+
+def _profile_file(file_path: str, grouped_fields: Optional[Dict[str, Tuple[str]]], max_date_samples: int) -> Optional[SampleProfile]:
+    """Profiles one file. Module level so it can run in a process pool."""
+    if file_path.lower().endswith(".avro"):
+        return AvroSampleProfiler(file_path, grouped_fields, max_date_samples=max_date_samples).profile()
+    if file_path.lower().endswith(".parquet"):
+        return ParquetSampleProfiler(file_path, grouped_fields, max_date_samples=max_date_samples).profile()
+    return SampleProfiler(file_path, grouped_fields, max_date_samples=max_date_samples).profile()
+
+
+class ConsolidatedProfile(SampleProfile):
+    """
+    SampleProfile merged from every file of a folder or glob. Consumers that accept a SampleProfile
+    accept it unchanged; `file_path` is the representative file (the largest one with the consensus delimiter).
+
+    Attributes:
+        files (List[str]): Files profiled and merged, largest first (skipped files are not included).
+        skipped_files (List[str]): Files that could not be profiled (invalid, or CSV/TXT without delimiter).
+        delimiter_votes (Dict[str, int]): Number of files per detected delimiter.
+        date_format_votes (Dict[str, Dict[str, int]]): Per date field, number of files per inferred format.
+        decimal_symbol_votes (Dict[str, int]): Number of files per majority decimal symbol.
+        drift (List[str]): Human-readable description of the differences found between files.
+    """
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self.files: List[str] = []
+        self.skipped_files: List[str] = []
+        self.delimiter_votes: Dict[str, int] = {}
+        self.date_format_votes: Dict[str, Dict[str, int]] = {}
+        self.decimal_symbol_votes: Dict[str, int] = {}
+        self.drift: List[str] = []
+
+    def voted_date_formats(self) -> Dict[str, str]:
+        """
+        Returns the winning format of each date field: the one inferred in most files (on a tie,
+        the one of the largest file). The other formats are only reported in `drift`.
+        """
+        # Los votos se añaden del fichero más grande al más pequeño: max se queda con el primero en empate
+        return {field: max(votes, key=votes.get) for field, votes in self.date_format_votes.items() if votes}
+
+
+class MultiFileProfiler:
+    """
+    Profiles every CSV/TXT/Avro/Parquet file of a folder or glob pattern in parallel and merges the results into
+    one ConsolidatedProfile: delimiter and header by consensus, union of decimal separators
+    (the decimal counters of every file are added up) and date formats voted per file.
+
+    Files are submitted largest first, so the pool workers pick the long scans early and
+    the small files fill the gaps at the end.
+    """
+
+    SUPPORTED_EXTENSIONS = (".csv", ".txt", ".avro", ".parquet")
+
+    def __init__(self, source: str, grouped_fields: Optional[Dict[str, Tuple[str]]] = None, max_date_samples: int = 100):
+        """
+        Initialize the MultiFileProfiler.
+
+        :param source: Folder or glob pattern (e.g. /landing/tabla/*.csv).
+        :param grouped_fields: Field names grouped by data type (TypeToNameMapper output).
+        :param max_date_samples: Number of values kept per date field and file.
+        """
+        self.source = source
+        self.grouped_fields = grouped_fields
+        self.max_date_samples = max_date_samples
+
+    @staticmethod
+    def is_multi_file(source: str) -> bool:
+        """True if the sample path is a folder or a glob pattern instead of a single file."""
+        # Un fichero existente es un único fichero aunque su nombre tenga caracteres de glob (data[1].csv)
+        if os.path.isfile(source):
+            return False
+        return os.path.isdir(source) or any(char in source for char in "*?[")
+
+    def resolve_files(self) -> List[str]:
+        """
+        Lists the files to profile, largest first.
+
+        :return: Paths of the CSV/TXT/Avro/Parquet files of the folder or matching the pattern.
+        """
+        if os.path.isdir(self.source):
+            candidates = [os.path.join(self.source, name) for name in os.listdir(self.source)]
+        else:
+            candidates = glob.glob(self.source, recursive=True)
+        files = [
+            path for path in candidates
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in self.SUPPORTED_EXTENSIONS
+        ]
+        return sorted(files, key=lambda path: (-os.path.getsize(path), path))
+
+    def profile(self, executor: Optional[Executor] = None) -> Optional[ConsolidatedProfile]:
+        """
+        Profiles the files and merges the results.
+
+        :param executor: Executor to run the per-file scans in. A ProcessPoolExecutor is created if not given.
+        :return: The ConsolidatedProfile, or None if no file could be profiled.
+        """
+        files = self.resolve_files()
+        if not files:
+            return None
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as pool:
+                return self.profile(pool)
+
+        futures = [
+            executor.submit(_profile_file, path, self.grouped_fields, self.max_date_samples) for path in files
+        ]
+        return self.merge(dict(zip(files, (future.result() for future in futures))))
+
+    async def aprofile(self, executor: Optional[Executor] = None) -> Optional[ConsolidatedProfile]:
+        """
+        Asynchronous version of profile, for callers running in an event loop.
+
+        :param executor: Executor to run the per-file scans in. None uses the loop's default executor.
+        :return: The ConsolidatedProfile, or None if no file could be profiled.
+        """
+        files = await asyncio.to_thread(self.resolve_files)
+        if not files:
+            return None
+        loop = asyncio.get_running_loop()
+        profiles = await asyncio.gather(*(
+            loop.run_in_executor(executor, _profile_file, path, self.grouped_fields, self.max_date_samples)
+            for path in files
+        ))
+        return self.merge(dict(zip(files, profiles)))
+
+    def merge(self, profiles: Dict[str, Optional[SampleProfile]]) -> Optional[ConsolidatedProfile]:
+        """
+        Merges per-file profiles.
+
+        :param profiles: File path mapped to its profile (None if it could not be profiled), largest file first.
+        :return: The ConsolidatedProfile, or None if no file could be profiled.
+        """
+        # Avro and Parquet profiles have columns but no delimiter
+        valid = {
+            path: profile for path, profile in profiles.items()
+            if profile is not None and (profile.delimiter or profile.columns)
+        }
+        if not valid:
+            return None
+
+        delimiter_votes = Counter(profile.delimiter for profile in valid.values() if profile.delimiter)
+        delimiter = delimiter_votes.most_common(1)[0][0] if delimiter_votes else None
+        representative = next(profile for profile in valid.values() if profile.delimiter == delimiter)
+
+        consolidated = ConsolidatedProfile(representative.file_path)
+        consolidated.files = list(valid)
+        consolidated.skipped_files = [path for path in profiles if path not in valid]
+        consolidated.delimiter = delimiter
+        consolidated.delimiter_votes = dict(delimiter_votes)
+        consolidated.columns = list(representative.columns)
+        header_votes = Counter(profile.has_header for profile in valid.values() if profile.delimiter == delimiter)
+        consolidated.has_header = header_votes.most_common(1)[0][0]
+
+        if len(delimiter_votes) > 1:
+            consolidated.drift.append(f"Delimitadores distintos entre ficheros: {dict(delimiter_votes)}")
+        different_columns = [
+            path for path, profile in valid.items() if profile.has_header and profile.columns != consolidated.columns
+        ]
+        if different_columns:
+            consolidated.drift.append(f"Cabeceras distintas a {representative.file_path}: {different_columns}")
+
+        detector = DateFormatDetector()
+        decimal_symbol_votes = Counter()
+        for profile in valid.values():
+            consolidated.rows_read += profile.rows_read
+            consolidated.bytes_read += profile.bytes_read
+            consolidated.decimal_state.merge(profile.decimal_state)
+            symbol = profile.decimal_analysis.get("decimal_symbol")
+            if symbol:
+                decimal_symbol_votes[symbol] += 1
+
+            for field, value in profile.first_values.items():
+                consolidated.first_values.setdefault(field, value)
+            for field, samples in profile.date_samples.items():
+                consolidated.date_samples.setdefault(field, []).extend(samples)
+                date_format = detector.infer_format(samples, tolerance=DateFormatDetector.DEFAULT_TOLERANCE).format if samples else None
+                if date_format:
+                    votes = consolidated.date_format_votes.setdefault(field, {})
+                    votes[date_format] = votes.get(date_format, 0) + 1
+
+        consolidated.decimal_analysis = consolidated.decimal_state.result()
+        consolidated.decimal_symbol_votes = dict(decimal_symbol_votes)
+        if len(decimal_symbol_votes) > 1:
+            consolidated.drift.append(f"Símbolo decimal distinto entre ficheros: {dict(decimal_symbol_votes)}")
+        for field, date_format in consolidated.voted_date_formats().items():
+            votes = consolidated.date_format_votes[field]
+            if len(votes) > 1:
+                consolidated.drift.append(f"Formatos de fecha distintos en '{field}': {votes}; se usa '{date_format}'")
+        return consolidated
@@ -41,9 +41,9 @@ class ParameterProcessor:
 
         if process_type == "ingest":# and 
             #if ingest_type == "Ingesta RAW":
-            self._process_ingest_raw()
+            await self._process_ingest_raw()
 
-    def _process_ingest_raw(self):
+    async def _process_ingest_raw(self):
         """Processes 'Ingesta RAW' type files."""
         #self.schema = self._read_schema_file()
         if self.ingest_type == "Ingesta RAW":
@@ -77,11 +77,11 @@ class ParameterProcessor:
         self._create_json_and_schema_files(self.schema, folder_info)
         print(f"Tipo de Ingesta: {self.ingest_type}")
         if (self.ingest_type == "Ingesta RAW"):
-            config_content = self._generate_raw_configuration(folder_info)
+            config_content = await self._generate_raw_configuration(folder_info)
             print("\nRaw Config File Ok:")
             #print(config_content)
         elif (self.ingest_type == "Ingesta Master"):
-            config_content = self._generate_master_configuration(folder_info)
+            config_content = await self._generate_master_configuration(folder_info)
             print("\nMaster Config File Ok:")
         print(f"Config content: {config_content}")
 
@@ -124,7 +124,7 @@ class ParameterProcessor:
             "S"
         )
 
-    def _generate_configuration(self, folder_info, conf_template_path, rules_conf_path, example_conf_path):
+    async def _generate_configuration(self, folder_info, conf_template_path, rules_conf_path, example_conf_path):
         print("Ingresó a _generate_configuration")
         # Reading template and rule files
         template_conf = fio.read_txt(conf_template_path)
@@ -140,12 +140,12 @@ class ParameterProcessor:
         processor = AIConfGenerator(api_key=self.api_key)
         try:
             if self.ingest_type == "Ingesta RAW":
-                filled_template = processor.fill_template(self.ingest_type, template_conf, self.parameters, rules_conf, example_conf)
+                filled_template = await processor.afill_template(self.ingest_type, template_conf, self.parameters, rules_conf, example_conf)
                 #config_content = self._extract_config_from_template(str(filled_template))
                 #cw.write_conf(config_content, folder_info['complete_path'], folder_info['name'])
                 print(f"Plantilla Diligenciada")
             elif self.ingest_type == "Ingesta Master":
-                filled_template = processor.fill_template(self.ingest_type, template_conf, self.parameters, rules_conf, example_conf, self.grouped_fields)
+                filled_template = await processor.afill_template(self.ingest_type, template_conf, self.parameters, rules_conf, example_conf, grouped_fields=self.grouped_fields)
                 #config_content = self._extract_config_from_template(str(filled_template))
                 #cw.write_conf(config_content, folder_info['complete_path'], folder_info['name'])
             print(f"Filled <template: \n{filled_template}")
@@ -155,7 +155,7 @@ class ParameterProcessor:
         except Exception as e:
             print("An error occurred while filling the template:", e)
     
-    def _generate_raw_configuration(self, folder_info):
+    async def _generate_raw_configuration(self, folder_info):
         """Generates the configuration file based on templates and parameters."""
         print("Ingresó a _generate_raw_configuration")
         base_dir = os.path.dirname(os.path.dirname(__file__))
@@ -163,10 +163,10 @@ class ParameterProcessor:
         rules_raw_conf_path = os.path.join(base_dir, 'resources', 'rules', 'raw_conf.txt')
         example_raw_conf_path = os.path.join(base_dir, 'resources', 'examples', 'raw_config.conf')
 
-        raw_content = self._generate_configuration(folder_info, conf_raw_template_path, rules_raw_conf_path, example_raw_conf_path)
+        raw_content = await self._generate_configuration(folder_info, conf_raw_template_path, rules_raw_conf_path, example_raw_conf_path)
         return raw_content
     
-    def _generate_master_configuration(self, folder_info):
+    async def _generate_master_configuration(self, folder_info):
         print("Ingresó a _generate_master_configuration")
         """Generates the configuration file based on templates and parameters."""
         base_dir = os.path.dirname(os.path.dirname(__file__))
@@ -174,7 +174,7 @@ class ParameterProcessor:
         rules_raw_conf_path = os.path.join(base_dir, 'resources', 'rules', 'raw_conf.txt')
         example_master_conf_path = os.path.join(base_dir, 'resources', 'examples', 'master_config.conf')
 
-        master_content = self._generate_configuration(folder_info, conf_master_template_path, rules_raw_conf_path, example_master_conf_path)
+        master_content = await self._generate_configuration(folder_info, conf_master_template_path, rules_raw_conf_path, example_master_conf_path)
         return master_content
 
     def _extract_config_from_template(self, raw_content):
@@ -1,5 +1,8 @@
+import asyncio
+import logging
 import os
-from typing import Any, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from backend.utils.file_extension_extractor import FileExtensionExtractor
 from backend.utils.file_analyzer import FileAnalyzer
 from backend.utils.folder_generator import FolderGenerator
@@ -11,30 +14,68 @@ from backend.utils.general_pom_updater import GeneralPomUpdater
 from backend.utils.module_pom_generator2 import ModulePomGenerator
 from backend.utils.rep_json_writer import RepJsonWriter as rjw
 from backend.openai_langchain.ai_conf_generator import AIConfGenerator
+from backend.openai_langchain.prompt_builder import PromptBuilder
 from backend.utils.conf_writer import ConfWriter as cw
 from backend.utils.decimal_field_checker_csv import DecimalFieldCheckerCSV as csvdecimalchecker
 from backend.utils.csv_decimal_validator import CSVDecimalValidator
 from backend.utils.csv_date_field_extractor import CsvDateFieldExtractor
 from backend.utils.data_formater_detector import DateFormatDetector
 from backend.utils.schema_date_field_extractor import SchemaDateFieldExtractor
+from backend.utils.hocon_template_renderer import HoconTemplateRenderer
+from backend.utils.sample_profiler import SampleProfile, SampleProfiler
+from backend.utils.multi_file_profiler import ConsolidatedProfile, MultiFileProfiler
+from backend.utils.avro_profiler import AvroSampleProfiler
+from backend.utils.parquet_profiler import ParquetSampleProfiler
+from backend.utils.resource_registry import get_default_registry
+from backend.utils.artifact_manifest import ArtifactManifest
+from backend.utils.staged_artifact_writer import StagedArtifactWriter
+from backend.utils.stage_scheduler import PipelineStage, StageScheduler
+from backend.utils.tracing import get_default_tracer, set_current_span_attribute
+
+logger = logging.getLogger(__name__)
+
+# Pool compartido para las etapas intensivas en CPU (escaneo completo de la muestra)
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Returns the process pool used for CPU-bound stages, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor()
+    return _process_pool
+
+def _analyze_decimals(csv_path: str, grouped_fields: dict, strategy: str, delimiter: Optional[str] = None) -> dict:
+    """Runs the decimal analysis with an explicit sampling strategy. Module level so it can run in the process pool."""
+    if strategy == "vectorized":
+        from backend.utils.vectorized_profiler import VectorizedProfiler
+        return VectorizedProfiler(csv_path, grouped_fields, delimiter, early_stop=True).analyze_decimals()
+    return CSVDecimalValidator(csv_path, grouped_fields, strategy=strategy).analyze_csv()
+
+def _profile_sample(sample_path: str, grouped_fields: dict) -> Optional[SampleProfile]:
+    """Profiles the sample file in a single pass. Module level so it can run in the process pool."""
+    return SampleProfiler(sample_path, grouped_fields).profile()
 
 class ParameterProcessor:
     """Asynchronous processor for handling parameters related to data ingestion."""
 
-    def __init__(self, parameters: dict, api_key: str):
+    def __init__(self, parameters: dict, api_key: str, update_poms: bool = True):
         """
         Initialize the ParameterProcessor with parameters and API key.
         
         :param parameters: Dictionary containing processing parameters.
         :param api_key: API key for OpenAI processor.
+        :param update_poms: Update the general pom and generate the module pom. BatchProcessor passes False
+                            and does a single merged update once every table is done.
         """
         self.parameters = parameters
         self.api_key = api_key
+        self.update_poms = update_poms
+        self.sample_profile = None
     
     def _read_schema_file(self):
-        """Reads the .schema file."""
+        """Reads the .schema file into its compiled SchemaModel, cached while the file does not change."""
         schema_reader = sr(self.parameters["schema_file_path"])
-        return schema_reader.read()
+        return schema_reader.read_model()
     
     def _get_file_extension(self):
         """Extracts the file extension."""
@@ -43,34 +84,33 @@ class ParameterProcessor:
 
     def _analyze_file(self):
         """Analyzes the file to extract header and delimiter."""
-        file_analyzer = FileAnalyzer(self.parameters["data_sample_file_path"])
+        file_analyzer = FileAnalyzer(self.parameters["data_sample_file_path"], self.sample_profile)
         return file_analyzer.analyze_file()
 
     def _generate_folders(self, schema):
-        """Generates the folder structure based on the schema."""
-        print("Generating folder structure...")
+        """Computes the folder structure based on the schema. The folders are created when the outputs are published."""
+        logger.debug("Generating folder structure...")
         folder_generator = FolderGenerator(schema, self.parameters["folder_path"])
-        return folder_generator.generate()
+        return folder_generator.generate(create=False)
     
     def _update_general_pom(self, folder_path, uuaa):
         """Update general pom file"""
         general_pom_updater = GeneralPomUpdater(folder_path, uuaa)
         status_general_pom_updater = general_pom_updater.update_module_content()
     
-    def _generate_module_pom(self, folder_path, uuaa):
-        "Generate module pom file"
-        module_pom_generator = ModulePomGenerator(folder_path, uuaa)
+    def _generate_module_pom(self, folder_path, uuaa, staging):
+        "Generate module pom file into the job staging folder"
+        staging.staged_folder(os.path.join(folder_path, uuaa))
+        module_pom_generator = ModulePomGenerator(folder_path, uuaa, staging.staged_folder(folder_path))
         module_pom_generator.generate_xml()
     
-    def _create_json_and_schema_files(self, schema, folder_info):
-        """Creates necessary JSON and schema files."""
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        json_template_path = os.path.join(base_dir, 'resources', 'templates', 'json_template.json')
-        conf_raw_template_path = os.path.join(base_dir, 'resources', 'templates', 'config_raw_template.conf')
-
-        write_output_schema_file = osw.write_schema(schema, folder_info['complete_path'], folder_info['name'])
+    def _create_schema_file(self, schema, folder_info):
+        """Creates the output schema file."""
+        osw.write_schema(schema.to_dict(), folder_info['complete_path'], folder_info['name'])
 
-        write_rep_json_file = rjw(json_template_path)
+    def _create_json_file(self, folder_info):
+        """Creates the rep.json file."""
+        write_rep_json_file = rjw(template_data=get_default_registry().parsed("json_template"))
         write_rep_json_file.write_to_json(
             folder_info['complete_path'],
             folder_info['name'],
@@ -80,54 +120,61 @@ class ParameterProcessor:
             "S"
         )
     
-    def _generate_configuration(self, folder_info, conf_template_path, rules_conf_path, example_conf_path):
-        print("Ingresó a _generate_configuration")
-        # Reading template and rule files
-        template_conf = fio.read_txt(conf_template_path)
-        rules_conf = fio.read_txt(rules_conf_path)
-        example_conf = fio.read_txt(example_conf_path)
+    async def _generate_configuration(self, folder_info):
+        logger.debug("Ingresó a _generate_configuration")
+        # Plantilla compilada, reglas y ejemplo ya cargados en memoria por el ResourceRegistry
+        template, rules, example = get_default_registry().conf_resources(self.ingest_type)
+
+        # Deterministic filling; the LLM only completes the placeholders that cannot be computed
+        renderer = HoconTemplateRenderer(
+            self.ingest_type,
+            self.parameters,
+            getattr(self, "grouped_fields", None),
+            getattr(self, "date_format_dict", None),
+        )
+        template_conf, unresolved = renderer.render(template.parsed)
+        if not unresolved:
+            logger.info("Plantilla diligenciada sin LLM")
+            await asyncio.to_thread(cw.write_conf, template_conf, folder_info['complete_path'], folder_info['name'])
+            return template_conf
+        logger.info("Campos sin calcular, se usa el LLM: %s", unresolved)
+
+        rules_conf, example_conf = rules.text, example.text
         
         processor = AIConfGenerator(api_key=self.api_key)
+        # El frontend puede forzar una nueva llamada al LLM con "bypass_llm_cache": true
+        bypass_cache = bool(self.parameters.pop("bypass_llm_cache", False))
         
         try:
             if self.ingest_type == "raw":
-                filled_template = processor.fill_template(self.ingest_type, template_conf, self.parameters, rules_conf, example_conf)
+                filled_template = await processor.afill_template(self.ingest_type, template_conf, self.parameters, rules_conf, example_conf, bypass_cache=bypass_cache)
                 #config_content = self._extract_config_from_template(str(filled_template))
                 #cw.write_conf(config_content, folder_info['complete_path'], folder_info['name'])
-                print(f"Plantilla Diligenciada")
+                logger.debug("Plantilla Diligenciada")
             elif self.ingest_type == "master":
-                print(f"date_format_dict")
-                print(self.date_format_dict)
-                filled_template = processor.fill_template(self.ingest_type, template_conf, self.parameters, rules_conf, example_conf, self.date_format_dict, self.grouped_fields)
+                logger.debug("date_format_dict: %s", self.date_format_dict)
+                filled_template = await processor.afill_template(self.ingest_type, template_conf, self.parameters, rules_conf, example_conf, self.date_format_dict, self.grouped_fields, bypass_cache=bypass_cache)
                 #config_content = self._extract_config_from_template(str(filled_template))
                 #cw.write_conf(config_content, folder_info['complete_path'], folder_info['name'])
-            print(f"Filled <template: \n{filled_template}")
+            logger.debug("Filled template:\n%s", filled_template)
             config_content = self._extract_config_from_template(str(filled_template))
-            cw.write_conf(config_content, folder_info['complete_path'], folder_info['name'])
+            await asyncio.to_thread(cw.write_conf, config_content, folder_info['complete_path'], folder_info['name'])
             return config_content
-        except Exception as e:
-            print("An error occurred while filling the template:", e)
+        except Exception:
+            # Se propaga para que la causa original llegue al resultado del trabajo (/jobs/{id})
+            logger.error("An error occurred while filling the template")
+            raise
     
-    def _generate_raw_configuration(self, folder_info):
+    async def _generate_raw_configuration(self, folder_info):
         """Generates the configuration file based on templates and parameters."""
-        print("Ingresó a _generate_raw_configuration")
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        conf_raw_template_path = os.path.join(base_dir, 'resources', 'templates', 'config_raw_template.conf')
-        rules_raw_conf_path = os.path.join(base_dir, 'resources', 'rules', 'raw_conf_rules.txt')
-        example_raw_conf_path = os.path.join(base_dir, 'resources', 'examples', 'raw_config.conf')
-
-        raw_content = self._generate_configuration(folder_info, conf_raw_template_path, rules_raw_conf_path, example_raw_conf_path)
+        logger.debug("Ingresó a _generate_raw_configuration")
+        raw_content = await self._generate_configuration(folder_info)
         return raw_content
     
-    def _generate_master_configuration(self, folder_info):
-        print("Ingresó a _generate_master_configuration")
+    async def _generate_master_configuration(self, folder_info):
+        logger.debug("Ingresó a _generate_master_configuration")
         """Generates the configuration file based on templates and parameters."""
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        conf_master_template_path = os.path.join(base_dir, 'resources', 'templates', 'master_config_template.conf')
-        rules_raw_conf_path = os.path.join(base_dir, 'resources', 'rules', 'master_conf_rules.txt')
-        example_master_conf_path = os.path.join(base_dir, 'resources', 'examples', 'master_config.conf')
-
-        master_content = self._generate_configuration(folder_info, conf_master_template_path, rules_raw_conf_path, example_master_conf_path)
+        master_content = await self._generate_configuration(folder_info)
         return master_content
 
     def _extract_config_from_template(self, raw_content):
@@ -136,89 +183,342 @@ class ParameterProcessor:
         final_position = raw_content.rfind("```'")
         return raw_content[initial_position + 11: final_position - 2].replace(r'\n', '\n').replace(r"\'", "'")
     
-    def _process_ingest(self):
-        """Processes 'Ingesta RAW' type files."""
+    def _extract_date_format_dict(self, csv_path, delimiter):
+        """Detects the sample date format and pairs it with the format declared in the schema."""
+        if 'date' in self.grouped_fields:
+            logger.debug("La llave 'date' existe en el diccionario.")
+            schema_date_field_extractor = SchemaDateFieldExtractor(self.schema)
+            date_formats = schema_date_field_extractor.extract_date_formats()
+            schema_date_format = list(date_formats[0].values())[0]
+            # Se infiere el formato a partir de varias muestras por columna, no de un único valor
+            if self.sample_profile is not None and any(self.sample_profile.date_samples.values()):
+                date_samples = {field: values for field, values in self.sample_profile.date_samples.items() if values}
+            elif not csv_path.lower().endswith((".csv", ".txt")):
+                # Avro/Parquet sin muestras de fecha (columnas vacías o sin estadísticas): no hay CSV que leer
+                logger.warning("No date samples in '%s'; the input date format is left empty.", csv_path)
+                return {"input_date_format": "", "output_date_format": schema_date_format}
+            else:
+                data_type_date_extractor = CsvDateFieldExtractor(csv_path, self.grouped_fields, delimiter, self.sample_profile)
+                date_samples = {
+                    field: [value] for field, value in data_type_date_extractor.get_first_date_field_values().items()
+                }
+            if not date_samples:
+                raise ValueError("None of the 'date' fields exist in the CSV file.")
+            date_format_detector = DateFormatDetector()
+            # Con tolerancia: un valor sucio en la muestra no descarta el formato de toda la columna
+            inferences = date_format_detector.infer_formats(date_samples, tolerance=DateFormatDetector.DEFAULT_TOLERANCE)
+            inferred_formats = {field: inference.format for field, inference in inferences.items()}
+            if isinstance(self.sample_profile, ConsolidatedProfile):
+                # Varios ficheros: manda el formato votado por fichero, no el de las muestras concatenadas
+                # (que con deriva entre ficheros no tendría un formato común). Los perdedores van en drift.
+                inferred_formats.update(self.sample_profile.voted_date_formats())
+            logger.info("Formatos de fecha inferidos: %s", inferred_formats)
+            logger.debug("Inferencias de fecha: %s", inferences)
+            sample_data_date_format = next((date_format for date_format in inferred_formats.values() if date_format), None)
+            return {"input_date_format": sample_data_date_format, "output_date_format": schema_date_format}
+        logger.debug("La llave 'date' no existe en el diccionario.")
+        return {"input_date_format": "", "output_date_format": ""}
+
+    async def _process_ingest(self):
+        """
+        Processes 'Ingesta RAW' type files. The pipeline is a graph of stages (see `_ingest_stages`)
+        run by StageScheduler: independent stages run concurrently and every job gets a per-stage
+        timing breakdown.
+        """
         #self.schema = self._read_schema_file()
-        self.database = self.schema["database"]
-        print(f"self.database de _process_ingest: {self.database}")
+        self.database = self.schema.database
+        logger.debug("self.database de _process_ingest: %s", self.database)
+
+        logger.debug("parameters_processor schema: %r", self.schema)
+        self.parameters["uuaa"] = self.schema.namespace.lower()
+        self.parameters["database"] = self.schema.database
+        self.parameters["tabla"] = self.schema.name
+        self.parameters["partitions"] = self.schema["partitions"]
+        self.parameters["physicalPath"] = self.schema.physical_path
+
+        # Todas las salidas del trabajo se escriben en staging y se publican juntas al final
+        staging = await asyncio.to_thread(StagedArtifactWriter, self.parameters["folder_path"])
+        scheduler = StageScheduler(self._ingest_stages(staging))
+        span_attributes = {"table.name": self.schema.name, "table.uuaa": self.parameters["uuaa"], "ingest.type": self.ingest_type}
+        try:
+            with get_default_tracer().start_span("ingest", span_attributes):
+                values = await scheduler.run()
+        except BaseException:
+            await asyncio.to_thread(staging.discard)
+            raise
+        finally:
+            self.stage_timings = scheduler.timings
+            logger.info("Tiempos por etapa:\n%s", scheduler.format_timings(), extra={"stage_timings": scheduler.timings})
+
+        config_content = values["config_content"]
+        logger.info("%s Config File Ok", self.ingest_type.capitalize())
+        logger.debug("Config content:\n%s", config_content)
+        return {"folder_info": values["folder_info"], "config_content": config_content,
+                "regenerated": values["stale"], "stage_timings": self.stage_timings}
+
+    def _ingest_stages(self, staging: StagedArtifactWriter) -> List[PipelineStage]:
+        """
+        Stage graph of an ingest job. Every stage declares the values it needs and produces:
+
+            folders -> manifest -> staging -> output_schema, rep_json           \\
+            module_pom                                                          -> publish -> general_pom, manifest_save
+            manifest -> profile -> dialect [-> date_formats, decimals] -> conf  /
+
+        Raw jobs with a single CSV/TXT sample skip the full profile: the .conf generation starts as soon
+        as the delimiter and header are sniffed. Stages of artifacts that are fresh in the manifest are skipped.
+        """
+        folder_path = self.parameters["folder_path"]
+        uuaa = self.parameters["uuaa"]
+        conf_stale = lambda stale, **_: "rep_conf" in stale
+
+        stages = [
+            PipelineStage("folders", lambda: asyncio.to_thread(self._generate_folders, self.schema),
+                          outputs=("folder_info",)),
+            # Re-ejecución: solo se regeneran los artefactos cuyas entradas cambiaron
+            PipelineStage("manifest", lambda folder_info: asyncio.to_thread(self._find_stale_artifacts, folder_info),
+                          inputs=("folder_info",), outputs=("manifest", "artifact_inputs", "stale")),
+            PipelineStage("staging", lambda folder_info: asyncio.to_thread(self._staged_folder_info, staging, folder_info),
+                          inputs=("folder_info",), outputs=("staged_info",)),
+            PipelineStage("output_schema", lambda staged_info, **_: asyncio.to_thread(self._create_schema_file, self.schema, staged_info),
+                          inputs=("stale", "staged_info"), outputs=("output_schema_done",),
+                          when=lambda stale, **_: "output_schema" in stale),
+            PipelineStage("rep_json", lambda staged_info, **_: asyncio.to_thread(self._create_json_file, staged_info),
+                          inputs=("stale", "staged_info"), outputs=("rep_json_done",),
+                          when=lambda stale, **_: "rep_json" in stale),
+            PipelineStage("module_pom", lambda: asyncio.to_thread(self._generate_module_pom, folder_path, uuaa, staging),
+                          outputs=("module_pom_done",), when=lambda: self.update_poms),
+            PipelineStage("type_mapping", self._map_types, outputs=("grouped_fields",),
+                          when=lambda: self.database == "master"),
+            # El .conf depende de la muestra: solo en este caso se perfila
+            PipelineStage("profile", self._profile_sample_files, inputs=("stale", "grouped_fields"),
+                          outputs=("sample_profile",),
+                          when=lambda stale, **_: "rep_conf" in stale and self._needs_full_profile()),
+            PipelineStage("dialect", self._detect_dialect, inputs=("stale", "sample_profile"),
+                          outputs=("header", "delimiter"), when=conf_stale),
+        ]
+        conf_inputs = ["stale", "staged_info", "folder_info", "artifact_inputs", "header", "delimiter"]
+        if self.database == "master":
+            stages += [
+                PipelineStage("date_formats", self._detect_date_formats, inputs=("stale", "grouped_fields", "delimiter"),
+                              outputs=("date_format_dict",), when=conf_stale),
+                PipelineStage("decimals", self._analyze_decimal_fields, inputs=("stale", "grouped_fields", "sample_profile", "delimiter"),
+                              outputs=("decimal_analysis",), when=conf_stale),
+            ]
+            conf_inputs += ["date_format_dict", "decimal_analysis"]
+        stages += [
+            PipelineStage("conf", self._conf_stage, inputs=conf_inputs, outputs=("config_content",)),
+            PipelineStage("publish", lambda **_: asyncio.to_thread(staging.publish),
+                          inputs=("output_schema_done", "rep_json_done", "module_pom_done", "config_content"),
+                          outputs=("published",)),
+            # Tras publicar el módulo: el pom general nunca apunta a un módulo a medio escribir
+            PipelineStage("general_pom", lambda **_: asyncio.to_thread(self._update_general_pom, folder_path, uuaa),
+                          inputs=("published",), when=lambda **_: self.update_poms),
+            PipelineStage("manifest_save", lambda **values: asyncio.to_thread(self._save_manifest, **values),
+                          inputs=("published", "manifest", "artifact_inputs", "stale")),
+        ]
+        return stages
+
+    def _find_stale_artifacts(self, folder_info) -> Tuple[ArtifactManifest, Dict[str, Tuple[str, Dict[str, str]]], List[str]]:
+        """Returns the manifest, the artifact inputs and the artifacts whose inputs changed."""
+        manifest, artifact_inputs = self._check_manifest(folder_info)
+        stale = [
+            artifact for artifact, (file_name, inputs) in artifact_inputs.items()
+            if not manifest.is_fresh(artifact, file_name, inputs)
+        ]
+        logger.info("Artefactos a regenerar: %s", stale or "ninguno")
+        return manifest, artifact_inputs, stale
+
+    @staticmethod
+    def _staged_folder_info(staging: StagedArtifactWriter, folder_info) -> dict:
+        """folder_info pointing to the job staging folder, used by the writers."""
+        return dict(folder_info, complete_path=staging.staged_folder(folder_info['complete_path']))
 
-        header, delimiter = self._analyze_file()
+    def _map_types(self):
+        mapper = TypeToNameMapper(self.schema)
+        self.grouped_fields = mapper.map_types_to_names()
+        logger.debug("Parameters Processor self.grouped_fields: %s", self.grouped_fields)
+        return self.grouped_fields
+
+    async def _conf_stage(self, stale, staged_info, folder_info, artifact_inputs, **_):
+        """Generates the .conf into the staging folder, or reads the published one when it is fresh."""
+        if "rep_conf" not in stale:
+            return await asyncio.to_thread(
+                fio.read_txt, os.path.join(folder_info['complete_path'], artifact_inputs["rep_conf"][0])
+            )
+        logger.debug("Tipo de Ingesta: %s", self.ingest_type)
+        if (self.ingest_type == "raw"):
+            config_content = await self._generate_raw_configuration(staged_info)
+        elif (self.ingest_type == "master"):
+            config_content = await self._generate_master_configuration(staged_info)
+        if config_content is None:
+            raise RuntimeError(f"The {self.ingest_type} configuration could not be generated; nothing was published.")
+        return config_content
+
+    @staticmethod
+    def _save_manifest(published, manifest, artifact_inputs, stale):
+        for artifact in stale:
+            file_name, inputs = artifact_inputs[artifact]
+            manifest.record(artifact, file_name, inputs)
+        if stale:
+            manifest.save()
+
+    def _check_manifest(self, folder_info) -> Tuple[ArtifactManifest, Dict[str, Tuple[str, Dict[str, str]]]]:
+        """
+        Loads the table manifest and computes the current input digests of each artifact.
+        "force_regenerate" (or "bypass_llm_cache", which asks for a new LLM answer) ignores the manifest.
+
+        :return: Tuple (manifest, {artifact: (file name, {input: digest})}).
+        """
+        name = folder_info['name']
+        force = bool(self.parameters.pop("force_regenerate", False) or self.parameters.get("bypass_llm_cache"))
+        # El manifiesto se guarda en <folder_path>/.manifests, fuera del árbol del módulo kirby
+        manifest_root = self.parameters["folder_path"]
+        manifest = ArtifactManifest(folder_info['complete_path'], name, manifest_root) if force else \
+            ArtifactManifest.load(folder_info['complete_path'], name, manifest_root)
+
+        registry = get_default_registry()
+        template, rules, example = registry.conf_resources(self.ingest_type)
+        schema_digest = ArtifactManifest.hash_file(self.parameters["schema_file_path"])
+        sample_path = self.parameters["data_sample_file_path"]
+        sample_files = MultiFileProfiler(sample_path).resolve_files() if MultiFileProfiler.is_multi_file(sample_path) else [sample_path]
+        parameters = {key: value for key, value in self.parameters.items() if key not in ("bypass_llm_cache",)}
+
+        artifact_inputs = {
+            "output_schema": (f"{name}.output.schema", {"schema": schema_digest}),
+            "rep_json": (f"{name}.rep.json", {
+                "template": registry.get("json_template").digest,
+                "parameters": ArtifactManifest.hash_value(
+                    [name, folder_info['uuaa'], self.parameters["code_schema"], folder_info['database']]),
+            }),
+            "rep_conf": (f"{name}.rep.conf", {
+                "schema": schema_digest,
+                "sample": ArtifactManifest.fingerprint_files(sample_files),
+                "template": template.digest,
+                "rules": rules.digest,
+                "example": example.digest,
+                "parameters": ArtifactManifest.hash_value(parameters),
+                # Un cambio en el prompt o en el renderizado HOCON invalida la .conf aunque no cambien las entradas
+                "generator": f"{PromptBuilder.VERSION}.{HoconTemplateRenderer.VERSION}",
+            }),
+        }
+        return manifest, artifact_inputs
+
+    def _needs_full_profile(self) -> bool:
+        """
+        Master jobs use the profile for dates and decimals. Raw jobs only need the delimiter and header,
+        which are sniffed from the start of a single CSV/TXT sample; directories, Avro and Parquet are profiled.
+        """
+        if self.database == "master":
+            return True
+        sample_path = self.parameters["data_sample_file_path"]
+        return MultiFileProfiler.is_multi_file(sample_path) or not sample_path.lower().endswith((".csv", ".txt"))
+
+    async def _profile_sample_files(self, grouped_fields, **_):
+        """Profiles the sample in a single read: delimiter, header, date samples and decimal separators."""
+        loop = asyncio.get_running_loop()
+        sample_path = self.parameters["data_sample_file_path"]
+        if MultiFileProfiler.is_multi_file(sample_path):
+            # Modo directorio: se perfilan todos los ficheros en paralelo y se consolida el resultado
+            multi_file_profiler = MultiFileProfiler(sample_path, grouped_fields)
+            self.sample_profile = await multi_file_profiler.aprofile(_get_process_pool())
+            if self.sample_profile is None:
+                raise ValueError(f"No CSV/TXT files could be profiled in '{sample_path}'.")
+            logger.info("Ficheros perfilados: %d, delimitadores: %s",
+                        len(self.sample_profile.files), self.sample_profile.delimiter_votes)
+            for drift in self.sample_profile.drift:
+                logger.warning("%s", drift)
+            # Las etapas siguientes usan el fichero representativo
+            self.parameters["data_sample_file_path"] = self.sample_profile.file_path
+        elif sample_path.lower().endswith(".avro"):
+            # Avro: esquema desde la cabecera del fichero y bloques decodificados en el pool de procesos
+            avro_profiler = AvroSampleProfiler(sample_path, grouped_fields)
+            self.sample_profile = await asyncio.to_thread(avro_profiler.profile, _get_process_pool())
+            if self.sample_profile is None:
+                raise ValueError(f"'{sample_path}' is not a valid AVRO file.")
+        elif sample_path.lower().endswith(".parquet"):
+            # Parquet: metadatos del footer y solo las columnas necesarias, por row group en el pool de procesos
+            parquet_profiler = ParquetSampleProfiler(sample_path, grouped_fields)
+            self.sample_profile = await asyncio.to_thread(parquet_profiler.profile, _get_process_pool())
+            if self.sample_profile is None:
+                raise ValueError(f"'{sample_path}' is not a valid PARQUET file.")
+        else:
+            self.sample_profile = await loop.run_in_executor(
+                _get_process_pool(), _profile_sample, sample_path, grouped_fields
+            )
+        if self.sample_profile is not None:
+            set_current_span_attribute("sample.bytes_scanned", self.sample_profile.bytes_read)
+        return self.sample_profile
+
+    async def _detect_dialect(self, **_):
+        """Header and delimiter, from the profile or, without it, from the first bytes of the sample."""
+        # Avro y Parquet no tienen cabecera ni delimitador
+        header, delimiter = await asyncio.to_thread(self._analyze_file) or (None, None)
+        if self.sample_profile is None:
+            # Sin perfil solo se leyó el inicio de la muestra
+            sample_size = await asyncio.to_thread(os.path.getsize, self.parameters["data_sample_file_path"])
+            set_current_span_attribute("sample.bytes_scanned", min(sample_size, FileAnalyzer.DEFAULT_SNIFF_BYTES))
 
         if self.database == "raw":
             file_extension = self._get_file_extension()
             self.parameters["input_format"] = file_extension
-            print(f"Sample Data Extension: {file_extension}")
+            logger.debug("Sample Data Extension: %s", file_extension)
 
             if file_extension in ["csv", "txt"]:
                 #header, delimiter = self._analyze_file()
                 self.parameters["delimiter"] = delimiter
                 self.parameters["header"] = header
-                print(f"Header: {header}, Delimiter: {delimiter}")
-        
-        if self.database == "master":
-            mapper = TypeToNameMapper(self.schema)
-            self.grouped_fields = mapper.map_types_to_names()
-            print(f"Parameters Processor self.grouped_fields: {self.grouped_fields}")
-            csv_path = self.parameters["data_sample_file_path"]
-            print(f"Parameters Processor csv_path: {csv_path}")
-
-            if 'date' in self.grouped_fields:
-                print("La llave 'date' existe en el diccionario.")
-                data_type_date_extractor = CsvDateFieldExtractor(csv_path, self.grouped_fields, delimiter)
-                value_input_date = data_type_date_extractor.get_first_date_field_value()
-                date_format_detector = DateFormatDetector()
-                sample_data_date_format = date_format_detector.detect_format(value_input_date)
-                schema_date_field_extractor = SchemaDateFieldExtractor(self.schema)
-                date_formats = schema_date_field_extractor.extract_date_formats()
-                schema_date_format = list(date_formats[0].values())[0]
-                #if sample_data_date_format != schema_date_format:
-                if "date" in self.grouped_fields:
-                    print("Hay date")
-                    self.date_format_dict = {"input_date_format": sample_data_date_format, "output_date_format": schema_date_format}            
-            else:
-                print("La llave 'date' no existe en el diccionario.")
-                self.date_format_dict = {"input_date_format": "", "output_date_format": ""}
-            #csv_decimal_checker = csvdecimalchecker(csv_path, self.grouped_fields)
-            #found_comma, found_dot = csv_decimal_checker.check_comma_and_dot()
-            csv_decimal_validator = CSVDecimalValidator(csv_path, self.grouped_fields)
-            found_comma, found_dot, decimal_symbol, correct_data = csv_decimal_validator.analyze_csv()
-            self.parameters["found_comma"] = found_comma
-            self.parameters["found_dot"] = found_dot
-            self.parameters["decimal_symbol"] = decimal_symbol
-        
-        print(f"parameters_processor schema: {self.schema}")
-        self.parameters["uuaa"] = self.schema["namespace"].lower()
-        self.parameters["database"] = self.schema["database"]
-        self.parameters["tabla"] = self.schema["name"]
-        self.parameters["partitions"] = self.schema["partitions"]
-        self.parameters["physicalPath"] = self.schema["physicalPath"]
-        folder_info = self._generate_folders(self.schema)
-        self._update_general_pom(self.parameters["folder_path"] ,self.parameters["uuaa"])
-        self._generate_module_pom(self.parameters["folder_path"] ,self.parameters["uuaa"])
-        self._create_json_and_schema_files(self.schema, folder_info)
-        print(f"Tipo de Ingesta: {self.ingest_type}")
-        if (self.ingest_type == "raw"):
-            config_content = self._generate_raw_configuration(folder_info)
-            print("\nRaw Config File Ok:")
-            #print(config_content)
-        elif (self.ingest_type == "master"):
-            config_content = self._generate_master_configuration(folder_info)
-            print("\nMaster Config File Ok:")
-        print(f"Config content: {config_content}")
+                logger.info("Header: %s, Delimiter: %r", header, delimiter)
+        return header, delimiter
+
+    async def _detect_date_formats(self, delimiter, **_):
+        csv_path = self.parameters["data_sample_file_path"]
+        logger.debug("Parameters Processor csv_path: %s", csv_path)
+        self.date_format_dict = await asyncio.to_thread(self._extract_date_format_dict, csv_path, delimiter)
+        return self.date_format_dict
+
+    async def _analyze_decimal_fields(self, grouped_fields, sample_profile, delimiter=None, **_):
+        csv_path = self.parameters["data_sample_file_path"]
+        decimal_strategy = self.parameters.pop("decimal_sampling_strategy", None)
+        if decimal_strategy and (isinstance(sample_profile, ConsolidatedProfile) or not csv_path.lower().endswith((".csv", ".txt"))):
+            # Las estrategias leen el fichero como CSV: en modo directorio solo verían el representativo
+            logger.warning("decimal_sampling_strategy=%s only applies to a single CSV/TXT sample; the sample profile is used.",
+                           decimal_strategy)
+            decimal_strategy = None
+        if decimal_strategy:
+            # Estrategia explícita (reservoir, stratified, full, vectorized): se analiza el fichero aparte
+            decimal_analysis = await asyncio.get_running_loop().run_in_executor(
+                _get_process_pool(), _analyze_decimals, csv_path, grouped_fields, decimal_strategy, delimiter
+            )
+        else:
+            csv_decimal_validator = CSVDecimalValidator(csv_path, grouped_fields, sample_profile)
+            decimal_analysis = await asyncio.to_thread(csv_decimal_validator.analyze_csv)
+        logger.info("Decimal analysis: rows_scanned=%s, confidence=%s, stopped_early=%s",
+                    decimal_analysis['rows_scanned'], decimal_analysis['confidence'], decimal_analysis['stopped_early'])
+        #csv_decimal_checker = csvdecimalchecker(csv_path, self.grouped_fields)
+        #found_comma, found_dot = csv_decimal_checker.check_comma_and_dot()
+        self.parameters["found_comma"] = decimal_analysis["comma"]
+        self.parameters["found_dot"] = decimal_analysis["dot"]
+        self.parameters["decimal_symbol"] = decimal_analysis["decimal_symbol"]
+        return decimal_analysis
 
     async def process_parameters(self):
-        """Asynchronously processes the received parameters."""
+        """
+        Asynchronously processes the received parameters.
+        Blocking stages run in thread or process pools so the event loop stays free for other jobs.
+
+        :return: Dictionary with the generated folder info and configuration content,
+                 or None if the process type is not handled.
+        """
         # Log sample file path for debugging
         #print(f"Sample Path: {self.parameters['data_sample_file_path']}")
         
-        self.schema = self._read_schema_file()
-        print(f"Información de self.schema {self.schema}")
-        print(f"Tipo de self.schema: {type(self.schema)}")
+        self.schema = await asyncio.to_thread(self._read_schema_file)
+        logger.debug("Información de self.schema: %r", self.schema)
 
         # Process types
         process_type = self.parameters["process_type"]
-        self.ingest_type = self.schema["database"]
+        self.ingest_type = self.schema.database
 
         if process_type == "ingest":# and 
             #if ingest_type == "Ingesta RAW":
-            self._process_ingest()
\ No newline at end of file
+            return await self._process_ingest()
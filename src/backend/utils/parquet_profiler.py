@@ -0,0 +1,264 @@
+import logging
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.utils.csv_decimal_validator import CSVDecimalValidator, DecimalFieldStats, DecimalScanState
+from backend.utils.sample_profiler import SampleProfile
+
+logger = logging.getLogger(__name__)
+
+
+class ParquetProfile(SampleProfile):
+    """
+    SampleProfile of a Parquet sample. Parquet has no delimiter or header: `delimiter` stays None and
+    `columns` are the fields of the file schema.
+
+    Attributes:
+        grouped_fields (Dict[str, Tuple[str]]): Fields grouped by type, derived from the file schema.
+        decimal_scales (Dict[str, int]): Scale of the natively typed decimal columns.
+        value_ranges (Dict[str, Tuple[Any, Any]]): (min, max) of the decimal and date columns, from the
+                                                  row group statistics.
+        row_groups (int): Row groups in the file.
+        row_groups_scanned (int): Row groups whose data had to be decoded.
+        num_rows (int): Rows in the file, from the footer.
+    """
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self.grouped_fields: Dict[str, Tuple[str]] = {}
+        self.decimal_scales: Dict[str, int] = {}
+        self.value_ranges: Dict[str, Tuple[Any, Any]] = {}
+        self.row_groups = 0
+        self.row_groups_scanned = 0
+        self.num_rows = 0
+
+
+def arrow_type_name(arrow_type: pa.DataType) -> str:
+    """Type name used in the .schema files (TypeToNameMapper keys) for an Arrow type."""
+    if pa.types.is_decimal(arrow_type):
+        return f"decimal({arrow_type.precision},{arrow_type.scale})"
+    if pa.types.is_date(arrow_type):
+        return "date"
+    if pa.types.is_timestamp(arrow_type):
+        return "timestamp"
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return "string"
+    if pa.types.is_integer(arrow_type):
+        return f"int{arrow_type.bit_width}"
+    if pa.types.is_float64(arrow_type):
+        return "double"
+    if pa.types.is_floating(arrow_type):
+        return "float"
+    if pa.types.is_boolean(arrow_type):
+        return "boolean"
+    return str(arrow_type)
+
+
+def grouped_fields_from_arrow_schema(schema: pa.Schema) -> Dict[str, Tuple[str]]:
+    """Groups the fields of an Arrow schema by type, with the same keys as TypeToNameMapper."""
+    grouped: Dict[str, List[str]] = {}
+    for field in schema:
+        grouped.setdefault(arrow_type_name(field.type), []).append(field.name)
+    return {key: tuple(names) for key, names in grouped.items()}
+
+
+def _scan_row_group(file_path: str, row_group: int, decimal_columns: Tuple[Tuple[str, int], ...],
+                    date_columns: Tuple[str, ...], max_date_samples: int) -> Tuple[DecimalScanState, Dict[str, List[str]], int]:
+    """
+    Decodes only the given columns of one row group and profiles them.
+    Module level so it can run in a process pool.
+
+    :return: Tuple (decimal state, date samples per field, rows decoded).
+    """
+    columns = list(dict.fromkeys([field for field, _ in decimal_columns] + list(date_columns)))
+    table = pq.ParquetFile(file_path).read_row_group(row_group, columns=columns)
+
+    state = DecimalScanState()
+    for field, decimal_places in decimal_columns:
+        stats = state.fields[field] = DecimalFieldStats()
+        stats.update_many((value for value in table.column(field).to_pylist() if value is not None), decimal_places)
+
+    date_samples = {}
+    for field in date_columns:
+        values = table.column(field).drop_null().slice(0, max_date_samples * 4).to_pylist()
+        date_samples[field] = [text for text in map(_date_text, values) if text][:max_date_samples]
+
+    state.rows_scanned = table.num_rows
+    return state, date_samples, table.num_rows
+
+
+def _date_text(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return value.strip() if isinstance(value, str) else ""
+
+
+class ParquetSampleProfiler:
+    """
+    Profiles a Parquet sample with the same output as SampleProfiler: decimal analysis and date samples.
+
+    The footer is used first: the schema gives the field types (no .schema file needed) and the scale of
+    natively typed decimals, and the row group statistics give min/max. Natively typed decimal and date
+    columns are profiled from the footer alone (native decimals have no textual separator, so they do
+    not take part in the decimal symbol analysis). Only string columns declared as decimal or date in
+    grouped_fields need their data: those columns (and no others) are decoded row group by row group
+    in the worker processes of the given executor, stopping once the profile is settled.
+    """
+
+    def __init__(self, file_path: str, grouped_fields: Optional[Dict[str, Tuple[str]]] = None,
+                 max_date_samples: int = 100, max_decimal_rows: int = CSVDecimalValidator.DEFAULT_SAMPLE_ROWS,
+                 max_in_flight: int = 8, early_stop: bool = True):
+        """
+        Initialize the ParquetSampleProfiler.
+
+        :param file_path: Path to the Parquet sample file.
+        :param grouped_fields: Field names grouped by data type. Derived from the file schema if not given.
+        :param max_date_samples: Number of values kept per date field for format detection.
+        :param max_decimal_rows: Maximum number of rows decoded for the decimal analysis.
+        :param max_in_flight: Row groups submitted and not yet merged.
+        :param early_stop: Stop decoding row groups once the profile is settled. False decodes every row group.
+        """
+        self.file_path = file_path
+        self.grouped_fields = grouped_fields
+        self.max_date_samples = max_date_samples
+        self.max_decimal_rows = max_decimal_rows
+        self.max_in_flight = max_in_flight
+        self.early_stop = early_stop
+
+    def profile(self, executor: Optional[Executor] = None) -> Optional[ParquetProfile]:
+        """
+        Profiles the file.
+
+        :param executor: Executor to decode row groups in. Row groups are decoded in the calling thread if not given.
+        :return: The ParquetProfile, or None if the file is not a valid Parquet file.
+        """
+        try:
+            parquet_file = pq.ParquetFile(self.file_path)
+        except FileNotFoundError:
+            logger.error("File '%s' not found.", self.file_path)
+            return None
+        except (pa.ArrowInvalid, OSError) as error:
+            logger.error("File '%s' is not a valid PARQUET file: %s", self.file_path, error)
+            return None
+
+        metadata = parquet_file.metadata
+        schema = parquet_file.schema_arrow
+        profile = ParquetProfile(self.file_path)
+        profile.columns = list(schema.names)
+        profile.grouped_fields = grouped_fields_from_arrow_schema(schema)
+        profile.row_groups = metadata.num_row_groups
+        profile.num_rows = metadata.num_rows
+        profile.bytes_read = metadata.serialized_size
+
+        grouped_fields = self.grouped_fields or profile.grouped_fields
+        decimal_fields = {
+            field: decimal_places
+            for fields, decimal_places in CSVDecimalValidator.get_decimal_fields(grouped_fields).values()
+            for field in fields
+        }
+        missing_fields = [field for field in decimal_fields if field not in profile.columns]
+        if missing_fields:
+            logger.warning("The following fields are missing in the PARQUET file: %s", missing_fields)
+        date_fields = [field for field in grouped_fields.get("date", ()) if field in profile.columns]
+
+        self._read_statistics(profile, metadata, schema, [field for field in decimal_fields if field in profile.columns] + date_fields)
+
+        # Natively typed columns are answered by the footer; string columns need their data
+        scan_decimals = []
+        for field, decimal_places in decimal_fields.items():
+            if field not in profile.columns:
+                continue
+            arrow_type = schema.field(field).type
+            if pa.types.is_decimal(arrow_type):
+                # Stored as numbers: there is no textual separator to detect, the scale comes from the type
+                profile.decimal_scales[field] = arrow_type.scale
+            elif pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+                scan_decimals.append((field, decimal_places))
+
+        scan_dates = []
+        for field in date_fields:
+            profile.date_samples[field] = []
+            arrow_type = schema.field(field).type
+            if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+                scan_dates.append(field)
+            elif field in profile.value_ranges:
+                # Native dates: the range bounds are enough for the format and the first value
+                samples = [text for text in map(_date_text, profile.value_ranges[field]) if text]
+                profile.date_samples[field] = samples
+                if samples:
+                    profile.first_values[field] = samples[0]
+
+        if scan_decimals or scan_dates:
+            self._scan(profile, tuple(scan_decimals), tuple(scan_dates), executor)
+        profile.decimal_analysis = profile.decimal_state.result()
+        return profile
+
+    @staticmethod
+    def _read_statistics(profile: ParquetProfile, metadata, schema: pa.Schema, fields: List[str]) -> None:
+        """(min, max) per column over every row group, when all the row groups have statistics."""
+        # Las estadísticas van por columna hoja de Parquet, no por campo de Arrow: con campos anidados
+        # los índices no coinciden, así que se busca la hoja por su ruta (los anidados no tienen una sola)
+        leaf_indexes = {metadata.schema.column(index).path: index for index in range(metadata.num_columns)}
+        for field in fields:
+            column_index = leaf_indexes.get(field)
+            if column_index is None:
+                continue
+            minimum = maximum = None
+            for row_group in range(metadata.num_row_groups):
+                statistics = metadata.row_group(row_group).column(column_index).statistics
+                if statistics is None or not statistics.has_min_max:
+                    minimum = maximum = None
+                    break
+                minimum = statistics.min if minimum is None else min(minimum, statistics.min)
+                maximum = statistics.max if maximum is None else max(maximum, statistics.max)
+            if minimum is not None:
+                profile.value_ranges[field] = (minimum, maximum)
+
+    def _scan(self, profile: ParquetProfile, decimal_columns: Tuple[Tuple[str, int], ...], date_columns: Tuple[str, ...],
+              executor: Optional[Executor]) -> None:
+        decimal_fields = [field for field, _ in decimal_columns]
+        scan_state = DecimalScanState()
+        max_in_flight = self.max_in_flight if executor is not None else 1
+        pending = set()
+
+        def merge(result) -> None:
+            state, date_samples, _ = result
+            scan_state.merge(state)
+            for field, samples in date_samples.items():
+                field_samples = profile.date_samples[field]
+                field_samples.extend(samples[:self.max_date_samples - len(field_samples)])
+                if field_samples:
+                    profile.first_values.setdefault(field, field_samples[0])
+
+        def done() -> bool:
+            decimals_done = not decimal_columns or scan_state.rows_scanned >= self.max_decimal_rows or scan_state.is_settled(
+                decimal_fields, CSVDecimalValidator.DEFAULT_MIN_VALUES, CSVDecimalValidator.DEFAULT_CONFIDENCE)
+            dates_done = all(len(profile.date_samples[field]) >= self.max_date_samples for field in date_columns)
+            return decimals_done and dates_done
+
+        stopped_early = False
+        for row_group in range(profile.row_groups):
+            arguments = (self.file_path, row_group, decimal_columns, date_columns, self.max_date_samples)
+            profile.row_groups_scanned += 1
+            if executor is None:
+                merge(_scan_row_group(*arguments))
+            else:
+                pending.add(executor.submit(_scan_row_group, *arguments))
+                while len(pending) >= max_in_flight:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        pending.discard(future)
+                        merge(future.result())
+            if self.early_stop and done():
+                stopped_early = row_group + 1 < profile.row_groups
+                break
+        for future in pending:
+            merge(future.result())
+
+        scan_state.stopped_early = stopped_early
+        profile.rows_read = scan_state.rows_scanned
+        profile.decimal_state.merge(scan_state)
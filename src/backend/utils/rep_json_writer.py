@@ -1,21 +1,31 @@
+import copy
+import logging
 import os
 import json
+from typing import Optional
 #from string import Template
 
+logger = logging.getLogger(__name__)
+
 class RepJsonWriter:
     """Clase para crear y escribir archivos JSON de configuración a partir de una plantilla."""
 
-    def __init__(self, template_path: str):
+    def __init__(self, template_path: Optional[str] = None, template_data: Optional[dict] = None):
         """
-        Inicializa la clase con la ruta de la plantilla JSON.
+        Inicializa la clase con la ruta de la plantilla JSON o con la plantilla ya cargada.
 
         :param template_path: Ruta al archivo de plantilla JSON.
+        :param template_data: Plantilla ya parseada (p. ej. la del ResourceRegistry). No se modifica:
+                              cada escritura trabaja sobre una copia.
         :raises FileNotFoundError: Si la plantilla no se encuentra.
         :raises ValueError: Si el archivo de plantilla no es un JSON válido.
         """
-        if not os.path.isfile(template_path):
-            raise FileNotFoundError(f"The template file '{template_path}' does not exist.")
         self.template_path = template_path
+        if template_data is not None:
+            self.template_data = template_data
+            return
+        if not template_path or not os.path.isfile(template_path):
+            raise FileNotFoundError(f"The template file '{template_path}' does not exist.")
         self.template_data = self._load_template()
 
     def _load_template(self) -> dict:
@@ -93,11 +103,12 @@ class RepJsonWriter:
             )
         }
         
-        # Reemplazar valores en el JSON
+        # Reemplazar valores en una copia: la plantilla puede estar compartida entre trabajos
+        json_data = copy.deepcopy(self.template_data)
         for key, value in replacements.items():
             # Navega por el JSON para ajustar claves anidadas (como "params.configUrl")
             keys = key.split(".")
-            temp_data = self.template_data
+            temp_data = json_data
             for k in keys[:-1]:
                 temp_data = temp_data.setdefault(k, {})  # Crea subdiccionarios si no existen
             temp_data[keys[-1]] = value  # Asigna el valor final
@@ -108,7 +119,7 @@ class RepJsonWriter:
         # Guardar en archivo JSON con manejo de errores
         try:
             with open(file_path, 'w') as file:
-                json.dump(self.template_data, file, indent=4)
-            print(f"JSON content written to: {file_path}")
+                json.dump(json_data, file, indent=4)
+            logger.info("JSON content written to: %s", file_path)
         except (OSError, json.JSONEncodeError) as e:
-            print(f"Failed to write JSON to {file_path}: {e}")
+            logger.error("Failed to write JSON to %s: %s", file_path, e)
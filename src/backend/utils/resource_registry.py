@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.utils.hocon_template_renderer import HoconTemplateRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class Resource:
+    """
+    A file of backend/resources, loaded and parsed.
+
+    Attributes:
+        name (str): Registry name of the resource.
+        path (str): Absolute path of the file.
+        text (str): File content.
+        parsed (Any): Ready-to-use structure (compiled HOCON template, JSON data...), or the text itself.
+        signature (Tuple[int, int]): (mtime_ns, size) of the file when it was loaded.
+        digest (str): SHA-256 of the content, used by ArtifactManifest to detect template and rule changes.
+    """
+
+    __slots__ = ("name", "path", "text", "parsed", "signature", "digest")
+
+    def __init__(self, name: str, path: str, text: str, parsed: Any, signature: Tuple[int, int]):
+        self.name = name
+        self.path = path
+        self.text = text
+        self.parsed = parsed
+        self.signature = signature
+        self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResourceRegistry:
+    """
+    Templates, rules and examples of backend/resources, read and parsed once (at worker startup)
+    instead of on every job. The .conf templates are compiled for HoconTemplateRenderer and the
+    JSON template is parsed, so a job only takes the ready structures from memory.
+
+    With `hot_reload`, every access compares the file mtime and size with the loaded ones and
+    reloads the file if it changed, so a template edit takes effect without restarting the worker.
+    """
+
+    BASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+    # Nombre del recurso: (ruta relativa a resources, parser)
+    RESOURCES: Dict[str, Tuple[str, Optional[Callable[[str], Any]]]] = {
+        "raw_template": (os.path.join("templates", "config_raw_template.conf"), HoconTemplateRenderer.compile),
+        "master_template": (os.path.join("templates", "master_config_template.conf"), HoconTemplateRenderer.compile),
+        "raw_rules": (os.path.join("rules", "raw_conf_rules.txt"), None),
+        "master_rules": (os.path.join("rules", "master_conf_rules.txt"), None),
+        "raw_example": (os.path.join("examples", "raw_config.conf"), None),
+        "master_example": (os.path.join("examples", "master_config.conf"), None),
+        "json_template": (os.path.join("templates", "json_template.json"), json.loads),
+        "module_pom": (os.path.join("templates", "module_pom.xml"), None),
+    }
+
+    def __init__(self, base_dir: Optional[str] = None, hot_reload: bool = False):
+        """
+        Initialize the ResourceRegistry. Files are loaded by `load` or on first access.
+
+        :param base_dir: Folder with the templates, rules and examples subfolders. Defaults to backend/resources.
+        :param hot_reload: Check the file mtime and size on every access and reload changed files.
+        """
+        self.base_dir = base_dir or self.BASE_DIR
+        self.hot_reload = hot_reload
+        self.reloads = 0
+        self._resources: Dict[str, Resource] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResourceRegistry":
+        """Creates a registry configured from RESOURCES_DIR and RESOURCES_HOT_RELOAD."""
+        hot_reload = os.getenv("RESOURCES_HOT_RELOAD", "false").lower() in ("1", "true", "yes")
+        return cls(os.getenv("RESOURCES_DIR"), hot_reload=hot_reload)
+
+    def load(self) -> "ResourceRegistry":
+        """
+        Loads every resource.
+
+        :return: The registry itself.
+        :raises RuntimeError: If a resource cannot be read or parsed.
+        """
+        for name in self.RESOURCES:
+            self.get(name)
+        return self
+
+    def get(self, name: str) -> Resource:
+        """
+        Returns the resource, loading it on first access (or, with hot reload, when the file changed).
+
+        :param name: Name of the resource (key of RESOURCES).
+        :return: The Resource.
+        :raises KeyError: If the name is unknown.
+        :raises RuntimeError: If the resource cannot be read or parsed.
+        """
+        resource = self._resources.get(name)
+        if resource is not None and not self.hot_reload:
+            return resource
+        relative_path, parser = self.RESOURCES[name]
+        path = os.path.join(self.base_dir, relative_path)
+        with self._lock:
+            resource = self._resources.get(name)
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                if resource is not None:
+                    # El fichero desapareció durante la recarga: se sigue usando la versión cargada
+                    return resource
+                raise RuntimeError(f"Error loading resource {relative_path}: {e}")
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if resource is None or resource.signature != signature:
+                if resource is not None:
+                    self.reloads += 1
+                    logger.info("Recurso modificado, se recarga: %s", relative_path)
+                resource = self._resources[name] = self._read(name, path, parser, signature)
+            return resource
+
+    def text(self, name: str) -> str:
+        """Returns the content of the resource."""
+        return self.get(name).text
+
+    def parsed(self, name: str) -> Any:
+        """Returns the parsed structure of the resource."""
+        return self.get(name).parsed
+
+    def conf_resources(self, ingest_type: str) -> Tuple[Resource, Resource, Resource]:
+        """
+        Returns the template, rules and example of the .conf of an ingest type.
+
+        :param ingest_type: "raw" or "master".
+        :return: Tuple (template, rules, example).
+        """
+        return self.get(f"{ingest_type}_template"), self.get(f"{ingest_type}_rules"), self.get(f"{ingest_type}_example")
+
+    @staticmethod
+    def _read(name: str, path: str, parser: Optional[Callable[[str], Any]], signature: Tuple[int, int]) -> Resource:
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                text = file.read()
+            parsed = parser(text) if parser is not None else text
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Error loading resource {path}: {e}")
+        return Resource(name, path, text, parsed, signature)
+
+
+_default_registry: Optional[ResourceRegistry] = None
+
+
+def get_default_registry() -> ResourceRegistry:
+    """Returns the process-wide registry, creating one from the environment if the worker did not set it."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ResourceRegistry.from_env()
+    return _default_registry
+
+
+def set_default_registry(registry: ResourceRegistry) -> None:
+    """Sets the process-wide registry. Called by the worker at startup."""
+    global _default_registry
+    _default_registry = registry
@@ -0,0 +1,192 @@
+import codecs
+import csv
+import io
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils.csv_decimal_validator import CSVDecimalValidator, DecimalScanState
+from backend.utils.file_analyzer import FileAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class SampleProfile:
+    """
+    Result of a single pass over a sample file. Consumed by FileAnalyzer, CsvDateFieldExtractor
+    and CSVDecimalValidator instead of each of them reading the file again.
+
+    Attributes:
+        file_path (str): Path to the profiled file.
+        delimiter (Optional[str]): Detected delimiter, None if none was found.
+        quotechar (str): Detected quote character.
+        encoding (str): Detected encoding.
+        line_terminator (str): Detected line terminator.
+        has_header (bool): Whether the first row looks like a header.
+        columns (List[str]): Names in the first row.
+        first_values (Dict[str, str]): First non-empty value of each date field.
+        date_samples (Dict[str, List[str]]): Up to `max_date_samples` non-empty values of each date field.
+        decimal_analysis (Dict[str, Any]): Same result as CSVDecimalValidator.analyze_csv.
+        decimal_state (DecimalScanState): Counters behind decimal_analysis, used to merge profiles.
+        rows_read (int): Data rows read.
+        bytes_read (int): Bytes consumed from the file.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.delimiter: Optional[str] = None
+        self.quotechar = '"'
+        self.encoding = "utf-8"
+        self.line_terminator = "\n"
+        self.has_header = False
+        self.columns: List[str] = []
+        self.first_values: Dict[str, str] = {}
+        self.date_samples: Dict[str, List[str]] = {}
+        self.decimal_state = DecimalScanState()
+        self.decimal_analysis: Dict[str, Any] = self.decimal_state.result()
+        self.rows_read = 0
+        self.bytes_read = 0
+
+
+class SampleProfiler:
+    """
+    Streams a CSV/TXT sample file once, in `chunk_size` buffered reads, and computes in that single
+    pass the delimiter, the header decision, the date field candidates and the decimal analysis.
+    Reading stops early when nothing else needs the remaining rows: the decimal analysis is settled
+    (or reached `max_decimal_rows`) and every date field already has its samples.
+    """
+
+    def __init__(self, file_path: str, grouped_fields: Optional[Dict[str, Tuple[str]]] = None,
+                 chunk_size: int = 1024 * 1024, max_date_samples: int = 100,
+                 max_decimal_rows: int = CSVDecimalValidator.DEFAULT_SAMPLE_ROWS):
+        """
+        Initialize the SampleProfiler.
+
+        :param file_path: Path to the CSV or TXT sample file.
+        :param grouped_fields: Field names grouped by data type (TypeToNameMapper output).
+        :param chunk_size: Size of each buffered read.
+        :param max_date_samples: Number of values kept per date field for format detection.
+        :param max_decimal_rows: Maximum number of rows scanned for the decimal analysis.
+        """
+        self.file_path = file_path
+        self.grouped_fields = grouped_fields or {}
+        self.chunk_size = chunk_size
+        self.max_date_samples = max_date_samples
+        self.max_decimal_rows = max_decimal_rows
+
+    def profile(self) -> Optional[SampleProfile]:
+        """
+        Profiles the file.
+
+        :return: The SampleProfile, or None if the file is not a valid CSV/TXT file.
+        """
+        path = Path(self.file_path)
+        if not (path.is_file() and path.suffix in [".csv", ".txt"]):
+            return None
+
+        profile = SampleProfile(self.file_path)
+        # Delimiter, quote, encoding and header are sniffed from the start of the file, scored over several rows
+        dialect = FileAnalyzer(self.file_path).sniff()
+        if dialect is None:
+            return profile
+        profile.delimiter = dialect.delimiter
+        profile.quotechar = dialect.quotechar
+        profile.encoding = dialect.encoding
+        profile.line_terminator = dialect.line_terminator
+        profile.has_header = dialect.has_header
+
+        with path.open("rb", buffering=self.chunk_size) as raw_file:
+            if dialect.encoding.startswith("utf-16") or dialect.line_terminator == "\r":
+                # Lines cannot be split on b"\n" here: let the text layer split them
+                file = io.TextIOWrapper(raw_file, encoding=dialect.encoding, newline="")
+            else:
+                file = _CountingTextReader(raw_file, dialect.encoding)
+            reader = csv.reader(file, delimiter=dialect.delimiter, quotechar=dialect.quotechar)
+            profile.columns = next(reader, [])
+            self._scan(profile, reader)
+            profile.bytes_read = file.bytes_read if isinstance(file, _CountingTextReader) else raw_file.tell()
+
+        return profile
+
+    def _scan(self, profile: SampleProfile, rows) -> None:
+        positions = {name: index for index, name in enumerate(profile.columns)}
+
+        date_columns = [
+            (field, positions[field]) for field in self.grouped_fields.get("date", ()) if field in positions
+        ]
+        decimal_columns = [
+            (field, positions[field], decimal_places)
+            for _, (fields, decimal_places) in CSVDecimalValidator.get_decimal_fields(self.grouped_fields).items()
+            for field in fields if field in positions
+        ]
+        missing_decimals = [
+            field for _, (fields, _) in CSVDecimalValidator.get_decimal_fields(self.grouped_fields).items()
+            for field in fields if field not in positions
+        ]
+        if missing_decimals:
+            logger.warning("The following fields are missing in the CSV file: %s", missing_decimals)
+
+        decimal_state = profile.decimal_state
+        decimal_fields = [field for field, _, _ in decimal_columns]
+        scanning_decimals = bool(decimal_columns)
+        pending_dates = {field for field, _ in date_columns}
+        for field, _ in date_columns:
+            profile.date_samples[field] = []
+
+        for row in rows:
+            profile.rows_read += 1
+            row_length = len(row)
+
+            if scanning_decimals:
+                decimal_state.rows_scanned += 1
+                for field, index, decimal_places in decimal_columns:
+                    if index < row_length:
+                        decimal_state.update(field, row[index], decimal_places)
+                # Bounded sampling: stop scanning decimals once every field is settled or the cap is reached
+                if decimal_state.rows_scanned >= self.max_decimal_rows:
+                    scanning_decimals = False
+                elif decimal_state.rows_scanned % 100 == 0 and decimal_state.is_settled(
+                        decimal_fields, CSVDecimalValidator.DEFAULT_MIN_VALUES, CSVDecimalValidator.DEFAULT_CONFIDENCE):
+                    decimal_state.stopped_early = True
+                    scanning_decimals = False
+
+            if pending_dates:
+                for field, index in date_columns:
+                    if field not in pending_dates or index >= row_length:
+                        continue
+                    value = row[index].strip()
+                    if not value:
+                        continue
+                    samples = profile.date_samples[field]
+                    samples.append(value)
+                    profile.first_values.setdefault(field, value)
+                    if len(samples) >= self.max_date_samples:
+                        pending_dates.discard(field)
+
+            if not scanning_decimals and not pending_dates:
+                break
+
+        profile.decimal_analysis = decimal_state.result()
+
+
+class _CountingTextReader:
+    """Line iterator over a binary file that decodes it and counts the bytes consumed."""
+
+    def __init__(self, raw_file, encoding: str = "utf-8"):
+        self._raw_file = raw_file
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self.bytes_read = 0
+
+    def readline(self) -> str:
+        line = self._raw_file.readline()
+        self.bytes_read += len(line)
+        return self._decoder.decode(line, final=not line)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
@@ -1,4 +1,6 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
+
+from backend.utils.schema_reader import SchemaModel
 
 
 class SchemaDateFieldExtractor:
@@ -11,9 +13,9 @@ class SchemaDateFieldExtractor:
         """
         Initializes the DateFieldExtractor with a data dictionary.
 
-        :param source_data: Dictionary containing the data structure.
+        :param source_data: Dictionary containing the data structure, or its compiled SchemaModel.
         """
-        if not isinstance(source_data, dict):
+        if not isinstance(source_data, Mapping):
             raise ValueError("source_data must be a dictionary")
         self._source_data = source_data
 
@@ -23,6 +25,10 @@ class SchemaDateFieldExtractor:
 
         :return: A list of dictionaries with field names as keys and 'format' as values.
         """
+        if isinstance(self._source_data, SchemaModel):
+            # Precomputed when the schema was compiled
+            return [{field_name: date_format} for field_name, date_format in self._source_data.date_formats.items()]
+
         result = []
         fields = self._source_data.get("fields", [])
 
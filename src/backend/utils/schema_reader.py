@@ -1,10 +1,206 @@
+import copy
 import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the standard json module
+    orjson = None
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of a JSON value: objects as MappingProxyType and arrays as tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class FieldRecord:
+    """One field of a .schema file."""
+
+    __slots__ = ("name", "type", "legacy_name", "logical_format", "format", "deleted", "metadata",
+                 "locale", "default", "precision", "scale")
+
+    DECIMAL_PATTERN = re.compile(r"^decimal\(\s*(\d+)\s*,\s*(\d+)\s*\)$")
+
+    def __init__(self, field: Dict[str, Any]):
+        set_attribute = object.__setattr__
+        field_type = field.get("type")
+        set_attribute(self, "name", field.get("name"))
+        set_attribute(self, "type", field_type)
+        set_attribute(self, "legacy_name", field.get("legacy_name"))
+        set_attribute(self, "logical_format", field.get("logical_format"))
+        set_attribute(self, "format", field.get("format"))
+        set_attribute(self, "deleted", field.get("deleted"))
+        set_attribute(self, "metadata", field.get("metadata"))
+        set_attribute(self, "locale", field.get("locale"))
+        set_attribute(self, "default", field.get("default"))
+        match = self.DECIMAL_PATTERN.match(field_type) if isinstance(field_type, str) else None
+        set_attribute(self, "precision", int(match.group(1)) if match else None)
+        set_attribute(self, "scale", int(match.group(2)) if match else None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("FieldRecord is immutable")
+
+    def __repr__(self) -> str:
+        return f"FieldRecord(name={self.name!r}, type={self.type!r})"
+
+
+class SchemaModel(Mapping):
+    """
+    Compiled, immutable view of a .schema file, shared by every stage of the pipeline.
+
+    The fields are parsed once into FieldRecord objects and the lookups the stages need are
+    precomputed: fields by type (TypeToNameMapper output), decimal precision and scale, date formats,
+    partition columns and legacy_name -> name. The model is also a read-only Mapping over the top
+    level keys, so code written for the raw dictionary (schema["database"], schema.get("fields"))
+    keeps working. The values it returns are read-only copies (objects as MappingProxyType, arrays as
+    tuples): the model is cached and shared by every job, so nothing may modify it. `to_dict`
+    returns a mutable copy.
+
+    Attributes:
+        path (Optional[str]): Path of the .schema file.
+        name, namespace, database, physical_path: Top level values of the schema.
+        fields (Tuple[FieldRecord, ...]): Fields in schema order.
+        fields_by_type (Mapping[str, Tuple[str, ...]]): Field names grouped by type.
+        decimal_specs (Mapping[str, Tuple[int, int]]): (precision, scale) of each decimal field.
+        date_formats (Mapping[str, Optional[str]]): Format of each date field.
+        partition_columns (Tuple[str, ...]): Partition columns.
+        legacy_names (Mapping[str, str]): legacy_name -> name.
+    """
+
+    __slots__ = ("path", "name", "namespace", "database", "physical_path", "fields", "fields_by_type",
+                 "decimal_specs", "date_formats", "partition_columns", "legacy_names", "_fields_by_name", "_raw", "_frozen")
+
+    def __init__(self, raw: Dict[str, Any], path: Optional[str] = None):
+        """
+        Compile the schema.
+
+        :param raw: The parsed .schema JSON.
+        :param path: Path of the .schema file, if it was read from disk.
+        :raises ValueError: If the schema is not a JSON object or 'fields' is not a list.
+        """
+        if not isinstance(raw, dict):
+            raise ValueError("The schema must be a JSON object")
+        raw_fields = raw.get("fields", [])
+        if not isinstance(raw_fields, list):
+            raise ValueError("'fields' must be a list of dictionaries")
+
+        fields = tuple(FieldRecord(field) for field in raw_fields if isinstance(field, dict))
+        fields_by_type: Dict[str, list] = {}
+        for field in fields:
+            if field.type and field.name:
+                fields_by_type.setdefault(field.type, []).append(field.name)
+        partitions = raw.get("partitions")
+        if isinstance(partitions, str):
+            partitions = [column.strip() for column in partitions.split(",") if column.strip()]
+
+        set_attribute = object.__setattr__
+        set_attribute(self, "path", path)
+        set_attribute(self, "name", raw.get("name"))
+        set_attribute(self, "namespace", raw.get("namespace"))
+        set_attribute(self, "database", raw.get("database"))
+        set_attribute(self, "physical_path", raw.get("physicalPath"))
+        set_attribute(self, "fields", fields)
+        set_attribute(self, "fields_by_type", MappingProxyType({key: tuple(names) for key, names in fields_by_type.items()}))
+        set_attribute(self, "decimal_specs", MappingProxyType({
+            field.name: (field.precision, field.scale) for field in fields if field.precision is not None
+        }))
+        set_attribute(self, "date_formats", MappingProxyType({
+            field.name: field.format for field in fields if field.type == "date"
+        }))
+        set_attribute(self, "partition_columns", tuple(partitions or ()))
+        set_attribute(self, "legacy_names", MappingProxyType({
+            field.legacy_name: field.name for field in fields if field.legacy_name
+        }))
+        set_attribute(self, "_fields_by_name", MappingProxyType({field.name: field for field in fields}))
+        set_attribute(self, "_raw", raw)
+        set_attribute(self, "_frozen", _freeze(raw))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("SchemaModel is immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._frozen[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return (f"SchemaModel(name={self.name!r}, namespace={self.namespace!r}, database={self.database!r}, "
+                f"fields={len(self.fields)})")
+
+    def field(self, name: str) -> Optional[FieldRecord]:
+        """Returns the field with the given name, or None."""
+        return self._fields_by_name.get(name)
+
+    def field_by_legacy_name(self, legacy_name: str) -> Optional[FieldRecord]:
+        """Returns the field with the given legacy_name, or None."""
+        name = self.legacy_names.get(legacy_name)
+        return self._fields_by_name.get(name) if name is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a mutable copy of the original .schema JSON (e.g. to write the output schema)."""
+        return copy.deepcopy(self._raw)
+
 
 class SchemaReader:
+    """
+    Reads .schema files. `read_model` returns the compiled SchemaModel, parsed once per file
+    (with orjson when it is installed) and cached by path, mtime and size.
+    """
+
+    MAX_CACHED_SCHEMAS = 64
+
+    _cache: "OrderedDict[str, Tuple[Tuple[int, int], SchemaModel]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
     def __init__(self, schema_path):
         self.schema_path = schema_path
 
     def read(self):
-        with open(self.schema_path, 'r') as file:
-            schema = json.load(file)
-        return schema
+        """Returns the parsed .schema JSON as a new dictionary."""
+        with open(self.schema_path, 'rb') as file:
+            return self._loads(file.read())
+
+    def read_model(self) -> SchemaModel:
+        """
+        Returns the compiled SchemaModel of the file. A file that did not change since the last call
+        costs one stat.
+
+        :raises OSError: If the file cannot be read.
+        :raises ValueError: If the file is not a valid schema.
+        """
+        path = os.path.abspath(self.schema_path)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cls = type(self)
+        with cls._cache_lock:
+            entry = cls._cache.get(path)
+            if entry is not None and entry[0] == signature:
+                cls._cache.move_to_end(path)
+                return entry[1]
+
+        model = SchemaModel(self.read(), path)
+        with cls._cache_lock:
+            cls._cache[path] = (signature, model)
+            cls._cache.move_to_end(path)
+            while len(cls._cache) > cls.MAX_CACHED_SCHEMAS:
+                cls._cache.popitem(last=False)
+        return model
+
+    @staticmethod
+    def _loads(content: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
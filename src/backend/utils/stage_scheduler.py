@@ -0,0 +1,178 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from backend.utils.tracing import Tracer, get_default_tracer
+
+
+class PipelineStage:
+    """
+    One stage of a job pipeline.
+
+    Attributes:
+        name (str): Stage name, used in the timing breakdown.
+        run (Callable): Function (sync or async) called with the stage inputs as keyword arguments. It
+                        returns the value of its output, a tuple with one value per output, or nothing.
+        inputs (Tuple[str, ...]): Values the stage needs, produced by other stages (or given to `run`).
+        outputs (Tuple[str, ...]): Values the stage produces.
+        when (Optional[Callable]): Predicate called with the inputs; if it returns False the stage is
+                                   skipped and its outputs are None.
+    """
+
+    __slots__ = ("name", "run", "inputs", "outputs", "when")
+
+    def __init__(self, name: str, run: Callable[..., Any], inputs: Iterable[str] = (), outputs: Iterable[str] = (),
+                 when: Optional[Callable[..., bool]] = None):
+        self.name = name
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.when = when
+
+
+class StageStatus:
+    """Possible states of a stage after a run."""
+    SUCCEEDED = "ok"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+    BLOCKED = "blocked"
+
+
+class _UpstreamFailed(Exception):
+    """A stage could not run because a stage it depends on failed."""
+
+
+class StageScheduler:
+    """
+    Runs a dependency graph of PipelineStage objects on the event loop. A stage starts as soon as the
+    stages producing its inputs are done, so independent stages run concurrently. When a stage fails,
+    its dependents are not run, the rest finish, and the first error is raised.
+
+    Every run records a per-stage timing breakdown (start offset and duration in ms) in `timings`,
+    and every stage that runs is traced as a "stage.<name>" span, child of the span active at `run`.
+    """
+
+    def __init__(self, stages: Sequence[PipelineStage], tracer: Optional[Tracer] = None):
+        """
+        Build the graph.
+
+        :param stages: Stages of the pipeline, in any order.
+        :param tracer: Tracer of the stage spans. Defaults to the process-wide tracer.
+        :raises ValueError: If two stages share a name or an output, or the graph has a cycle.
+        """
+        self.tracer = tracer or get_default_tracer()
+        self.stages: Dict[str, PipelineStage] = {}
+        self.producers: Dict[str, str] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicated stage '{stage.name}'.")
+            self.stages[stage.name] = stage
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"'{output}' is produced by '{self.producers[output]}' and '{stage.name}'.")
+                self.producers[output] = stage.name
+        self.dependencies: Dict[str, List[str]] = {
+            name: list(dict.fromkeys(self.producers[value] for value in stage.inputs if value in self.producers))
+            for name, stage in self.stages.items()
+        }
+        self.order: List[str] = self._topological_order()
+        self.timings: List[Dict[str, Any]] = []
+
+    def _topological_order(self) -> List[str]:
+        pending = {name: len(dependencies) for name, dependencies in self.dependencies.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self.stages}
+        for name, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                dependents[dependency].append(name)
+        ready = [name for name, count in pending.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in dependents[name]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.stages):
+            raise ValueError(f"The stages have a dependency cycle: {sorted(set(self.stages) - set(order))}")
+        return order
+
+    async def run(self, initial: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Runs every stage.
+
+        :param initial: Values that are not produced by any stage.
+        :return: Dictionary with the initial values and every stage output.
+        :raises ValueError: If a stage input is neither produced by a stage nor given in `initial`.
+        :raises Exception: The error of the first stage (in graph order) that failed.
+        """
+        values: Dict[str, Any] = dict(initial or {})
+        missing = {value for stage in self.stages.values() for value in stage.inputs
+                   if value not in self.producers and value not in values}
+        if missing:
+            raise ValueError(f"Inputs not produced by any stage: {sorted(missing)}")
+
+        started = time.perf_counter()
+        records: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[str, asyncio.Future] = {}
+        for name in self.order:
+            dependencies = [tasks[dependency] for dependency in self.dependencies[name]]
+            tasks[name] = asyncio.ensure_future(self._run_stage(self.stages[name], dependencies, values, started, records))
+        try:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        finally:
+            self.timings = [records[name] for name in self.order if name in records]
+
+        for name in self.order:
+            task = tasks[name]
+            if task.cancelled():
+                raise asyncio.CancelledError()
+            error = task.exception()
+            if error is not None and not isinstance(error, _UpstreamFailed):
+                raise error
+        return values
+
+    async def _run_stage(self, stage: PipelineStage, dependencies: List[asyncio.Future], values: Dict[str, Any],
+                         started: float, records: Dict[str, Dict[str, Any]]) -> None:
+        if dependencies:
+            await asyncio.wait(dependencies)
+        begin = time.perf_counter()
+        record = records[stage.name] = {
+            "stage": stage.name, "status": StageStatus.SUCCEEDED,
+            "start_ms": round(1000 * (begin - started), 3), "duration_ms": 0.0,
+        }
+        if any(dependency.cancelled() or dependency.exception() is not None for dependency in dependencies):
+            record["status"] = StageStatus.BLOCKED
+            raise _UpstreamFailed(stage.name)
+
+        arguments = {name: values[name] for name in stage.inputs}
+        if stage.when is not None and not stage.when(**arguments):
+            record["status"] = StageStatus.SKIPPED
+            values.update(dict.fromkeys(stage.outputs))
+            return
+        try:
+            with self.tracer.start_span(f"stage.{stage.name}", {"pipeline.stage": stage.name}):
+                result = stage.run(**arguments)
+                if inspect.isawaitable(result):
+                    result = await result
+        except BaseException:
+            record["status"] = StageStatus.FAILED
+            raise
+        finally:
+            record["duration_ms"] = round(1000 * (time.perf_counter() - begin), 3)
+
+        if len(stage.outputs) == 1:
+            values[stage.outputs[0]] = result
+        elif stage.outputs:
+            if not isinstance(result, tuple) or len(result) != len(stage.outputs):
+                record["status"] = StageStatus.FAILED
+                raise ValueError(f"Stage '{stage.name}' must return a tuple with {list(stage.outputs)}.")
+            values.update(zip(stage.outputs, result))
+
+    def format_timings(self) -> str:
+        """Returns the timing breakdown of the last run as a text table."""
+        lines = [f"{'stage':<16} {'status':<8} {'start ms':>10} {'duration ms':>12}"]
+        for record in self.timings:
+            lines.append(f"{record['stage']:<16} {record['status']:<8} {record['start_ms']:>10.1f} {record['duration_ms']:>12.1f}")
+        return "\n".join(lines)
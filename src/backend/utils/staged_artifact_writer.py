@@ -0,0 +1,116 @@
+import logging
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StagedArtifactWriter:
+    """
+    Staging area for the files of one job. The writers (OutputSchemaWriter, RepJsonWriter, ConfWriter,
+    ModulePomGenerator) write into `staged_folder(...)` instead of the kirby tree, and `publish` moves
+    every staged file to its target with an atomic rename once the whole job succeeded. A job that
+    fails calls `discard` and leaves the target tree untouched.
+
+    The staging directory lives inside the target root, so the renames never cross filesystems.
+    Only the job's own files are made durable: every staged file is fsynced before the renames and
+    every target folder after them (os.sync would flush every filesystem of the host).
+    """
+
+    STAGING_DIR = ".staging"
+
+    def __init__(self, root_path: str):
+        """
+        Create the staging directory of a job.
+
+        :param root_path: Target root (the repository folder_path). Every published file must be inside it.
+        :raises OSError: If the staging directory cannot be created.
+        """
+        self.root_path = os.path.abspath(root_path)
+        self.staging_parent = os.path.join(self.root_path, self.STAGING_DIR)
+        os.makedirs(self.staging_parent, exist_ok=True)
+        self.staging_path: Optional[str] = tempfile.mkdtemp(prefix="job-", dir=self.staging_parent)
+        self.published: List[str] = []
+
+    def staged_folder(self, target_folder: str) -> str:
+        """
+        Returns (and creates) the staging folder of a target folder.
+
+        :param target_folder: Folder of the kirby tree, inside root_path.
+        :return: Path of the matching folder in the staging directory.
+        :raises ValueError: If the folder is outside root_path or the stage was already published or discarded.
+        """
+        if self.staging_path is None:
+            raise ValueError("The stage was already published or discarded.")
+        relative_path = os.path.relpath(os.path.abspath(target_folder), self.root_path)
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            raise ValueError(f"'{target_folder}' is outside of '{self.root_path}'.")
+        staged_path = os.path.normpath(os.path.join(self.staging_path, relative_path))
+        os.makedirs(staged_path, exist_ok=True)
+        return staged_path
+
+    def publish(self) -> List[str]:
+        """
+        Moves every staged file to its target with os.replace and removes the staging directory.
+        Target folders are created with exist_ok, so concurrent jobs on the same uuaa do not race.
+
+        :return: Target paths of the published files.
+        """
+        if self.staging_path is None:
+            raise ValueError("The stage was already published or discarded.")
+        folders, files = [], []
+        for current, _, file_names in os.walk(self.staging_path):
+            folders.append(os.path.relpath(current, self.staging_path))
+            files.extend(os.path.relpath(os.path.join(current, name), self.staging_path) for name in file_names)
+
+        if not files:
+            self.discard()
+            return self.published
+
+        # Los datos deben estar en disco antes de que el renombrado los haga visibles
+        for relative_path in files:
+            self._fsync_file(os.path.join(self.staging_path, relative_path))
+        for relative_path in folders:
+            os.makedirs(os.path.normpath(os.path.join(self.root_path, relative_path)), exist_ok=True)
+        for relative_path in files:
+            target_path = os.path.join(self.root_path, relative_path)
+            os.replace(os.path.join(self.staging_path, relative_path), target_path)
+            self.published.append(target_path)
+        # Y las entradas de directorio de los renombrados
+        for target_folder in sorted({os.path.dirname(target_path) for target_path in self.published}):
+            self._fsync_folder(target_folder)
+        logger.info("Artefactos publicados: %d", len(self.published))
+        self.discard()
+        return self.published
+
+    def discard(self) -> None:
+        """
+        Removes the staging directory of the job. The shared .staging folder is kept: removing it
+        would race with another job creating its own staging directory inside it.
+        """
+        if self.staging_path is None:
+            return
+        shutil.rmtree(self.staging_path, ignore_errors=True)
+        self.staging_path = None
+
+    @staticmethod
+    def _fsync_file(file_path: str) -> None:
+        # rb+: en Windows fsync necesita un descriptor con escritura
+        with open(file_path, "rb+") as file:
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def _fsync_folder(folder_path: str) -> None:
+        try:
+            descriptor = os.open(folder_path, os.O_RDONLY)
+        except OSError:
+            # Windows no permite abrir directorios: NTFS ya registra los renombrados
+            return
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
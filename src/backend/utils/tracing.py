@@ -0,0 +1,192 @@
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # Optional: spans are only kept in process
+    otel_trace = None
+
+
+class SpanStatus:
+    """Status codes of a span (same values as OpenTelemetry StatusCode)."""
+    UNSET = "UNSET"
+    OK = "OK"
+    ERROR = "ERROR"
+
+
+class Span:
+    """
+    A timed operation of a job (the job itself, a pipeline stage, an LLM request...).
+
+    Identifiers and fields follow the OpenTelemetry data model: a 32 hex digit trace_id shared by
+    every span of a job, a 16 hex digit span_id, the parent span_id, unix nanosecond timestamps,
+    attributes and a status. `to_dict` returns the OTLP JSON field names.
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "start_time_unix_nano", "end_time_unix_nano",
+                 "attributes", "status", "status_description", "_started", "_otel_span")
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = SpanStatus.UNSET
+        self.status_description: Optional[str] = None
+        self._started = time.perf_counter_ns()
+        self._otel_span = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+        if self._otel_span is not None and isinstance(value, (str, bool, int, float)):
+            self._otel_span.set_attribute(key, value)
+
+    def record_exception(self, error: BaseException) -> None:
+        """Marks the span as failed."""
+        self.status = SpanStatus.ERROR
+        self.status_description = f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        if self.end_time_unix_nano is None:
+            self.end_time_unix_nano = self.start_time_unix_nano + time.perf_counter_ns() - self._started
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.end_time_unix_nano is None:
+            return None
+        return (self.end_time_unix_nano - self.start_time_unix_nano) / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_time_unix_nano,
+            "endTimeUnixNano": self.end_time_unix_nano,
+            "attributes": dict(self.attributes),
+            "status": {"code": self.status, "message": self.status_description},
+        }
+
+    def __repr__(self) -> str:
+        return f"Span(name={self.name!r}, trace_id={self.trace_id!r}, span_id={self.span_id!r}, status={self.status!r})"
+
+
+class InMemorySpanExporter:
+    """
+    Keeps finished spans in memory (the most recent `max_spans`). The worker takes the spans of each
+    job with `pop_trace` to build its metrics; tests read them with `get_finished_spans`.
+    """
+
+    def __init__(self, max_spans: int = 10000):
+        self._spans: "deque[Span]" = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def pop_trace(self, trace_id: str) -> List[Span]:
+        """Returns and removes the finished spans of a trace."""
+        with self._lock:
+            spans = [span for span in self._spans if span.trace_id == trace_id]
+            if spans:
+                self._spans = deque((span for span in self._spans if span.trace_id != trace_id), maxlen=self._spans.maxlen)
+            return spans
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Returns the active span of the current task or thread (asyncio.to_thread keeps it), or None."""
+    return _current_span.get()
+
+
+def set_current_span_attribute(key: str, value: Any) -> None:
+    """Sets an attribute on the active span, if there is one."""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attribute(key, value)
+
+
+class Tracer:
+    """
+    Creates spans and hands the finished ones to the exporters. The active span is kept in a
+    contextvar, so spans opened inside a stage, a thread of asyncio.to_thread or a task created
+    from it get the right parent.
+
+    When the opentelemetry package is installed every span is mirrored to an OpenTelemetry span, so a
+    configured OpenTelemetry SDK (e.g. with an OTLP exporter) receives the same traces.
+    """
+
+    def __init__(self, exporters: Sequence[Any] = (), instrumentation_name: str = "kirby_generator"):
+        """
+        :param exporters: Objects with an `export(span)` method, e.g. InMemorySpanExporter.
+        :param instrumentation_name: Name of the OpenTelemetry tracer.
+        """
+        self.exporters = list(exporters)
+        self._otel_tracer = otel_trace.get_tracer(instrumentation_name) if otel_trace is not None else None
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        """
+        Opens a span as child of the active one (or a new trace) and makes it the active span.
+        An exception leaving the block marks the span as failed and is re-raised.
+        """
+        parent = _current_span.get()
+        span = Span(name, parent.trace_id if parent is not None else os.urandom(16).hex(),
+                    parent.span_id if parent is not None else None, attributes)
+        with ExitStack() as stack:
+            if self._otel_tracer is not None:
+                otel_attributes = {key: value for key, value in span.attributes.items()
+                                   if isinstance(value, (str, bool, int, float))}
+                span._otel_span = stack.enter_context(
+                    self._otel_tracer.start_as_current_span(name, attributes=otel_attributes))
+            token = _current_span.set(span)
+            try:
+                yield span
+                if span.status == SpanStatus.UNSET:
+                    span.status = SpanStatus.OK
+            except BaseException as e:
+                span.record_exception(e)
+                raise
+            finally:
+                span.end()
+                _current_span.reset(token)
+                for exporter in self.exporters:
+                    exporter.export(span)
+
+
+_default_tracer: Optional[Tracer] = None
+
+
+def get_default_tracer() -> Tracer:
+    """Returns the process-wide tracer, creating one without exporters if the worker did not set it."""
+    global _default_tracer
+    if _default_tracer is None:
+        _default_tracer = Tracer()
+    return _default_tracer
+
+
+def set_default_tracer(tracer: Tracer) -> None:
+    """Sets the process-wide tracer. Called by the worker at startup."""
+    global _default_tracer
+    _default_tracer = tracer
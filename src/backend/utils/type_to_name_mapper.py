@@ -1,5 +1,7 @@
 from typing import Dict, Tuple, List
 
+from backend.utils.schema_reader import SchemaModel
+
 
 class TypeToNameMapper:
     """
@@ -12,7 +14,7 @@ class TypeToNameMapper:
         Initialize the mapper with the given schema.
 
         Args:
-            schema (Dict): The JSON schema containing the fields.
+            schema (Dict): The JSON schema containing the fields, or its compiled SchemaModel.
         """
         self.schema = schema
 
@@ -24,6 +26,10 @@ class TypeToNameMapper:
             Dict[str, Tuple[str]]: A dictionary where the key is the type
             and the value is a tuple of field names.
         """
+        if isinstance(self.schema, SchemaModel):
+            # Precomputed when the schema was compiled
+            return dict(self.schema.fields_by_type)
+
         type_to_name_mapping: Dict[str, List[str]] = {}
 
         # Process each field in the schema
@@ -0,0 +1,170 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.csv_decimal_validator import CSVDecimalValidator, DecimalFieldStats, DecimalScanState
+from backend.utils.data_formater_detector import DateFormatDetector
+from backend.utils.file_analyzer import FileAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class VectorizedProfiler:
+    """
+    Column-oriented profiling of the decimal and date fields of a CSV sample.
+
+    Only the decimal and date columns of `grouped_fields` are read (chunked `pd.read_csv` with `usecols`),
+    and every check runs over whole columns with pandas string methods and NumPy operations instead
+    of per-cell Python loops. The decimal result has the same format as CSVDecimalValidator.analyze_csv.
+    """
+
+    def __init__(self, csv_path: str, grouped_fields: Dict[str, Tuple[str]], delimiter: Optional[str] = None,
+                 chunk_size: int = 500_000, max_rows: Optional[int] = None, early_stop: bool = False,
+                 min_values: int = CSVDecimalValidator.DEFAULT_MIN_VALUES,
+                 confidence: float = CSVDecimalValidator.DEFAULT_CONFIDENCE,
+                 date_formats: Optional[List[dict]] = None):
+        """
+        Initialize the VectorizedProfiler.
+
+        Args:
+            csv_path (str): Path to the CSV file.
+            grouped_fields (Dict[str, Tuple[str]]): Field names grouped by data type (TypeToNameMapper output).
+            delimiter (Optional[str]): Delimiter of the file (the one of the dialect stage). Detected with
+                                       FileAnalyzer.sniff when not given.
+            chunk_size (int): Rows per chunk.
+            max_rows (Optional[int]): Maximum number of rows read. None reads the whole file.
+            early_stop (bool): Stop after the first chunk in which every decimal field is settled.
+            min_values (int): Values per field required before stopping early.
+            confidence (float): Confidence required to consider a field settled.
+            date_formats (Optional[List[dict]]): Candidate date formats, DateFormatDetector defaults if not given.
+        """
+        self.csv_path = csv_path
+        self.grouped_fields = grouped_fields
+        self.delimiter = delimiter or self._sniff_delimiter(csv_path)
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+        self.early_stop = early_stop
+        self.min_values = min_values
+        self.confidence = confidence
+        self.date_formats = date_formats or DateFormatDetector().get_formats()
+
+        self.decimal_places = {
+            field: decimal_places
+            for fields, decimal_places in CSVDecimalValidator.get_decimal_fields(grouped_fields).values()
+            for field in fields
+        }
+        self.date_fields = list(grouped_fields.get("date", ()))
+
+    @staticmethod
+    def _sniff_delimiter(csv_path: str) -> str:
+        dialect = FileAnalyzer(csv_path).sniff()
+        return dialect.delimiter if dialect is not None else ","
+
+    def profile(self, include_dates: bool = True) -> Dict[str, Any]:
+        """
+        Profiles the decimal and date columns.
+
+        Args:
+            include_dates (bool): Also match the date columns against the candidate formats. With False the
+                                  date columns are not read and "date_formats" is empty.
+
+        Returns:
+            Dict[str, Any]: {"decimal_analysis": <analyze_csv format>,
+                             "date_formats": {field: {"format", "confidence", "values"}}}
+        """
+        header = pd.read_csv(self.csv_path, sep=self.delimiter, nrows=0).columns
+        decimal_fields = [field for field in self.decimal_places if field in header]
+        date_fields = [field for field in self.date_fields if field in header] if include_dates else []
+
+        missing_fields = [field for field in self.decimal_places if field not in header]
+        if missing_fields:
+            logger.warning("The following fields are missing in the CSV file: %s", missing_fields)
+
+        state = DecimalScanState()
+        date_matches = {field: np.zeros(len(self.date_formats), dtype=np.int64) for field in date_fields}
+        date_values = dict.fromkeys(date_fields, 0)
+
+        usecols = list(dict.fromkeys(decimal_fields + date_fields))
+        if not usecols:
+            return {"decimal_analysis": state.result(), "date_formats": {}}
+
+        reader = pd.read_csv(
+            self.csv_path, sep=self.delimiter, usecols=usecols, dtype=str, keep_default_na=False,
+            chunksize=self.chunk_size, nrows=self.max_rows, engine="c",
+        )
+        with reader:
+            for chunk in reader:
+                state.rows_scanned += len(chunk)
+                for field in decimal_fields:
+                    stats = state.fields.get(field)
+                    if stats is None:
+                        stats = state.fields[field] = DecimalFieldStats()
+                    self._update_decimal_stats(stats, chunk[field], self.decimal_places[field])
+                for field in date_fields:
+                    date_values[field] += self._update_date_matches(date_matches[field], chunk[field])
+
+                if self.early_stop and state.is_settled(decimal_fields, self.min_values, self.confidence):
+                    state.stopped_early = True
+                    break
+
+        return {
+            "decimal_analysis": state.result(),
+            "date_formats": {
+                field: self._best_date_format(date_matches[field], date_values[field]) for field in date_fields
+            },
+        }
+
+    def analyze_decimals(self) -> Dict[str, Any]:
+        """Same result as CSVDecimalValidator.analyze_csv. The date columns are not read."""
+        return self.profile(include_dates=False)["decimal_analysis"]
+
+    @staticmethod
+    def _update_decimal_stats(stats: DecimalFieldStats, column: pd.Series, decimal_places: int) -> None:
+        # Fixed-width unicode array: the np.char operations run in C over the whole column
+        values = np.char.strip(column.to_numpy(dtype=str))
+        lengths = np.char.str_len(values)
+        non_empty = lengths > 0
+        if not non_empty.any():
+            return
+        values, lengths = values[non_empty], lengths[non_empty]
+
+        comma_position = np.char.rfind(values, ",")
+        dot_position = np.char.rfind(values, ".")
+
+        # The rightmost separator is the decimal symbol
+        symbol_position = np.maximum(comma_position, dot_position)
+        has_symbol = symbol_position >= 0
+        scale_violations = has_symbol & (lengths - symbol_position - 1 != decimal_places)
+
+        stats.values += len(values)
+        stats.with_comma += int(np.count_nonzero(comma_position >= 0))
+        stats.with_dot += int(np.count_nonzero(dot_position >= 0))
+        stats.symbols[","] += int(np.count_nonzero(comma_position > dot_position))
+        stats.symbols["."] += int(np.count_nonzero(dot_position > comma_position))
+        stats.scale_violations += int(np.count_nonzero(scale_violations))
+
+    def _update_date_matches(self, matches: np.ndarray, column: pd.Series) -> int:
+        # Date columns repeat few distinct values: each format is checked once per distinct value
+        # and the matches are weighted by how often the value appears.
+        counts = column.value_counts(sort=False)
+        counts = counts.groupby(counts.index.str.strip()).sum()
+        counts = counts[counts.index.str.len() > 0]
+        if counts.empty:
+            return 0
+        frequencies = counts.to_numpy()
+        for index, date_format in enumerate(self.date_formats):
+            parsed = pd.to_datetime(counts.index, format=date_format["pattern"], errors="coerce")
+            matches[index] += int(frequencies[~parsed.isna()].sum())
+        return int(frequencies.sum())
+
+    def _best_date_format(self, matches: np.ndarray, values: int) -> Dict[str, Any]:
+        if not values or not matches.any():
+            return {"format": None, "confidence": 0.0, "values": values}
+        best = int(np.argmax(matches))
+        return {
+            "format": self.date_formats[best]["human_readable"],
+            "confidence": round(float(matches[best]) / values, 4),
+            "values": values,
+        }
@@ -0,0 +1,102 @@
+"""
+Benchmark: records/sec profiling an Avro sample.
+
+Compares the record-by-record fastavro.reader loop of DecimalFieldChecker with AvroSampleProfiler
+decoding the whole file in-process and across a process pool, plus the default early-stop run.
+
+Run from the `src` folder:
+    python -m benchmarks.bench_avro_profiling [--records 2000000] [--workers 4]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fastavro
+
+from backend.utils.avro_profiler import AvroSampleProfiler
+from backend.utils.decimal_field_checker_avro import DecimalFieldChecker
+
+SCHEMA = {
+    "type": "record",
+    "name": "t_bench",
+    "namespace": "benchmarks",
+    "fields": [
+        {"name": "contract_id", "type": "string"},
+        {"name": "product_desc", "type": "string"},
+        {"name": "limit_amount", "type": "string"},
+        {"name": "balance_amount", "type": "string"},
+        {"name": "opening_date", "type": "string"},
+        {"name": "branch_number", "type": "int"},
+    ],
+}
+GROUPED_FIELDS = {
+    "string": ("contract_id", "product_desc"),
+    "decimal(17,6)": ("limit_amount",),
+    "decimal(20,2)": ("balance_amount",),
+    "date": ("opening_date",),
+    "int32": ("branch_number",),
+}
+
+
+def _records(count: int):
+    generator = random.Random(0)
+    for index in range(count):
+        yield {
+            "contract_id": f"C{index:010d}",
+            "product_desc": f"producto {index % 97}",
+            "limit_amount": f"{generator.randint(0, 99999)},{generator.randint(0, 999999):06d}",
+            "balance_amount": f"{generator.randint(0, 9999999)},{generator.randint(0, 99):02d}",
+            "opening_date": f"{generator.randint(1, 28):02d}/{generator.randint(1, 12):02d}/20{generator.randint(10, 24)}",
+            "branch_number": generator.randint(1, 999),
+        }
+
+
+def _measure(label: str, records: int, run) -> None:
+    start = time.perf_counter()
+    scanned = run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.2f} s  {scanned:>10,} records  {scanned / elapsed:12,.0f} records/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sample.avro")
+        with open(path, "wb") as file:
+            fastavro.writer(file, fastavro.parse_schema(SCHEMA), _records(args.records), codec="deflate")
+        print(f"Synthetic file: {args.records:,} records, {os.path.getsize(path) / 2 ** 20:,.0f} MiB")
+
+        def legacy() -> int:
+            # Same loop as DecimalFieldChecker without its comma-and-dot exit, to scan the whole file
+            checker = DecimalFieldChecker(path, GROUPED_FIELDS)
+            fields = checker._get_decimal_fields()
+            count = 0
+            with open(path, "rb") as avro_file:
+                for record in fastavro.reader(avro_file):
+                    count += 1
+                    for field in fields:
+                        value = record[field]
+                        _ = "," in value, "." in value
+            return count
+
+        _measure("fastavro.reader loop", args.records, legacy)
+        _measure("profiler, in-process", args.records, lambda: AvroSampleProfiler(
+            path, GROUPED_FIELDS, max_decimal_records=args.records, early_stop=False).profile().records_read)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            # Warm the pool so process start-up is not measured
+            list(pool.map(abs, range(args.workers)))
+            _measure(f"profiler, {args.workers} workers", args.records, lambda: AvroSampleProfiler(
+                path, GROUPED_FIELDS, max_decimal_records=args.records, early_stop=False).profile(pool).records_read)
+            _measure("profiler, early stop", args.records, lambda: AvroSampleProfiler(
+                path, GROUPED_FIELDS).profile(pool).records_read)
+
+
+if __name__ == "__main__":
+    main()
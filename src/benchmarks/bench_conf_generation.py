@@ -0,0 +1,98 @@
+"""
+Benchmark: .conf generation latency, deterministic HoconTemplateRenderer vs the LLM path.
+
+The LLM path is only measured when OPENAI_API_KEY is set; otherwise only the prompt size is reported.
+Model calls (bypass_cache=True) and response cache hits are reported separately.
+
+Run from the `src` folder:
+    python -m benchmarks.bench_conf_generation
+"""
+import asyncio
+import os
+import statistics
+import time
+
+from backend.utils.file_io import FileIO as fio
+from backend.utils.hocon_template_renderer import HoconTemplateRenderer
+
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend", "resources")
+RENDER_ROUNDS = 1000
+LLM_ROUNDS = 3
+
+PARAMETERS = {
+    "castmode": "notPermissive",
+    "input_mode": "FAILFAST",
+    "input_path": "/data/raw/csan/data/t_csan_vivienda_vis",
+    "code_schema": "co",
+    "reprocess_status": True,
+    "uuaa": "csan",
+    "database": "master",
+    "tabla": "t_csan_vivienda_vis",
+    "partitions": "cutoff_date",
+    "physicalPath": "/data/master/csan/data/t_csan_vivienda_vis",
+    "found_comma": True,
+    "found_dot": True,
+    "decimal_symbol": ",",
+}
+GROUPED_FIELDS = {
+    "string": ("contract_id", "subproduct_product_concat_id", "uvr_credit_type"),
+    "decimal(17,6)": ("limit_amount", "lcl_ccy_total_punctual_amount"),
+    "decimal(20,9)": ("final_interest_per", "fs_bf_tae_int_mrgn_new_amount"),
+    "int32": ("contract_duration_number",),
+    "date": ("cutoff_date", "contract_register_date", "current_expiry_date"),
+    "timestamp": ("audit_date",),
+}
+DATE_FORMAT_DICT = {"input_date_format": "dd-MM-yyyy", "output_date_format": "yyyy-MM-dd"}
+
+
+def _read(*parts: str) -> str:
+    return fio.read_txt(os.path.join(RESOURCES_DIR, *parts))
+
+
+def bench_renderer(template: str) -> list:
+    latencies = []
+    for _ in range(RENDER_ROUNDS):
+        start = time.perf_counter()
+        HoconTemplateRenderer("master", PARAMETERS, GROUPED_FIELDS, DATE_FORMAT_DICT).render(template)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def bench_llm(template: str, rules: str, example: str, api_key: str, bypass_cache: bool) -> list:
+    from backend.openai_langchain.ai_conf_generator import AIConfGenerator
+
+    generator = AIConfGenerator(api_key=api_key)
+    latencies = []
+    for _ in range(LLM_ROUNDS):
+        start = time.perf_counter()
+        await generator.afill_template("master", template, PARAMETERS, rules, example, DATE_FORMAT_DICT, GROUPED_FIELDS,
+                                       bypass_cache=bypass_cache)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label: str, latencies: list) -> None:
+    print(f"{label:<10} mean={statistics.mean(latencies):10.3f} ms  p50={statistics.median(latencies):10.3f} ms")
+
+
+def main():
+    template = _read("templates", "master_config_template.conf")
+    rules = _read("rules", "master_conf_rules.txt")
+    example = _read("examples", "master_config.conf")
+
+    _report("renderer", bench_renderer(template))
+
+    prompt_chars = len(template) + len(rules) + len(example) + len(str(PARAMETERS)) + len(str(GROUPED_FIELDS))
+    print(f"LLM prompt size: ~{prompt_chars} chars")
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if api_key:
+        # bypass_cache=True llama siempre al modelo (y deja la respuesta en caché para la segunda serie)
+        _report("llm", asyncio.run(bench_llm(template, rules, example, api_key, bypass_cache=True)))
+        _report("llm-cache", asyncio.run(bench_llm(template, rules, example, api_key, bypass_cache=False)))
+    else:
+        print("OPENAI_API_KEY not set, skipping the LLM path.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: per-job AzureChatOpenAI clients vs the shared LLMClientRegistry client.
+
+Runs offline against a local stub of the Azure OpenAI chat completions endpoint.
+
+Run from the `src` folder:
+    python -m benchmarks.bench_llm_client_reuse
+"""
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_openai.chat_models import AzureChatOpenAI
+
+from backend.openai_langchain.llm_client_registry import LLMClientRegistry
+
+CALLS = 50
+CONCURRENCY = 8
+STUB_RESPONSE = json.dumps({
+    "id": "stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": LLMClientRegistry.DEFAULT_MODEL,
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "```hocon\nkirby {}\n```"},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}).encode("utf-8")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(STUB_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_stub() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _run(get_client) -> list:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def call(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await get_client().ainvoke(f"prompt {index}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(call(index) for index in range(CALLS)))
+    return latencies
+
+
+def _report(label: str, latencies: list, elapsed: float) -> None:
+    print(
+        f"{label:<10} total={elapsed:8.1f} ms  mean={statistics.mean(latencies):7.2f} ms  "
+        f"p50={statistics.median(latencies):7.2f} ms"
+    )
+
+
+async def main_async():
+    server = _start_stub()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def per_job_client():
+        return AzureChatOpenAI(
+            openai_api_key="stub",
+            azure_endpoint=endpoint,
+            api_version=LLMClientRegistry.DEFAULT_API_VERSION,
+            model=LLMClientRegistry.DEFAULT_MODEL,
+            temperature=0,
+        )
+
+    start = time.perf_counter()
+    latencies = await _run(per_job_client)
+    _report("per-job", latencies, (time.perf_counter() - start) * 1000)
+
+    # The stub speaks plain HTTP/1.1, so HTTP/2 is disabled here
+    registry = LLMClientRegistry(azure_endpoint=endpoint, max_concurrency=CONCURRENCY, http2=False)
+    start = time.perf_counter()
+    latencies = await _run(lambda: registry.get_client("stub"))
+    _report("registry", latencies, (time.perf_counter() - start) * 1000)
+
+    await registry.aclose()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
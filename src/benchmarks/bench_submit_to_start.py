@@ -0,0 +1,80 @@
+"""
+Benchmark: latency from /run_process submission until the worker starts the job.
+
+Compares the legacy worker (new client per iteration, polling /get_params every second)
+against the long-polling worker with one persistent client.
+
+Run from the `src` folder:
+    python -m benchmarks.bench_submit_to_start
+"""
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from backend.endpoints.parameters_api import app
+
+BASE_URL = "http://testserver"
+JOBS = 10
+
+
+def _transport() -> httpx.ASGITransport:
+    return httpx.ASGITransport(app=app)
+
+
+async def _legacy_worker(received: asyncio.Queue, stop: asyncio.Event) -> None:
+    """Reproduces the old loop: a brand-new client and one poll per second."""
+    while not stop.is_set():
+        async with httpx.AsyncClient(transport=_transport(), base_url=BASE_URL) as client:
+            response = await client.get("/get_params", params={"timeout": 0})
+            parameters = response.json()
+            if "message" not in parameters:
+                await received.put((parameters, time.perf_counter()))
+        await asyncio.sleep(1)
+
+
+async def _long_poll_worker(received: asyncio.Queue, stop: asyncio.Event) -> None:
+    """Current loop: one persistent client blocked on /get_params."""
+    async with httpx.AsyncClient(transport=_transport(), base_url=BASE_URL) as client:
+        while not stop.is_set():
+            response = await client.get("/get_params", params={"timeout": 1.0})
+            parameters = response.json()
+            if "message" not in parameters:
+                await received.put((parameters, time.perf_counter()))
+
+
+async def _measure(worker) -> list:
+    received: asyncio.Queue = asyncio.Queue()
+    stop = asyncio.Event()
+    worker_task = asyncio.create_task(worker(received, stop))
+    latencies = []
+
+    async with httpx.AsyncClient(transport=_transport(), base_url=BASE_URL) as client:
+        for job in range(JOBS):
+            # Spread submissions so they land at different points of the poll interval
+            await asyncio.sleep(0.37)
+            submitted_at = time.perf_counter()
+            await client.post("/run_process", json={"job": job})
+            _, started_at = await received.get()
+            latencies.append((started_at - submitted_at) * 1000)
+
+    stop.set()
+    await worker_task
+    return latencies
+
+
+def _report(label: str, latencies: list) -> None:
+    print(
+        f"{label:<12} mean={statistics.mean(latencies):8.2f} ms  "
+        f"p50={statistics.median(latencies):8.2f} ms  max={max(latencies):8.2f} ms"
+    )
+
+
+async def main_async():
+    _report("polling", await _measure(_legacy_worker))
+    _report("long-poll", await _measure(_long_poll_worker))
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
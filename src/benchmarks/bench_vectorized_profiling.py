@@ -0,0 +1,74 @@
+"""
+Benchmark: rows/sec of the row-by-row CSVDecimalValidator vs the column-oriented VectorizedProfiler.
+
+Generates a synthetic CSV (10M rows by default) with decimal, date and string columns and scans
+all of it with both engines.
+
+Run from the `src` folder:
+    python -m benchmarks.bench_vectorized_profiling [--rows 10000000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from backend.utils.csv_decimal_validator import CSVDecimalValidator
+from backend.utils.vectorized_profiler import VectorizedProfiler
+
+GROUPED_FIELDS = {
+    "string": ("contract_id", "product_desc"),
+    "decimal(17,6)": ("limit_amount",),
+    "decimal(20,2)": ("balance_amount",),
+    "date": ("opening_date",),
+}
+HEADER = "contract_id;product_desc;limit_amount;balance_amount;opening_date\n"
+
+
+def _write_sample(path: str, rows: int) -> None:
+    generator = random.Random(0)
+    batch = []
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(HEADER)
+        for index in range(rows):
+            batch.append(
+                f"C{index:010d};producto {index % 97};{generator.randint(0, 99999)},{generator.randint(0, 999999):06d};"
+                f"{generator.randint(0, 9999999)},{generator.randint(0, 99):02d};"
+                f"{generator.randint(1, 28):02d}/{generator.randint(1, 12):02d}/20{generator.randint(10, 24)}\n"
+            )
+            if len(batch) == 100_000:
+                file.writelines(batch)
+                batch.clear()
+        file.writelines(batch)
+
+
+def _measure(label: str, rows: int, analyze) -> None:
+    start = time.perf_counter()
+    result = analyze()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<12} {elapsed:8.2f} s  {rows / elapsed:12,.0f} rows/s  "
+        f"decimal_symbol={result['decimal_symbol']} correct_data={result['correct_data']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sample.csv")
+        start = time.perf_counter()
+        _write_sample(path, args.rows)
+        print(f"Synthetic file: {args.rows:,} rows, {os.path.getsize(path) / 2 ** 20:,.0f} MiB "
+              f"({time.perf_counter() - start:.1f} s)")
+
+        _measure("row-by-row", args.rows, lambda: CSVDecimalValidator(
+            path, GROUPED_FIELDS, strategy=CSVDecimalValidator.FULL).analyze_csv())
+        _measure("vectorized", args.rows, lambda: VectorizedProfiler(
+            path, GROUPED_FIELDS, delimiter=";").analyze_decimals())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,22 @@ import subprocess
 import time
 import asyncio
 import httpx
+import logging
 import os
 from dotenv import load_dotenv
 from backend.utils.parameters_processor2 import ParameterProcessor
+from backend.utils.batch_processor import BatchProcessor
+from backend.openai_langchain.llm_client_registry import LLMClientRegistry, set_default_registry
+from backend.openai_langchain.prompt_builder import load_encoding
+from backend.utils.resource_registry import ResourceRegistry, set_default_registry as set_default_resource_registry
+from backend.utils.logging_config import configure_logging
+from backend.utils.metrics import job_observations
+from backend.utils.tracing import InMemorySpanExporter, Tracer, get_default_tracer, set_default_tracer
+
+logger = logging.getLogger(__name__)
+
+# Spans terminados de cada trabajo; el worker los resume en las métricas que envía con el resultado
+span_exporter = InMemorySpanExporter()
 
 """
 async def get_status():
@@ -18,35 +31,107 @@ async def get_parameters():
         return response.json()
 """
 
-async def wait_for_parameters():
+API_URL = "http://localhost:5000"
+GET_PARAMS_URL = f"{API_URL}/get_params"
+JOB_RESULT_URL = API_URL + "/jobs/{job_id}/result"
+JOB_PROGRESS_URL = API_URL + "/jobs/{job_id}/progress"
+JOB_HEARTBEAT_URL = API_URL + "/jobs/{job_id}/heartbeat"
+
+# Debe coincidir con LONG_POLL_TIMEOUT de parameters_api
+LONG_POLL_TIMEOUT = 25.0
+
+# Segundos entre heartbeats hasta conocer el JOB_RUNNING_TIMEOUT de la API (1800 / 3)
+DEFAULT_HEARTBEAT_INTERVAL = 600.0
+
+# Número de trabajos que se procesan en paralelo (variable de entorno WORKER_POOL_SIZE)
+DEFAULT_WORKER_POOL_SIZE = 4
+
+def build_http_client(pool_size: int) -> httpx.AsyncClient:
+    """Creates the persistent, pooled client shared by every worker for its whole lifetime."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=pool_size * 2, max_keepalive_connections=pool_size * 2),
+        timeout=httpx.Timeout(5.0, read=LONG_POLL_TIMEOUT + 5.0),
+    )
+
+async def report_job_result(client: httpx.AsyncClient, job_id: str, report: dict):
+    """Sends the outcome of a job back to the API."""
+    try:
+        response = await client.post(JOB_RESULT_URL.format(job_id=job_id), json=report)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning("No se pudo reportar el resultado del job %s: %s", job_id, e)
+
+async def report_job_progress(client: httpx.AsyncClient, job_id: str, key: str, entry: dict):
+    """Sends the progress of one table of a batch back to the API."""
+    try:
+        response = await client.post(JOB_PROGRESS_URL.format(job_id=job_id), json={**entry, "key": key})
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning("No se pudo reportar el progreso del job %s: %s", job_id, e)
 
-    GET_PARAMS_URL = "http://localhost:5000/get_params"
+async def send_heartbeats(client: httpx.AsyncClient, job_id: str):
+    """
+    Renews the lease of a running job until cancelled, so a job that runs longer than the
+    JOB_RUNNING_TIMEOUT of the API is not requeued to another worker. The first heartbeat returns
+    the timeout; the next ones are sent every timeout/3.
+    """
+    interval = DEFAULT_HEARTBEAT_INTERVAL
+    while True:
+        try:
+            response = await client.post(JOB_HEARTBEAT_URL.format(job_id=job_id))
+            response.raise_for_status()
+            running_timeout = response.json().get("running_timeout")
+            if running_timeout:
+                interval = running_timeout / 3
+        except httpx.HTTPError as e:
+            logger.warning("No se pudo enviar el heartbeat del job %s: %s", job_id, e)
+        await asyncio.sleep(interval)
+
+async def wait_for_parameters(client: httpx.AsyncClient, worker_id: int, api_key: str):
 
     while True:
-        async with httpx.AsyncClient() as client:
+        try:
+            # Long polling: la API responde en cuanto llega un trabajo a /run_process
+            response = await client.get(GET_PARAMS_URL, params={"timeout": LONG_POLL_TIMEOUT})
+            response.raise_for_status()
+            parameters = response.json()
+        except httpx.HTTPError as e:
+            logger.warning("Error al conectar con el servidor: %s", e)
+            await asyncio.sleep(1)  # Espera antes de reintentar si la API no está disponible
+            continue
+
+        if "message" in parameters:
+            continue
+
+        job_id = parameters.pop("job_id")
+        logger.info("Worker %d - Job %s - Parameters received", worker_id, job_id, extra={"job_id": job_id})
+        logger.debug("Job %s parameters: %s", job_id, parameters)
+
+        kind = "batch" if "tables" in parameters else "process"
+        heartbeat = asyncio.create_task(send_heartbeats(client, job_id))
+        with get_default_tracer().start_span("job", {"job.id": job_id, "job.kind": kind, "worker.id": worker_id}) as job_span:
             try:
-                response = await client.get(GET_PARAMS_URL, timeout=5.0)
-                response.raise_for_status()
-                parameters = response.json()
-
-                if "message" in parameters:
-                    print("No se han recibido parámetros aún.")
+                if kind == "batch":
+                    # Batch de /run_batch: varias tablas en un único trabajo, progreso por tabla
+                    async def report_progress(key, entry, job_id=job_id):
+                        await report_job_progress(client, job_id, key, entry)
+                    result = await BatchProcessor(parameters, api_key, report_progress).process()
                 else:
-                    print(f"Parameters received: {parameters}")
-
                     # Crear una instancia de ParameterProcessor
-                    load_dotenv()
-                    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-                    processor = ParameterProcessor(parameters, OPENAI_API_KEY)
+                    processor = ParameterProcessor(parameters, api_key)
 
-                    # Llamar al método asíncrono `process` para procesar los parámetroscls
-                    await processor.process_parameters()
-                
-                await asyncio.sleep(1)  # Espera antes de la próxima verificación
+                    # Llamar al método asíncrono `process` para procesar los parámetros
+                    result = await processor.process_parameters()
+                report = {"success": True, "result": result}
+            except Exception as e:
+                logger.exception("Worker %d - Job %s failed", worker_id, job_id, extra={"job_id": job_id})
+                job_span.record_exception(e)
+                report = {"success": False, "error": str(e)}
+            finally:
+                heartbeat.cancel()
 
-            except httpx.RequestError as e:
-                #pass
-                print(f"Error al conectar con el servidor: {e}")
+        report["metrics"] = job_observations(span_exporter.pop_trace(job_span.trace_id))
+        await report_job_result(client, job_id, report)
 
 
     """
@@ -71,14 +156,40 @@ async def wait_for_parameters():
     """
 
 async def main_async():
-    # Ejecuta la función que espera los parámetros en un ciclo continuo
-    await wait_for_parameters()
+    load_dotenv()
+    # LOG_LEVEL (INFO por defecto) y LOG_FORMAT=json para una línea JSON por evento
+    configure_logging()
+    set_default_tracer(Tracer([span_exporter]))
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    pool_size = int(os.getenv("WORKER_POOL_SIZE", DEFAULT_WORKER_POOL_SIZE))
+
+    # Plantillas, reglas y ejemplos cargados una sola vez (RESOURCES_HOT_RELOAD=true recarga los modificados)
+    set_default_resource_registry(ResourceRegistry.from_env().load())
+
+    # Clientes de Azure OpenAI compartidos por todos los trabajos del worker
+    llm_registry = LLMClientRegistry.from_env()
+    set_default_registry(llm_registry)
+
+    # Codificación de tiktoken para contar los tokens del prompt: puede descargarse de la red, así que se
+    # carga una vez en segundo plano y no en cada trabajo (sin ella se estiman los tokens)
+    encoding_task = asyncio.create_task(asyncio.to_thread(load_encoding))
+
+    # Pool de workers que esperan trabajos en un ciclo continuo
+    try:
+        async with build_http_client(pool_size) as client:
+            await asyncio.gather(*(
+                wait_for_parameters(client, worker_id, OPENAI_API_KEY)
+                for worker_id in range(pool_size)
+            ))
+    finally:
+        encoding_task.cancel()
+        await llm_registry.aclose()
 
 def main():
     # Inicia el servicio de API usando Uvicorn en un subproceso
     print("Starting API service with Uvicorn...")
     api_process = subprocess.Popen(
-        ["uvicorn", "src.backend.endpoints.parameters_api:app", "--reload", "--host", "localhost", "--port", "5000"]#, "--log-level", "warning"]
+        ["uvicorn", "backend.endpoints.parameters_api:app", "--app-dir", "src", "--reload", "--host", "localhost", "--port", "5000"]#, "--log-level", "warning"]
     )
     time.sleep(1)  # Pausa para dar tiempo a que la API se inicialice
 
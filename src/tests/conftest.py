@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos se importan como backend.*, igual que al ejecutar desde src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
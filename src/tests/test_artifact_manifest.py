@@ -0,0 +1,40 @@
+import json
+import os
+
+from backend.utils.artifact_manifest import ArtifactManifest
+
+
+def _module_folder(root):
+    folder = root / "abcd" / "src" / "main" / "resources" / "kirby" / "abcd" / "t_table" / "raw"
+    folder.mkdir(parents=True)
+    (folder / "t_table.rep.conf").write_text("conf", encoding="utf-8")
+    return folder
+
+
+def test_manifest_is_stored_outside_the_module_tree(tmp_path):
+    folder = _module_folder(tmp_path)
+    inputs = {"generator": "2.2"}
+
+    manifest = ArtifactManifest(str(folder), "t_table", str(tmp_path))
+    manifest.record("rep_conf", "t_table.rep.conf", inputs)
+    manifest.save()
+
+    assert sorted(os.listdir(folder)) == ["t_table.rep.conf"]
+    assert manifest.path == os.path.join(str(tmp_path), ".manifests", os.path.relpath(folder, tmp_path), "t_table.manifest.json")
+    loaded = ArtifactManifest.load(str(folder), "t_table", str(tmp_path))
+    assert loaded.is_fresh("rep_conf", "t_table.rep.conf", inputs)
+    assert not loaded.is_fresh("rep_conf", "t_table.rep.conf", {"generator": "3.2"})
+
+
+def test_legacy_manifest_is_read_and_moved(tmp_path):
+    folder = _module_folder(tmp_path)
+    entry = {"file": "t_table.rep.conf", "inputs": {}, "output": ArtifactManifest.hash_file(str(folder / "t_table.rep.conf"))}
+    legacy = folder / ".t_table.manifest.json"
+    legacy.write_text(json.dumps({"version": ArtifactManifest.VERSION, "artifacts": {"rep_conf": entry}}), encoding="utf-8")
+
+    manifest = ArtifactManifest.load(str(folder), "t_table", str(tmp_path))
+    assert manifest.is_fresh("rep_conf", "t_table.rep.conf", {})
+    manifest.save()
+
+    assert not legacy.exists()
+    assert os.path.exists(manifest.path)
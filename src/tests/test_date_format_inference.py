@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.utils.data_formater_detector import DateFormatDetector
+from backend.utils.multi_file_profiler import MultiFileProfiler
+from backend.utils.parameters_processor2 import ParameterProcessor
+from backend.utils.sample_profiler import SampleProfiler
+from backend.utils.schema_reader import SchemaModel
+
+
+def _iso_dates(count):
+    return [f"2020-{month:02d}-{day:02d}" for month in range(1, 13) for day in range(1, 29)][:count]
+
+
+def test_null_tokens_are_ignored():
+    inference = DateFormatDetector().infer_format(_iso_dates(99) + ["N/A", "null", "NaN", ""])
+
+    assert inference.format == "yyyy-MM-dd"
+    assert inference.total == 99
+    assert inference.confidence == 1.0
+
+
+def test_dirty_value_within_tolerance_keeps_the_format():
+    values = _iso_dates(99) + ["not a date"]
+    detector = DateFormatDetector()
+
+    assert detector.infer_format(values).format is None
+    inference = detector.infer_format(values, tolerance=DateFormatDetector.DEFAULT_TOLERANCE)
+    assert inference.format == "yyyy-MM-dd"
+    assert inference.confidence == 0.99
+
+
+GROUPED_FIELDS = {"string": ["id"], "date": ["cutoff_date"]}
+
+
+def _write_sample(path, dates):
+    rows = [f"{index};{date}" for index, date in enumerate(dates)]
+    path.write_text("id;cutoff_date\n" + "\n".join(rows) + "\n", encoding="utf-8")
+
+
+def _processor(sample_profile):
+    processor = ParameterProcessor({}, api_key="")
+    processor.schema = SchemaModel({"name": "t", "database": "master", "fields": [
+        {"name": "id", "type": "string"},
+        {"name": "cutoff_date", "type": "date", "format": "yyyy-MM-dd"},
+    ]})
+    processor.grouped_fields = GROUPED_FIELDS
+    processor.sample_profile = sample_profile
+    return processor
+
+
+def test_processor_date_format_with_dirty_sample(tmp_path):
+    sample = tmp_path / "sample.csv"
+    _write_sample(sample, _iso_dates(99) + ["N/A", "unknown"])
+
+    processor = _processor(SampleProfiler(str(sample), GROUPED_FIELDS).profile())
+    date_formats = processor._extract_date_format_dict(str(sample), ";")
+
+    assert date_formats == {"input_date_format": "yyyy-MM-dd", "output_date_format": "yyyy-MM-dd"}
+
+
+def test_processor_uses_the_voted_format_across_files(tmp_path):
+    _write_sample(tmp_path / "a.csv", _iso_dates(90))
+    _write_sample(tmp_path / "b.csv", _iso_dates(60))
+    _write_sample(tmp_path / "c.csv", [date.replace("-", "/") for date in _iso_dates(30)])
+
+    with ThreadPoolExecutor() as executor:
+        profile = MultiFileProfiler(str(tmp_path), GROUPED_FIELDS).profile(executor)
+    date_formats = _processor(profile)._extract_date_format_dict(profile.file_path, ";")
+
+    assert profile.date_format_votes == {"cutoff_date": {"yyyy-MM-dd": 2, "yyyy/MM/dd": 1}}
+    assert date_formats["input_date_format"] == "yyyy-MM-dd"
+    assert any("cutoff_date" in drift for drift in profile.drift)
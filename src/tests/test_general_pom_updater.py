@@ -0,0 +1,74 @@
+from backend.utils.general_pom_updater import GeneralPomUpdater, PomModuleSet
+
+POM = """<project>
+    <artifactId>kirby</artifactId>
+    <modules>
+        <!-- Módulos de ingesta -->
+        <module>abcd</module>
+        <!-- <module>old1</module> -->
+        <module>{uuaa}</module>
+        <module>efgh</module>
+    </modules>
+</project>
+"""
+
+
+def test_comments_are_kept_and_placeholders_dropped():
+    module_set = PomModuleSet(POM)
+    assert module_set.modules == ["abcd", "{uuaa}", "efgh"]
+
+    module_set.apply(add=["ijkl"], remove=["abcd"])
+
+    assert module_set.render() == """<project>
+    <artifactId>kirby</artifactId>
+    <modules>
+        <!-- Módulos de ingesta -->
+        <!-- <module>old1</module> -->
+        <module>efgh</module>
+        <module>ijkl</module>
+    </modules>
+</project>
+"""
+
+
+def test_unchanged_set_keeps_the_content():
+    module_set = PomModuleSet(POM)
+
+    assert not module_set.apply(add=["abcd", "efgh"])
+    assert module_set.render() == POM
+
+
+def test_modules_block_is_added_when_missing():
+    module_set = PomModuleSet("<project>\n</project>\n")
+    module_set.add(["abcd"])
+
+    assert module_set.render() == "<project>\n    <modules>\n        <module>abcd</module>\n    </modules>\n</project>\n"
+
+
+def test_one_line_block_and_duplicates():
+    module_set = PomModuleSet("<project><modules><module>a</module><module>a</module></modules></project>")
+    module_set.add(["b"])
+
+    assert module_set.render() == "<project><modules><module>a</module>\n    <module>b</module>\n</modules></project>"
+
+
+def test_updater_adds_a_batch_and_removes_modules(tmp_path):
+    (tmp_path / "pom.xml").write_text(POM, encoding="utf-8")
+
+    assert GeneralPomUpdater(str(tmp_path), ["abcd", "ijkl", "mnop"]).update_module_content()
+    assert GeneralPomUpdater(str(tmp_path), "efgh").remove_module_content()
+    content = (tmp_path / "pom.xml").read_text(encoding="utf-8")
+
+    assert PomModuleSet(content).modules == ["abcd", "ijkl", "mnop"]
+    assert "<!-- <module>old1</module> -->" in content
+    assert "<!-- Módulos de ingesta -->" in content
+    # Sin cambios no se reescribe el fichero
+    updater = GeneralPomUpdater(str(tmp_path), "abcd")
+    assert updater.update_module_content() and not updater.written
+
+
+def test_template_placeholder_on_the_modules_line():
+    module_set = PomModuleSet("<project>\n<modules>  <module>{uuaa}</module>\n  </modules>\n</project>\n")
+    module_set.add(["csan"])
+
+    assert module_set.render() == "<project>\n<modules>\n    <module>csan</module>\n  </modules>\n</project>\n"
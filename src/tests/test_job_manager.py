@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.endpoints import parameters_api
+from backend.utils.job_manager import JobManager, JobStatus
+
+
+def test_heartbeat_keeps_a_long_job_running():
+    manager = JobManager(running_timeout=60.0)
+    job_id = manager.submit({"table": "t"})
+    asyncio.run(manager.next_job(timeout=0))
+
+    # Sin heartbeat el trabajo se reencola al vencer el lease
+    manager.heartbeat(job_id)
+    assert manager.reap_expired(now=time.time() + 59) == ([], [])
+    assert manager.get(job_id)["status"] == JobStatus.RUNNING
+
+    requeued, _ = manager.reap_expired(now=time.time() + 61)
+    assert requeued == [job_id]
+    assert manager.get(job_id)["status"] == JobStatus.QUEUED
+
+
+def test_heartbeat_endpoint(monkeypatch):
+    manager = JobManager(running_timeout=90.0)
+    monkeypatch.setattr(parameters_api, "job_manager", manager)
+    client = TestClient(parameters_api.app)
+    job_id = manager.submit({"table": "t"})
+
+    assert client.post(f"/jobs/{job_id}/heartbeat").status_code == 409
+    asyncio.run(manager.next_job(timeout=0))
+    response = client.post(f"/jobs/{job_id}/heartbeat")
+
+    assert response.status_code == 200
+    assert response.json()["running_timeout"] == 90.0
+    assert response.json()["lease_expires_at"] > time.time() + 80
+    assert client.post("/jobs/unknown/heartbeat").status_code == 404
@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.utils.multi_file_profiler import MultiFileProfiler
+
+
+def test_existing_file_with_glob_characters_is_a_single_file(tmp_path):
+    sample = tmp_path / "data[1].csv"
+    sample.write_text("id;amount\n1;2,50\n", encoding="utf-8")
+
+    assert not MultiFileProfiler.is_multi_file(str(sample))
+    assert MultiFileProfiler.is_multi_file(str(tmp_path))
+    assert MultiFileProfiler.is_multi_file(str(tmp_path / "data*.csv"))
+
+
+def test_files_lists_only_the_profiled_files(tmp_path):
+    (tmp_path / "a.csv").write_text("id;amount\n" + "".join(f"{index};{index},50\n" for index in range(50)), encoding="utf-8")
+    (tmp_path / "b.csv").write_text("id;amount\n1;2,50\n", encoding="utf-8")
+    (tmp_path / "empty.csv").write_text("", encoding="utf-8")
+
+    with ThreadPoolExecutor() as executor:
+        profile = MultiFileProfiler(str(tmp_path), {"decimal(10,2)": ["amount"]}).profile(executor)
+
+    assert profile.files == [str(tmp_path / "a.csv"), str(tmp_path / "b.csv")]
+    assert profile.skipped_files == [str(tmp_path / "empty.csv")]
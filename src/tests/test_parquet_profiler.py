@@ -0,0 +1,41 @@
+import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.utils.parameters_processor2 import ParameterProcessor
+from backend.utils.parquet_profiler import ParquetSampleProfiler
+from backend.utils.schema_reader import SchemaModel
+
+
+def test_statistics_of_a_column_after_a_nested_field(tmp_path):
+    sample = tmp_path / "sample.parquet"
+    table = pa.table({
+        "address": pa.array([{"street": "z", "city": "z"}, {"street": "a", "city": "a"}]),
+        "cutoff_date": pa.array([datetime.date(2020, 1, 31), datetime.date(2021, 6, 1)]),
+    })
+    pq.write_table(table, sample)
+
+    profile = ParquetSampleProfiler(str(sample), {"date": ["cutoff_date"]}).profile()
+
+    # 'address' ocupa dos columnas hoja: con el índice de Arrow se leerían las de address.city
+    assert profile.value_ranges["cutoff_date"] == (datetime.date(2020, 1, 31), datetime.date(2021, 6, 1))
+    assert profile.date_samples["cutoff_date"] == ["2020-01-31", "2021-06-01"]
+
+
+def test_date_formats_of_a_parquet_without_date_samples(tmp_path):
+    sample = tmp_path / "sample.parquet"
+    pq.write_table(pa.table({"id": ["1", "2"], "cutoff_date": pa.array([None, None], pa.string())}), sample)
+    grouped_fields = {"string": ["id"], "date": ["cutoff_date"]}
+
+    processor = ParameterProcessor({}, api_key="")
+    processor.schema = SchemaModel({"name": "t", "database": "master", "fields": [
+        {"name": "id", "type": "string"},
+        {"name": "cutoff_date", "type": "date", "format": "yyyy-MM-dd"},
+    ]})
+    processor.grouped_fields = grouped_fields
+    processor.sample_profile = ParquetSampleProfiler(str(sample), grouped_fields).profile()
+
+    date_formats = processor._extract_date_format_dict(str(sample), None)
+
+    assert date_formats == {"input_date_format": "", "output_date_format": "yyyy-MM-dd"}
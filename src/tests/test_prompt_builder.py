@@ -0,0 +1,37 @@
+import pytest
+
+from backend.openai_langchain import prompt_builder
+from backend.openai_langchain.prompt_builder import count_tokens, load_encoding
+
+
+@pytest.fixture
+def fresh_encoding(monkeypatch):
+    monkeypatch.setattr(prompt_builder, "_encoding", None)
+    monkeypatch.setattr(prompt_builder, "_encoding_loaded", False)
+
+
+class _OfflineTiktoken:
+    calls = 0
+
+    @classmethod
+    def get_encoding(cls, name):
+        cls.calls += 1
+        raise ConnectionError("openaipublic.blob.core.windows.net unreachable")
+
+
+def test_offline_encoding_falls_back_to_the_estimate_once(fresh_encoding, monkeypatch):
+    monkeypatch.setattr(prompt_builder, "tiktoken", _OfflineTiktoken)
+
+    assert load_encoding() is False
+    assert load_encoding() is False
+    assert _OfflineTiktoken.calls == 1
+    assert count_tokens("x" * 40) == 10
+
+
+def test_count_tokens_never_loads_the_encoding(fresh_encoding, monkeypatch):
+    monkeypatch.setattr(prompt_builder, "tiktoken", _OfflineTiktoken)
+    _OfflineTiktoken.calls = 0
+
+    assert count_tokens("x" * 40) == 10
+    assert count_tokens("") == 0
+    assert _OfflineTiktoken.calls == 0
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from backend.utils.schema_reader import SchemaReader
+
+
+def test_cached_model_cannot_be_modified_through_its_values(tmp_path):
+    path = tmp_path / "t.schema"
+    path.write_text(json.dumps({
+        "name": "t", "namespace": "abcd", "database": "raw", "partitions": ["cutoff_date"],
+        "fields": [{"name": "cutoff_date", "type": "date", "format": "yyyy-MM-dd"}],
+    }), encoding="utf-8")
+    model = SchemaReader(str(path)).read_model()
+
+    partitions = model["partitions"]
+    with pytest.raises(AttributeError):
+        partitions.append("other")
+    with pytest.raises(TypeError):
+        model.get("fields")[0]["type"] = "string"
+
+    cached = SchemaReader(str(path)).read_model()
+    assert cached is model
+    assert cached["partitions"] == ("cutoff_date",)
+    assert cached["fields"][0]["type"] == "date"
+    # to_dict sigue devolviendo una copia modificable con las listas originales
+    copy = cached.to_dict()
+    copy["partitions"].append("other")
+    assert copy["fields"] == [{"name": "cutoff_date", "type": "date", "format": "yyyy-MM-dd"}]
+    assert cached["partitions"] == ("cutoff_date",)
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from backend.utils.stage_scheduler import PipelineStage, StageScheduler, StageStatus
+
+
+def _statuses(scheduler):
+    return {record["stage"]: record["status"] for record in scheduler.timings}
+
+
+def test_skipped_stage_outputs_are_none():
+    calls = []
+    scheduler = StageScheduler([
+        PipelineStage("decimals", lambda profile: calls.append("decimals") or 2, ("profile",), ("decimals",),
+                      when=lambda profile: profile is not None),
+        PipelineStage("schema", lambda decimals: calls.append("schema") or f"schema:{decimals}", ("decimals",), ("schema",)),
+    ])
+
+    values = asyncio.run(scheduler.run({"profile": None}))
+
+    # La etapa omitida no se ejecuta, pero sus dependientes reciben None
+    assert values["decimals"] is None
+    assert values["schema"] == "schema:None"
+    assert calls == ["schema"]
+    assert _statuses(scheduler) == {"decimals": StageStatus.SKIPPED, "schema": StageStatus.SUCCEEDED}
+
+
+def test_failed_stage_blocks_its_dependents_and_the_rest_finish():
+    calls = []
+
+    def read_sample():
+        raise OSError("sample not found")
+
+    async def read_schema():
+        await asyncio.sleep(0)
+        calls.append("schema")
+        return "schema"
+
+    scheduler = StageScheduler([
+        PipelineStage("sample", read_sample, outputs=("sample",)),
+        PipelineStage("profile", lambda sample: calls.append("profile"), ("sample",), ("profile",)),
+        PipelineStage("conf", lambda profile: calls.append("conf"), ("profile",), ("conf",)),
+        PipelineStage("schema", read_schema, outputs=("schema",)),
+    ])
+
+    with pytest.raises(OSError, match="sample not found"):
+        asyncio.run(scheduler.run())
+
+    assert calls == ["schema"]
+    assert _statuses(scheduler) == {
+        "sample": StageStatus.FAILED,
+        "profile": StageStatus.BLOCKED,
+        "conf": StageStatus.BLOCKED,
+        "schema": StageStatus.SUCCEEDED,
+    }
+
+
+def test_first_error_in_graph_order_is_raised():
+    async def fail_late():
+        await asyncio.sleep(0.01)
+        raise ValueError("schema error")
+
+    def fail_early():
+        raise KeyError("sample error")
+
+    # "schema" falla antes en el tiempo, pero "sample" va primero en el grafo
+    scheduler = StageScheduler([
+        PipelineStage("schema", fail_early, ("sample",), ("schema",)),
+        PipelineStage("sample", fail_late, outputs=("sample",)),
+        PipelineStage("other", fail_early, outputs=("other",)),
+    ])
+    assert scheduler.order == ["sample", "other", "schema"]
+
+    with pytest.raises(ValueError, match="schema error"):
+        asyncio.run(scheduler.run())
+    assert _statuses(scheduler)["schema"] == StageStatus.BLOCKED
+
+
+def test_independent_stages_run_concurrently():
+    async def wait(name, events):
+        events[name].set()
+        # Cada etapa espera a la otra: solo termina si ambas corren a la vez
+        await asyncio.wait_for(events["b" if name == "a" else "a"].wait(), timeout=1)
+        return name
+
+    async def main():
+        events = {"a": asyncio.Event(), "b": asyncio.Event()}
+        scheduler = StageScheduler([
+            PipelineStage("a", lambda: wait("a", events), outputs=("a",)),
+            PipelineStage("b", lambda: wait("b", events), outputs=("b",)),
+            PipelineStage("join", lambda a, b: a + b, ("a", "b"), ("joined",)),
+        ])
+        return await scheduler.run()
+
+    assert asyncio.run(main())["joined"] == "ab"
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="dependency cycle"):
+        StageScheduler([
+            PipelineStage("a", lambda b: b, ("b",), ("a",)),
+            PipelineStage("b", lambda a: a, ("a",), ("b",)),
+            PipelineStage("c", lambda: None, outputs=("c",)),
+        ])
+
+
+def test_duplicated_names_and_outputs_are_rejected():
+    with pytest.raises(ValueError, match="Duplicated stage 'a'"):
+        StageScheduler([PipelineStage("a", lambda: 1, outputs=("x",)), PipelineStage("a", lambda: 2, outputs=("y",))])
+    with pytest.raises(ValueError, match="'x' is produced by 'a' and 'b'"):
+        StageScheduler([PipelineStage("a", lambda: 1, outputs=("x",)), PipelineStage("b", lambda: 2, outputs=("x",))])
+
+
+def test_missing_inputs_are_rejected_before_running():
+    calls = []
+    scheduler = StageScheduler([PipelineStage("a", lambda path: calls.append(path), ("path",), ("a",))])
+
+    with pytest.raises(ValueError, match=r"\['path'\]"):
+        asyncio.run(scheduler.run())
+    assert calls == []
+
+
+def test_tuple_outputs_and_timings():
+    scheduler = StageScheduler([
+        PipelineStage("split", lambda text: tuple(text.split(",")), ("text",), ("first", "second")),
+        PipelineStage("bad", lambda: ("only one",), outputs=("x", "y")),
+    ])
+
+    with pytest.raises(ValueError, match="must return a tuple"):
+        asyncio.run(scheduler.run({"text": "a,b"}))
+    assert _statuses(scheduler) == {"split": StageStatus.SUCCEEDED, "bad": StageStatus.FAILED}
+
+    scheduler = StageScheduler([PipelineStage("split", lambda text: tuple(text.split(",")), ("text",), ("first", "second"))])
+    values = asyncio.run(scheduler.run({"text": "a,b"}))
+    assert (values["first"], values["second"]) == ("a", "b")
+    assert scheduler.timings[0]["duration_ms"] >= 0.0
+    assert "split" in scheduler.format_timings()
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from backend.utils.staged_artifact_writer import StagedArtifactWriter
+
+
+@pytest.fixture(autouse=True)
+def no_global_sync(monkeypatch):
+    def fail():
+        raise AssertionError("os.sync flushes every filesystem of the host")
+    monkeypatch.setattr(os, "sync", fail, raising=False)
+
+
+def test_publish_moves_the_staged_files(tmp_path):
+    target_folder = tmp_path / "abcd" / "kirby" / "t_table"
+    writer = StagedArtifactWriter(str(tmp_path))
+    with open(os.path.join(writer.staged_folder(str(target_folder)), "t_table.rep.conf"), "w") as file:
+        file.write("conf")
+
+    published = writer.publish()
+
+    assert published == [str(target_folder / "t_table.rep.conf")]
+    assert (target_folder / "t_table.rep.conf").read_text() == "conf"
+    assert os.listdir(tmp_path / StagedArtifactWriter.STAGING_DIR) == []
+
+
+def test_publish_without_files_does_not_sync(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "fsync", lambda descriptor: pytest.fail("nothing was staged"))
+    writer = StagedArtifactWriter(str(tmp_path))
+    writer.staged_folder(str(tmp_path / "abcd"))
+
+    assert writer.publish() == []
+    assert not (tmp_path / "abcd").exists()
+
+
+def test_discard_keeps_the_shared_staging_folder(tmp_path):
+    first, second = StagedArtifactWriter(str(tmp_path)), StagedArtifactWriter(str(tmp_path))
+
+    first.discard()
+
+    assert os.listdir(tmp_path / StagedArtifactWriter.STAGING_DIR) == [os.path.basename(second.staging_path)]
+    second.discard()
+    assert os.path.isdir(tmp_path / StagedArtifactWriter.STAGING_DIR)
@@ -0,0 +1,43 @@
+import asyncio
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.utils.csv_decimal_validator import CSVDecimalValidator
+from backend.utils.parameters_processor2 import ParameterProcessor
+from backend.utils.parquet_profiler import ParquetSampleProfiler
+from backend.utils.vectorized_profiler import VectorizedProfiler
+
+GROUPED_FIELDS = {"string": ("id",), "decimal(10,2)": ("amount",), "date": ("cutoff_date",)}
+
+
+def _write_sample(path):
+    rows = [f"{index};{index},{index % 100:02d};2020-01-{index % 28 + 1:02d}" for index in range(500)]
+    path.write_text("id;amount;cutoff_date\n" + "\n".join(rows) + "\n", encoding="utf-8")
+
+
+def test_analyze_decimals_skips_the_date_columns(tmp_path, monkeypatch):
+    sample = tmp_path / "sample.csv"
+    _write_sample(sample)
+    monkeypatch.setattr(VectorizedProfiler, "_update_date_matches", lambda *_: (_ for _ in ()).throw(AssertionError("dates read")))
+
+    profiler = VectorizedProfiler(str(sample), GROUPED_FIELDS)
+    analysis = profiler.analyze_decimals()
+
+    assert profiler.delimiter == ";"
+    expected = CSVDecimalValidator(str(sample), GROUPED_FIELDS, strategy=CSVDecimalValidator.FULL).analyze_csv()
+    assert analysis["decimal_symbol"] == expected["decimal_symbol"] == ","
+    assert analysis["correct_data"] == expected["correct_data"]
+
+
+def test_sampling_strategy_is_ignored_for_a_parquet_sample(tmp_path):
+    sample = tmp_path / "sample.parquet"
+    pq.write_table(pa.table({"id": ["1", "2"], "amount": ["1,50", "2,25"]}), sample)
+    grouped_fields = {"string": ["id"], "decimal(10,2)": ["amount"]}
+    processor = ParameterProcessor({"data_sample_file_path": str(sample), "decimal_sampling_strategy": "vectorized"}, api_key="")
+    profile = ParquetSampleProfiler(str(sample), grouped_fields).profile()
+
+    analysis = asyncio.run(processor._analyze_decimal_fields(grouped_fields, profile, None))
+
+    assert analysis is profile.decimal_analysis
+    assert analysis["decimal_symbol"] == ","